@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Docs review runner: runs queued documentation reviews in the background.
+
+Started on demand by docs_update_trigger.py. Waits for queued doc areas to
+pass their quiet window, then runs docs_review.sh once for all areas due at
+that moment (the areas and files are passed in DOCS_REVIEW_AREAS and
+DOCS_REVIEW_FILES). Each run is recorded as a task file in .claude/tasks/
+and as entries in the append-only .claude/tasks.jsonl log. Exits when the
+queue is empty. Only one runner runs per project (pid file in
+.claude/state/).
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+
+from common.docs_queue import (  # noqa: E402
+    runner_pid_file, take_due_reviews, tasks_log_path
+)
+from common.hook_log import append_entry  # noqa: E402
+from common.paths import project_root  # noqa: E402
+from common.pid_file import PidFile  # noqa: E402
+from common.session_store import session_store  # noqa: E402
+
+PROJECT_ROOT = project_root(__file__)
+
+STATE_FILE = PROJECT_ROOT / ".claude" / "state" / "session_state.json"
+STORE = session_store(STATE_FILE)
+TASKS_LOG = tasks_log_path(PROJECT_ROOT)
+
+# Longest single sleep, so a runner never outlives a cleared queue for long
+MAX_SLEEP = 5.0
+
+
+def find_docs_review_script():
+    """Return the docs_review.sh to run, or None if there is none."""
+    candidates = [PROJECT_ROOT / 'commands' / 'docs_review.sh']
+    docs_script = os.environ.get('DOCS_REVIEW_SCRIPT')
+    if docs_script:
+        candidates.append(Path(docs_script))
+    candidates += [
+        Path.home() / '.claude' / 'commands' / 'docs_review.sh',
+        PROJECT_ROOT / '.claude' / 'commands' / 'docs_review.sh'
+    ]
+    for path in candidates:
+        if path.exists():
+            return path
+    return None
+
+
+def create_docs_review_task(areas):
+    """Write the task file for one docs review run and log it."""
+    task_id = f"docs_review_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    files = sorted({f for entry in areas.values() for f in entry.get("files", [])})
+    task_data = {
+        'id': task_id,
+        'timestamp': datetime.now().isoformat(),
+        'description': f'Documentation review for {len(files)} modified files',
+        'status': 'pending',
+        'areas': sorted(areas),
+        'modified_files': files,
+        'edits': sum(entry.get("edits", 1) for entry in areas.values()),
+        'auto_trigger': True,
+        'priority': 'high'
+    }
+
+    task_file = PROJECT_ROOT / '.claude' / 'tasks' / f"{task_id}.json"
+    task_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(task_file, 'w') as f:
+        json.dump(task_data, f, indent=2)
+
+    log_task(task_id, 'pending', areas=task_data['areas'], files=len(files))
+    return task_id, files
+
+
+def log_task(task_id, status, **details):
+    """Append one entry to the task log."""
+    try:
+        append_entry(TASKS_LOG, {
+            'id': task_id,
+            'timestamp': datetime.now().isoformat(),
+            'status': status,
+            'triggered_by': 'auto_hook',
+            'agent': 'docs_update_trigger.py',
+            **details
+        })
+    except OSError as e:
+        print(f"Warning: Could not write task log: {e}", file=sys.stderr)
+
+
+def run_docs_review(areas):
+    """Run docs_review.sh once for a batch of due doc areas."""
+    task_id, files = create_docs_review_task(areas)
+
+    script = find_docs_review_script()
+    if script is None:
+        log_task(task_id, 'skipped', reason='docs_review.sh not found')
+        return
+
+    env = dict(os.environ,
+               DOCS_REVIEW_AREAS=",".join(sorted(areas)),
+               DOCS_REVIEW_FILES="\n".join(files))
+    try:
+        result = subprocess.run(
+            [str(script), 'docs/core', '--auto-update'],
+            capture_output=True,
+            cwd=PROJECT_ROOT,
+            env=env,
+            check=False
+        )
+        log_task(task_id, 'completed' if result.returncode == 0 else 'failed',
+                 exit_code=result.returncode)
+    except OSError as e:
+        log_task(task_id, 'failed', error=str(e))
+
+
+def serve(pid_file):
+    """Run due reviews until the queue is empty."""
+    while True:
+        with STORE.transaction() as state:
+            due, next_due = take_due_reviews(state)
+            if not due and next_due is None:
+                # Give up the pid file under the lock, so a trigger queueing
+                # right now either sees this runner's last check or starts a new one
+                pid_file.release()
+                return
+
+        if due:
+            run_docs_review(due)
+        else:
+            time.sleep(min(next_due, MAX_SLEEP))
+
+
+def main():
+    """Run the runner unless another one already serves this project."""
+    pid_file = PidFile(runner_pid_file(PROJECT_ROOT))
+    if not pid_file.acquire():
+        sys.exit(0)
+
+    try:
+        serve(pid_file)
+    finally:
+        pid_file.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,21 +6,39 @@ Ensures code changes are properly documented
 
 This hook runs after Edit/Write operations to:
 1. Identify modified files
-2. Determine if documentation needs updating
-3. Trigger /docs_review if documentation is affected
-4. Update .claude/tasks.json with tracking
+2. Determine which documentation areas they affect
+3. Queue a debounced /docs_review for those areas (see common/docs_queue.py)
+4. Start the background runner that runs due reviews and logs them to
+   .claude/tasks.jsonl
 """
 
-import json
 import sys
-import os
+from collections import deque
 from pathlib import Path
-from datetime import datetime
-import subprocess
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Optional, Tuple
+
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+
+from common.changed_files import event_file_paths, relative_path  # noqa: E402
+from common.docs_queue import queue_docs_review, start_runner  # noqa: E402
+from common.event import TOOL_FIELDS, read_event  # noqa: E402
+from common.metrics import span, timed_hook  # noqa: E402
+from common.paths import project_root  # noqa: E402
+from common.session_store import session_store  # noqa: E402
+
+# What this hook acts on (read by common/hook_matchers.py to generate settings)
+HOOK_INTEREST = {
+    "events": ["PostToolUse"],
+    "tools": ["Edit", "MultiEdit", "Write"]
+}
+
+PROJECT_ROOT = project_root(__file__)
 
-# Project root
-PROJECT_ROOT = Path(__file__).parent.parent
+STATE_FILE = PROJECT_ROOT / ".claude" / "state" / "session_state.json"
+STORE = session_store(STATE_FILE)
 
 # Paths to monitor for documentation updates
 DOC_PATHS = {
@@ -49,156 +67,157 @@ CRITICAL_FILES = [
 
 def parse_tool_input():
     """Parse tool input from stdin"""
-    try:
-        tool_data = json.load(sys.stdin)
-        return tool_data
-    except json.JSONDecodeError as e:
-        print(f"Error parsing tool input: {e}", file=sys.stderr)
-        return None
+    return read_event(fields=TOOL_FIELDS)
 
 def get_modified_files(tool_input: Dict) -> List[str]:
     """Get list of modified files from tool input"""
-    modified_files = []
-
-    # From files parameter
-    if 'files' in tool_input:
-        modified_files.extend(tool_input['files'])
-
-    # From tool_name and paths
-    if 'tool_name' in tool_input and 'paths' in tool_input:
-        tool_name = tool_input['tool_name']
-        paths = tool_input['paths']
-
-        if tool_name in ['Edit', 'Write']:
-            for path in paths:
-                modified_files.append(str(path))
-
-    return list(set(modified_files))
-
-def documentation_affected(files: List[str]) -> bool:
-    """Check if documentation needs updating based on modified files"""
-    if not files:
-        return False
-
-    for file_path in files:
-        # Check if it's a critical file
-        if any(file_path.endswith(f) for f in CRITICAL_FILES):
-            return True
-
-        # Check if file path contains documentation-relevant patterns
-        abs_path = os.path.join(PROJECT_ROOT, file_path)
+    # Project-relative where possible, so the doc-area prefixes below match
+    return list({relative_path(p, PROJECT_ROOT) or p for p in event_file_paths(tool_input)})
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+
+    Finds every occurrence of every keyword in one left-to-right pass over
+    the text, however many keywords there are.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = keywords
+        self.goto: List[Dict[str, int]] = [{}]
+        self.outputs: List[List[int]] = [[]]
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.outputs.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.outputs[state].append(index)
+
+        # Failure links, breadth first; outputs inherit along them
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                if state:
+                    fallback = self.fail[state]
+                    while fallback and char not in self.goto[fallback]:
+                        fallback = self.fail[fallback]
+                    self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def search(self, text: str) -> List[Tuple[int, int]]:
+        """Return (keyword index, end offset) for every match in the text"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        matches = []
+        state = 0
+        for offset, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                matches.extend((index, offset + 1) for index in outputs[state])
+        return matches
+
+
+class DocAreaClassifier:
+    """
+    The documentation rules compiled for one-pass path classification.
+
+    DOC_PATHS roots go into a prefix trie keyed by path component. Keywords
+    (DOC_REQUIRED_PATTERNS), DOC_PATHS subdirectories and CRITICAL_FILES all
+    go into one automaton run over the lowercased path; case-sensitive
+    rules re-check the matched slice of the original path.
+    """
+
+    def __init__(self):
+        self.roots: Dict = {}
+        for doc_path in DOC_PATHS:
+            node = self.roots
+            for part in doc_path.split('/'):
+                node = node.setdefault(part, {})
+            node[None] = doc_path
+
+        # (kind, value, rank); rank orders subdirectories as listed in DOC_PATHS
+        self.rules: List[Tuple[str, str, int]] = []
+        keywords = []
         for pattern in DOC_REQUIRED_PATTERNS:
-            if pattern in file_path.lower():
-                return True
-
-        # Check if file is in monitored directories
+            self.rules.append(('keyword', pattern, 0))
+            keywords.append(pattern.lower())
         for doc_path, subdirs in DOC_PATHS.items():
-            if file_path.startswith(doc_path + '/'):
-                # Check if any subdirectory matches
-                if any(subdir in file_path for subdir in subdirs):
-                    return True
-
-    return False
-
-def create_docs_review_task(modified_files: List[str], auto_trigger: bool = False) -> Optional[str]:
-    """Create a documentation review task"""
-    task_id = f"docs_review_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    task_file = PROJECT_ROOT / '.claude' / 'tasks' / f"{task_id}.json"
-
-    # Ensure tasks directory exists
-    task_file.parent.mkdir(parents=True, exist_ok=True)
-
-    task_data = {
-        'id': task_id,
-        'timestamp': datetime.now().isoformat(),
-        'description': f'Documentation review for {len(modified_files)} modified files',
-        'status': 'pending',
-        'modified_files': modified_files,
-        'auto_trigger': auto_trigger,
-        'priority': 'high'
-    }
-
-    # Write task file
-    with open(task_file, 'w') as f:
-        json.dump(task_data, f, indent=2)
-
-    return task_id
-
-def update_main_tasks(task_id: str):
-    """Update main tasks.json with new task"""
-    tasks_file = PROJECT_ROOT / '.claude' / 'tasks.json'
-
-    tasks = []
-    if tasks_file.exists():
-        with open(tasks_file, 'r') as f:
-            tasks = json.load(f)
-
-    # Add new task
-    tasks.append({
-        'id': task_id,
-        'timestamp': datetime.now().isoformat(),
-        'description': f'Trigger documentation review (task: {task_id})',
-        'status': 'completed',
-        'triggered_by': 'auto_hook',
-        'agent': 'docs_update_trigger.py'
-    })
-
-    # Write back
-    with open(tasks_file, 'w') as f:
-        json.dump(tasks, f, indent=2)
-
-def trigger_docs_review(auto_trigger: bool = False, force: bool = False):
-    """Trigger the /docs_review slash command"""
-    if not force and not auto_trigger:
-        return
-
-    print("📝 Triggering documentation review...", file=sys.stderr)
-
-    # Run docs review script directly
-    cmd = [str(PROJECT_ROOT / 'commands' / 'docs_review.sh'), 'docs/core']
-
-    if auto_trigger:
-        cmd.append('--auto-update')
+            for rank, subdir in enumerate(subdirs):
+                self.rules.append(('subdir', doc_path, rank))
+                keywords.append(subdir.lower())
+        for name in CRITICAL_FILES:
+            self.rules.append(('critical', name, 0))
+            keywords.append(name.lower())
+        self.automaton = KeywordAutomaton(keywords)
+
+    def doc_root(self, file_path: str) -> Optional[str]:
+        """Return the deepest DOC_PATHS root containing the file"""
+        found = None
+        node = self.roots
+        for part in file_path.split('/')[:-1]:
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+    def classify(self, file_path: str) -> Optional[str]:
+        """Return the documentation area a file affects, or None"""
+        root = self.doc_root(file_path)
+        affected = False
+        best_subdir = None
+        for index, end in self.automaton.search(file_path.lower()):
+            kind, value, rank = self.rules[index]
+            keyword = self.automaton.keywords[index]
+            exact = file_path[end - len(keyword):end]
+            if kind == 'keyword':
+                affected = True
+            elif kind == 'critical':
+                if end == len(file_path) and exact == value:
+                    affected = True
+            elif value == root and exact == DOC_PATHS[root][rank]:
+                affected = True
+                if best_subdir is None or rank < best_subdir:
+                    best_subdir = rank
+
+        if not affected:
+            return None
+        if root:
+            return f"{root}/{DOC_PATHS[root][best_subdir]}" if best_subdir is not None else root
+        return file_path.split('/', 1)[0] if '/' in file_path else 'project'
+
+
+_classifier: Optional[DocAreaClassifier] = None
+
+def get_classifier() -> DocAreaClassifier:
+    """Return the compiled classifier, building it on first use"""
+    global _classifier
+    if _classifier is None:
+        _classifier = DocAreaClassifier()
+    return _classifier
+
+def affected_doc_areas(files: List[str]) -> Dict[str, List[str]]:
+    """Map each affected documentation area to the modified files in it"""
+    classifier = get_classifier()
+    areas: Dict[str, List[str]] = {}
+    for file_path in files:
+        area = classifier.classify(file_path)
+        if area:
+            areas.setdefault(area, []).append(file_path)
+    return areas
 
-    try:
-        # Change to project root
-        original_dir = os.getcwd()
-        os.chdir(PROJECT_ROOT)
-
-        subprocess.run(cmd, capture_output=True, check=False)
-        print("📋 Documentation review completed", file=sys.stderr)
-
-        # Change back to original directory
-        os.chdir(original_dir)
-    except subprocess.CalledProcessError as e:
-        print(f"Warning: Could not trigger docs_review: {e}", file=sys.stderr)
-    except FileNotFoundError:
-        # Try with environment variable or user home path
-        try:
-            # Check for DOCS_REVIEW_SCRIPT environment variable first
-            docs_script = os.environ.get('DOCS_REVIEW_SCRIPT')
-            if docs_script and os.path.exists(docs_script):
-                subprocess.run([docs_script, 'docs/core'], capture_output=True, check=False)
-                print("📋 Documentation review completed (via environment variable)", file=sys.stderr)
-            else:
-                # Try to find docs_review.sh in common locations
-                user_home = Path.home()
-                possible_paths = [
-                    user_home / '.claude' / 'commands' / 'docs_review.sh',
-                    PROJECT_ROOT / '.claude' / 'commands' / 'docs_review.sh',
-                    PROJECT_ROOT / 'commands' / 'docs_review.sh'
-                ]
-
-                for path in possible_paths:
-                    if path.exists():
-                        subprocess.run([str(path), 'docs/core'], capture_output=True, check=False)
-                        print("📋 Documentation review completed (via discovered path)", file=sys.stderr)
-                        break
-                else:
-                    print("Warning: docs_review.sh not found in common locations", file=sys.stderr)
-        except Exception as e:
-            print(f"Warning: Could not trigger docs_review: {e}", file=sys.stderr)
+def documentation_affected(files: List[str]) -> bool:
+    """Check if documentation needs updating based on modified files"""
+    return bool(affected_doc_areas(files))
 
+@timed_hook("docs_update_trigger")
 def main():
     """Main hook execution"""
     tool_input = parse_tool_input()
@@ -212,19 +231,29 @@ def main():
     if not modified_files:
         sys.exit(0)  # No changes, nothing to do
 
-    # Check if documentation is affected
-    if documentation_affected(modified_files):
-        # Create documentation review task
-        task_id = create_docs_review_task(modified_files, auto_trigger=True)
-
-        # Update main tasks tracking
-        update_main_tasks(task_id)
-
-        # Auto-trigger documentation review
-        trigger_docs_review(auto_trigger=True)
-    else:
+    areas = affected_doc_areas(modified_files)
+    if not areas:
         # File changes don't affect documentation
         print("📝 Code changes don't require documentation updates", file=sys.stderr)
+        sys.exit(0)
+
+    # Queue one review per area; edits within the quiet window merge into it
+    try:
+        with span("task_write"), STORE.transaction() as state:
+            coalesced = queue_docs_review(state, areas)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not queue documentation review: {e}", file=sys.stderr)
+        sys.exit(0)
+
+    with span("docs_review"):
+        start_runner(PROJECT_ROOT)
+
+    new_areas = sorted(set(areas) - set(coalesced))
+    if new_areas:
+        print(f"📝 Documentation review queued for: {', '.join(new_areas)}", file=sys.stderr)
+    if coalesced:
+        print(f"📝 Merged into queued documentation review: {', '.join(sorted(coalesced))}",
+              file=sys.stderr)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -5,23 +5,28 @@ Prevents creation of documentation files in project root
 Enforces documentation organization standards
 """
 
-import json
 import sys
-import os
 from pathlib import Path
 
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+
+from common.changed_files import event_file_paths  # noqa: E402
+from common.event import TOOL_FIELDS, read_event  # noqa: E402
+from common.metrics import timed_hook  # noqa: E402
+
+# What this hook acts on (read by common/hook_matchers.py to generate settings)
+HOOK_INTEREST = {
+    "events": ["PostToolUse"],
+    "tools": ["Edit", "MultiEdit", "Write"],
+    "include": ["*.md"]
+}
+
 def parse_tool_input():
     """Parse tool input from stdin"""
-    # Check if there's data on stdin
-    import select
-    if select.select([sys.stdin], [], [], 0.0)[0]:
-        try:
-            tool_data = json.load(sys.stdin)
-            return tool_data
-        except json.JSONDecodeError:
-            return None
-    else:
-        return None
+    return read_event(fields=TOOL_FIELDS)
 
 def check_root_violation(tool_input):
     """Check if operation would create docs in root"""
@@ -29,14 +34,7 @@ def check_root_violation(tool_input):
         return False
 
     # Get file paths from tool input
-    file_paths = []
-
-    if 'files' in tool_input:
-        file_paths.extend(tool_input['files'])
-
-    if 'tool_name' in tool_input and 'paths' in tool_input:
-        if tool_input['tool_name'] in ['Write', 'Edit']:
-            file_paths.extend(tool_input['paths'])
+    file_paths = event_file_paths(tool_input)
 
     # Check for documentation files in root
     project_root = Path('.')
@@ -53,6 +51,7 @@ def check_root_violation(tool_input):
 
     return violations
 
+@timed_hook("root_protection")
 def main():
     """Main hook execution"""
     tool_input = parse_tool_input()
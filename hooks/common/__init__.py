@@ -0,0 +1,6 @@
+"""
+Shared helpers for hook scripts.
+
+Hook scripts add the hooks/ directory to sys.path and import from here, e.g.
+`from common.loader import load_hook`.
+"""
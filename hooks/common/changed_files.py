@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Changed-file discovery shared by all hooks.
+
+Two sources are combined:
+- Paths from Edit/Write events, recorded in the session store as they
+  happen (record_changed_files, called by the PostToolUse quality gate).
+- One `git status --porcelain -z` listing (staged, unstaged, untracked and
+  deleted files), cached in .claude/state/git_status.json and reused while
+  the git index is unchanged and the listing is younger than
+  CHANGED_FILES_GIT_TTL seconds (default 5).
+
+A recorded path that git listed as clean after it was recorded has been
+committed or reverted: it is left out and pruned from the session store
+when the listing is refreshed. Outside a git repository the recorded paths
+are the whole changed set, capped at the CHANGED_FILES_MAX (default 1000)
+most recent ones.
+
+event_file_paths() is the one place hooks pull file paths out of an event.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common.metrics import span
+
+# Tools whose events modify the files they name
+WRITE_TOOLS = ("Edit", "Write", "MultiEdit", "NotebookEdit")
+
+# Hook runtime files are never part of the changed set
+STATE_PREFIX = ".claude/state/"
+
+GIT_STATUS_TTL = float(os.environ.get("CHANGED_FILES_GIT_TTL", "5"))
+MAX_RECORDED = int(os.environ.get("CHANGED_FILES_MAX", "1000"))
+
+
+def event_file_paths(event):
+    """
+    Return the file paths an event writes, in order, without duplicates.
+
+    Reads tool_input.file_path / notebook_path of write tools (Claude tool
+    events) and the legacy top-level file_path, files and paths keys.
+    """
+    if not isinstance(event, dict):
+        return []
+
+    paths = []
+    writes = event.get("tool_name") in (None,) + WRITE_TOOLS
+    tool_input = event.get("tool_input")
+    if writes and isinstance(tool_input, dict):
+        for key in ("file_path", "notebook_path"):
+            if tool_input.get(key):
+                paths.append(tool_input[key])
+
+    if event.get("file_path"):
+        paths.append(event["file_path"])
+    paths.extend(event.get("files") or [])
+    if writes:
+        paths.extend(event.get("paths") or [])
+
+    return list(dict.fromkeys(str(p) for p in paths if p))
+
+
+def relative_path(path, root):
+    """Return a path relative to the project root (posix), or None if outside it."""
+    root = Path(root)
+    path = Path(path)
+    if not path.is_absolute():
+        path = root / path
+    try:
+        return Path(os.path.normpath(path)).relative_to(os.path.normpath(root)).as_posix()
+    except ValueError:
+        return None
+
+
+def record_changed_files(store, event, root):
+    """
+    Record the files an Edit/Write event touched in the session store.
+
+    Returns:
+        List of recorded project-relative paths.
+    """
+    if not isinstance(event, dict) or event.get("tool_name") not in WRITE_TOOLS:
+        return []
+
+    paths = [rel for rel in (relative_path(p, root) for p in event_file_paths(event)) if rel]
+    if paths:
+        now = time.time()
+        with store.transaction() as state:
+            changed = state.setdefault("changed_files", {})
+            for rel in paths:
+                changed[rel] = now
+            if len(changed) > MAX_RECORDED:
+                for rel in sorted(changed, key=changed.get)[:len(changed) - MAX_RECORDED]:
+                    del changed[rel]
+    return paths
+
+
+def git_location(root):
+    """
+    Find the repository containing the project root without spawning git.
+
+    Returns:
+        Tuple of (index file, project prefix within the repo), or
+        (None, None) outside a git repository.
+    """
+    root = Path(root).resolve()
+    for top in [root] + list(root.parents):
+        dot_git = top / ".git"
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            # Worktrees and submodules: ".git" holds "gitdir: <path>"
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None, None
+            if not content.startswith("gitdir:"):
+                return None, None
+            git_dir = (top / content[len("gitdir:"):].strip()).resolve()
+        else:
+            continue
+        prefix = root.relative_to(top).as_posix()
+        return git_dir / "index", "" if prefix == "." else prefix + "/"
+    return None, None
+
+
+def parse_porcelain(output):
+    """Parse `git status --porcelain -z` output into repo-relative paths."""
+    paths = []
+    fields = output.split("\0")
+    i = 0
+    while i < len(fields):
+        entry = fields[i]
+        i += 1
+        if len(entry) < 4:
+            continue
+        paths.append(entry[3:])
+        # Renames and copies are followed by the original path
+        if entry[0] in "RC" or entry[1] in "RC":
+            i += 1
+    return paths
+
+
+def _index_key(index_path):
+    try:
+        st = os.stat(index_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def git_status(root, cache_path):
+    """
+    Return (paths, listed_at, refreshed) from git status, or None outside a repository.
+
+    The listing is cached on disk and only refreshed when the index changed
+    or the cached listing is older than GIT_STATUS_TTL; `refreshed` tells
+    whether git was run for this call.
+    """
+    index_path, prefix = git_location(root)
+    if index_path is None:
+        return None
+
+    key = _index_key(index_path)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key and cached.get("root") == str(root) \
+                and time.time() - cached.get("time", 0) < GIT_STATUS_TTL:
+            return cached["paths"], cached["time"], False
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    listed_at = time.time()
+    try:
+        with span("git"):
+            result = subprocess.run(
+                ["git", "status", "--porcelain", "-z", "--untracked-files=all"],
+                capture_output=True,
+                text=True,
+                cwd=root
+            )
+    except OSError as e:
+        print(f"Warning: Could not run git status: {e}", file=sys.stderr)
+        return None
+    if result.returncode != 0:
+        return None
+
+    paths = [p[len(prefix):] for p in parse_porcelain(result.stdout)
+             if p.startswith(prefix) and not p[len(prefix):].startswith(STATE_PREFIX)]
+
+    # git status may refresh the index, so key the cache on its state afterwards
+    cache = {"key": _index_key(index_path), "root": str(root), "time": listed_at, "paths": paths}
+    try:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=Path(cache_path).parent, prefix=".git_status.")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not cache git status: {e}", file=sys.stderr)
+    return paths, listed_at, True
+
+
+def prune_recorded(store, paths, listed_at):
+    """Drop recorded paths that a git listing taken after their last edit shows clean."""
+    listed = set(paths)
+    with store.transaction() as state:
+        changed = state.get("changed_files") or {}
+        for rel in [p for p, recorded_at in changed.items()
+                    if recorded_at < listed_at and p not in listed]:
+            del changed[rel]
+
+
+def changed_files(root, store, cache_path):
+    """
+    Return the project-relative paths changed in the working tree, sorted.
+
+    Includes deleted files; callers that read files should skip missing ones.
+    """
+    recorded = store.load().get("changed_files") or {}
+    status = git_status(root, cache_path)
+    if status is None:
+        return sorted(recorded)
+
+    paths, listed_at, refreshed = status
+    changed = set(paths)
+    # Edits recorded after the listing may not be reflected in it yet
+    changed.update(p for p, recorded_at in recorded.items() if recorded_at >= listed_at)
+
+    # Committed or reverted files stay out of the store once git confirms it
+    if refreshed and any(p not in changed for p in recorded):
+        try:
+            prune_recorded(store, paths, listed_at)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not prune changed files: {e}", file=sys.stderr)
+    return sorted(changed)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Debounced documentation review queue.
+
+docs_update_trigger.py does not run the docs review itself. It records the
+affected doc areas in session state (`pending_docs_reviews`), one entry per
+area, and starts the background runner (hooks/auxiliary/docs_review_runner.py).
+Further edits to an area merge their files into its entry and push its
+not_before time to the end of a quiet window (DOCS_REVIEW_QUIET_SECONDS,
+default 30), so a burst of edits across many files ends in one review.
+
+Dispatched reviews are recorded in an append-only task log,
+.claude/tasks.jsonl, instead of rewriting a JSON array.
+"""
+
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+RUNNER_SCRIPT = Path(__file__).resolve().parent.parent / "auxiliary" / "docs_review_runner.py"
+
+
+def quiet_seconds():
+    """Return the quiet window edits to one doc area are merged within."""
+    try:
+        return max(0.0, float(os.environ.get("DOCS_REVIEW_QUIET_SECONDS", "30")))
+    except ValueError:
+        return 30.0
+
+
+def queue_docs_review(state, areas, now=None):
+    """
+    Add affected files to their areas' pending entries.
+
+    Args:
+        state: Session state (the caller saves it).
+        areas: Dict of doc area -> list of files affecting it.
+
+    Returns:
+        List of areas that were already pending (coalesced).
+    """
+    now = now or datetime.now()
+    not_before = (now + timedelta(seconds=quiet_seconds())).isoformat()
+    pending = state.setdefault("pending_docs_reviews", {})
+    coalesced = []
+    for area, files in areas.items():
+        entry = pending.get(area)
+        if entry:
+            coalesced.append(area)
+            entry["files"] = sorted(set(entry.get("files", [])) | set(files))
+            entry["edits"] = entry.get("edits", 1) + 1
+            entry["not_before"] = not_before
+        else:
+            pending[area] = {
+                "files": sorted(set(files)),
+                "first_seen": now.isoformat(),
+                "not_before": not_before,
+                "edits": 1
+            }
+    return coalesced
+
+
+def take_due_reviews(state, now=None):
+    """
+    Remove and return the areas whose quiet window has passed.
+
+    Returns:
+        Tuple of (dict of due area -> entry, seconds until the next area is
+        due or None if nothing else is pending).
+    """
+    now = now or datetime.now()
+    pending = state.get("pending_docs_reviews") or {}
+    due, next_due = {}, None
+    for area, entry in list(pending.items()):
+        try:
+            wait = (datetime.fromisoformat(entry.get("not_before") or "") - now).total_seconds()
+        except ValueError:
+            wait = 0
+        if wait <= 0:
+            due[area] = pending.pop(area)
+        elif next_due is None or wait < next_due:
+            next_due = wait
+    return due, next_due
+
+
+def tasks_log_path(project_root):
+    """Return the append-only docs task log of a project."""
+    return Path(project_root) / ".claude" / "tasks.jsonl"
+
+
+def runner_pid_file(project_root):
+    """Return the pid file of the docs review runner for a project."""
+    return Path(project_root) / ".claude" / "state" / "docs_review_runner.pid"
+
+
+def runner_pid(project_root):
+    """Return the pid of a live docs review runner, or None."""
+    try:
+        pid = int(runner_pid_file(project_root).read_text().strip())
+        os.kill(pid, 0)
+        return pid
+    except (OSError, ValueError):
+        return None
+
+
+def start_runner(project_root):
+    """
+    Start a detached docs review runner unless one is already running.
+
+    Returns:
+        True if a runner is running or was started.
+    """
+    if runner_pid(project_root):
+        return True
+
+    try:
+        subprocess.Popen(
+            [sys.executable, str(RUNNER_SCRIPT)],
+            cwd=str(project_root),
+            env=dict(os.environ, CLAUDE_PROJECT_DIR=str(project_root)),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        print(f"Warning: Could not start docs review runner: {e}", file=sys.stderr)
+        return False
+    return True
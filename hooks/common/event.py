@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Hook event parsing shared by all hooks.
+
+The stdin payload is read at most once per process, in chunks, waiting up
+to HOOK_STDIN_TIMEOUT seconds (default 5) for it to arrive instead of
+skipping the hook when it is not there yet. Hooks running in the same
+process (chain runner, hook host) reuse the cached payload and the fields
+already extracted from it instead of re-reading stdin; treat events as
+read-only.
+
+Hooks ask only for the fields they use. Those are picked out of the raw
+bytes by a scanner that steps over every other value without decoding it,
+so a multi-megabyte tool_response or file body is never turned into Python
+objects.
+"""
+
+import json
+import os
+import re
+import select
+import sys
+import time
+
+from common.metrics import record_payload, span
+
+# Fields hooks need to find the files an event writes (see changed_files.event_file_paths)
+TOOL_FIELDS = (
+    "hook_event_name", "tool_name", "tool_input.file_path",
+    "tool_input.notebook_path", "file_path", "files", "paths"
+)
+
+STDIN_TIMEOUT = float(os.environ.get("HOOK_STDIN_TIMEOUT", "5"))
+CHUNK_SIZE = 65536
+
+_payload = None
+_event = None
+_extracted = {}
+
+_WHITESPACE = b" \t\r\n"
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+_SCALAR = re.compile(rb'[^,}\]\s]+')
+
+
+def read_payload(block=False, timeout=None):
+    """
+    Return the raw stdin payload (bytes), reading it on first use.
+
+    Args:
+        block: Wait for stdin without a deadline.
+        timeout: Seconds to wait for the whole payload (default
+            HOOK_STDIN_TIMEOUT). An interactive terminal yields b"" at once.
+    """
+    global _payload
+    if _payload is not None:
+        return _payload
+
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Replaced stdin without a descriptor (e.g. tests)
+        _payload = (sys.stdin.read() or "").encode("utf-8")
+        return _payload
+
+    if os.isatty(fd):
+        _payload = b""
+        return _payload
+
+    deadline = None if block else time.monotonic() + (STDIN_TIMEOUT if timeout is None else timeout)
+    chunks = []
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                if chunks:
+                    print("Warning: hook payload incomplete at deadline, ignoring it", file=sys.stderr)
+                _payload = b""
+                return _payload
+        chunk = os.read(fd, CHUNK_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    _payload = b"".join(chunks)
+    return _payload
+
+
+def _skip_ws(buf, i):
+    while buf[i] in _WHITESPACE:
+        i += 1
+    return i
+
+
+def _string_end(buf, i):
+    """Return the index after the string starting at buf[i] (an opening quote)."""
+    find = buf.find
+    j = i + 1
+    while True:
+        j = find(b'"', j)
+        if j < 0:
+            raise ValueError("unterminated string")
+        if buf[j - 1] != 0x5C:
+            return j + 1
+        # Escaped unless the backslash is itself escaped
+        k = j - 1
+        while buf[k - 1] == 0x5C:
+            k -= 1
+        if (j - k) % 2 == 0:
+            return j + 1
+        j += 1
+
+
+def _value_end(buf, i):
+    """Return the index after the JSON value starting at buf[i], without decoding it."""
+    c = buf[i]
+    if c == 0x22:  # "
+        return _string_end(buf, i)
+    if c not in b"{[":
+        return _SCALAR.match(buf, i).end()
+
+    depth = 0
+    search = _STRUCTURAL.search
+    j = i
+    while True:
+        m = search(buf, j)
+        if m is None:
+            raise ValueError("unterminated container")
+        j = m.start()
+        c = buf[j]
+        if c == 0x22:
+            j = _string_end(buf, j)
+            continue
+        depth += 1 if c in b"{[" else -1
+        j += 1
+        if depth == 0:
+            return j
+
+
+def _parse_object(buf, i, prefix, wanted, ancestors, out):
+    """Decode the wanted members of the object at buf[i] into `out`; return its end."""
+    i = _skip_ws(buf, i + 1)
+    if buf[i] == 0x7D:  # }
+        return i + 1
+    while True:
+        if buf[i] != 0x22:
+            raise ValueError("expected key")
+        key_end = _string_end(buf, i)
+        key = json.loads(buf[i:key_end])
+        i = _skip_ws(buf, key_end)
+        if buf[i] != 0x3A:  # :
+            raise ValueError("expected ':'")
+        i = _skip_ws(buf, i + 1)
+
+        path = prefix + key
+        if path in wanted:
+            end = _value_end(buf, i)
+            out[key] = json.loads(buf[i:end])
+        elif path in ancestors and buf[i] == 0x7B:  # {
+            out[key] = {}
+            end = _parse_object(buf, i, path + ".", wanted, ancestors, out[key])
+        else:
+            end = _value_end(buf, i)
+
+        i = _skip_ws(buf, end)
+        if buf[i] == 0x2C:  # ,
+            i = _skip_ws(buf, i + 1)
+            continue
+        if buf[i] == 0x7D:
+            return i + 1
+        raise ValueError("expected ',' or '}'")
+
+
+def extract_fields(payload, fields):
+    """
+    Decode only the given dotted fields of a JSON object payload.
+
+    Returns:
+        Dict holding the fields that are present (nested as in the payload),
+        or None if the payload is empty, not an object or malformed.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    wanted = set(fields)
+    ancestors = {f.rsplit(".", i)[0] for f in wanted for i in range(1, f.count(".") + 1)}
+    try:
+        i = _skip_ws(payload, 0)
+        if payload[i] != 0x7B:
+            return None
+        event = {}
+        _parse_object(payload, i, "", wanted, ancestors, event)
+        return event
+    except (IndexError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def read_event(block=False, fields=None):
+    """
+    Return the hook event from stdin as a dict, or None.
+
+    Args:
+        block: Wait for stdin without a deadline.
+        fields: Dotted field names to decode (e.g. TOOL_FIELDS). None
+            decodes the whole payload.
+    """
+    global _event
+    if _event is not None:
+        return _event
+
+    payload = read_payload(block=block)
+    with span("parse"):
+        record_payload(len(payload))
+        if not payload.strip():
+            return None
+        if fields is not None:
+            # Hooks in one chain mostly ask for the same fields: scan once
+            key = frozenset(fields)
+            if key not in _extracted:
+                _extracted[key] = extract_fields(payload, fields)
+            return _extracted[key]
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return None
+
+    if not isinstance(data, dict):
+        return None
+    _event = data
+    return data
+
+
+def set_event(data):
+    """Install an already-parsed event for hooks in this process."""
+    global _event
+    _event = data
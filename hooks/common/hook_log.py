@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Append-only hook execution log.
+
+Entries are JSON lines in .claude/state/hooks_log.jsonl, each written with
+a single O_APPEND write, so concurrent hooks never interleave or rewrite
+the file and logging costs the same however long the history is.
+
+The live file is rotated when it grows past HOOK_LOG_MAX_BYTES or on the
+first write of a new day. Rotated segments are gzip-compressed (the newest
+one is compressed at the following rotation, once late writers that still
+hold it open are done) and the oldest are deleted beyond HOOK_LOG_KEEP.
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+MAX_BYTES = int(os.environ.get("HOOK_LOG_MAX_BYTES", str(1024 * 1024)))
+KEEP_SEGMENTS = int(os.environ.get("HOOK_LOG_KEEP", "50"))
+
+LOG_NAME = "hooks_log.jsonl"
+
+
+def log_path(state_dir):
+    """Return the live log file in a state directory."""
+    return Path(state_dir) / LOG_NAME
+
+
+def needs_rotation(path, incoming=0):
+    """Check whether the live log is too big or was last written on another day."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size == 0:
+        return False
+    if st.st_size + incoming > MAX_BYTES:
+        return True
+    return time.localtime(st.st_mtime)[:3] != time.localtime()[:3]
+
+
+def segment_paths(path):
+    """Return rotated segments of a log, oldest first."""
+    path = Path(path)
+    stem = path.name[:-len(".jsonl")]
+    segments = [p for p in path.parent.glob(f"{stem}.*.jsonl*") if p != path]
+    return sorted(segments, key=lambda p: p.name)
+
+
+def rotate(path):
+    """
+    Move the live log aside, compress older segments and apply retention.
+
+    Safe to race: only one process wins the rename, the others find the
+    file gone and carry on.
+    """
+    path = Path(path)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    rotated = path.with_name(f"{path.name[:-len('.jsonl')]}.{stamp}-{os.getpid()}.jsonl")
+    try:
+        os.rename(path, rotated)
+    except OSError:
+        return
+
+    for segment in segment_paths(path):
+        if segment.suffix == ".jsonl" and segment != rotated:
+            compress_segment(segment)
+
+    segments = segment_paths(path)
+    for segment in segments[:max(0, len(segments) - KEEP_SEGMENTS)]:
+        try:
+            segment.unlink()
+        except OSError:
+            pass
+
+
+def compress_segment(segment):
+    """Gzip a rotated segment in place (segment.jsonl -> segment.jsonl.gz)."""
+    target = segment.with_name(segment.name + ".gz")
+    tmp = target.with_name(target.name + f".{os.getpid()}.tmp")
+    try:
+        with open(segment, "rb") as src, gzip.open(tmp, "wb") as dst:
+            dst.write(src.read())
+        os.replace(tmp, target)
+        segment.unlink()
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def append_entry(path, entry):
+    """
+    Append one entry to the log.
+
+    The line is written with a single write() on an O_APPEND descriptor,
+    which the kernel applies atomically at the end of the file.
+    """
+    line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    if needs_rotation(path, len(line)):
+        rotate(path)
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def read_entries(path, include_rotated=True):
+    """
+    Yield log entries oldest first, from rotated segments then the live log.
+
+    Unparseable lines (e.g. a torn write after a crash) are skipped.
+    """
+    files = (segment_paths(path) if include_rotated else []) + [Path(path)]
+    for file in files:
+        opener = gzip.open if file.suffix == ".gz" else open
+        try:
+            with opener(file, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except (OSError, EOFError):
+            continue
+
+
+def read_entries_newest_first(path, include_rotated=True):
+    """
+    Yield log entries newest first, from the live log then rotated segments.
+
+    Segments are opened one at a time, newest first, so a caller that stops
+    after a few entries never decompresses the older ones.
+    """
+    files = [Path(path)] + (segment_paths(path)[::-1] if include_rotated else [])
+    for file in files:
+        opener = gzip.open if file.suffix == ".gz" else open
+        try:
+            with opener(file, "rt", encoding="utf-8") as f:
+                lines = f.readlines()
+        except (OSError, EOFError):
+            continue
+        for line in reversed(lines):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Narrow hook matchers and path prefilters.
+
+Each hook script declares what it cares about in a module-level
+HOOK_INTEREST literal:
+
+    HOOK_INTEREST = {
+        "events": ["PostToolUse"],
+        "tools": ["Edit", "Write"],            # tool names it handles
+        "include": ["*.md"],                    # paths it acts on (optional)
+        "exclude": [".agents/"],                # paths it ignores (optional)
+        "include_rules": ["forbidden_paths"],   # extra includes from agent_rules.json
+        "exclude_rules": ["allowed_paths.write_freely"],
+        "timeout": 120                          # seconds, if over Claude's 60s default
+    }
+
+The generator reads these with ast (hooks are never imported) and emits:
+- settings: one entry per event whose matcher is the union of its hooks'
+  tools, running them as one chain through hook_client.py --prefilter, with
+  a timeout covering the declared timeouts of the chain's hooks
+- hook_filters.json: per-hook tools and path patterns, resolved against
+  agent_rules.json at generation time
+
+Claude matchers only match tool names, so the path filter is applied by
+hook_client.py: it drops hooks whose filter rejects the event before the
+host or any hook script is involved, and exits 0 if none are left.
+
+Patterns follow file_write_validator's rules: plain and directory patterns
+match by path-component prefix, wildcard patterns match the whole
+project-relative path (`*` crosses directories). A leading `**/` matches
+at the project root and in any directory below it.
+"""
+
+import ast
+import fnmatch
+import json
+import os
+from pathlib import Path, PurePosixPath
+
+FILTERS_NAME = "hook_filters.json"
+
+# Hooks enabled in generated settings unless others are requested, in chain order
+DEFAULT_HOOKS = ["root_protection", "quality_gate", "completion_checker", "session_tracker"]
+
+
+def read_interest(script_path):
+    """Return a hook script's HOOK_INTEREST literal, or None if it has none."""
+    try:
+        tree = ast.parse(Path(script_path).read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == "HOOK_INTEREST" for t in node.targets):
+            try:
+                return ast.literal_eval(node.value)
+            except ValueError:
+                return None
+    return None
+
+
+def rule_patterns(rules, reference):
+    """Flatten the patterns under a dotted agent_rules section ("allowed_paths.write_freely")."""
+    value = rules or {}
+    for key in reference.split("."):
+        value = value.get(key, {}) if isinstance(value, dict) else {}
+    if isinstance(value, dict):
+        return [p for patterns in value.values() if isinstance(patterns, list) for p in patterns]
+    return list(value) if isinstance(value, list) else []
+
+
+def build_filter(interest, rules=None):
+    """Resolve a HOOK_INTEREST into a concrete {"tools", "include", "exclude"} filter."""
+    include = list(interest.get("include", []))
+    exclude = list(interest.get("exclude", []))
+    for reference in interest.get("include_rules", []):
+        include += rule_patterns(rules, reference)
+    for reference in interest.get("exclude_rules", []):
+        exclude += rule_patterns(rules, reference)
+    return {
+        "tools": list(interest.get("tools", [])),
+        "include": list(dict.fromkeys(include)),
+        "exclude": list(dict.fromkeys(exclude))
+    }
+
+
+def path_matches(pattern, rel_path):
+    """Check a project-relative posix path against one pattern."""
+    if pattern.startswith("**/"):
+        rest = pattern[3:]
+        return fnmatch.fnmatchcase(rel_path, rest) or fnmatch.fnmatchcase(rel_path, "*/" + rest)
+    if "*" in pattern or "?" in pattern:
+        return fnmatch.fnmatchcase(rel_path, pattern)
+    parts = PurePosixPath(pattern).parts
+    return PurePosixPath(rel_path).parts[:len(parts)] == parts
+
+
+def is_interested(hook_filter, tool_name=None, rel_paths=None):
+    """
+    Check whether a hook would act on an event.
+
+    Args:
+        hook_filter: Resolved filter (see build_filter).
+        tool_name: The event's tool, if any.
+        rel_paths: Project-relative paths the event writes, or None when
+            they are unknown (the hook is then assumed interested).
+    """
+    tools = hook_filter.get("tools")
+    if tools and tool_name and tool_name not in tools:
+        return False
+    if rel_paths is None:
+        return True
+
+    exclude = hook_filter.get("exclude", [])
+    candidates = [p for p in rel_paths if not any(path_matches(x, p) for x in exclude)]
+    if rel_paths and not candidates:
+        return False
+
+    include = hook_filter.get("include")
+    if include:
+        return any(path_matches(i, p) for p in candidates for i in include)
+    return True
+
+
+def event_rel_paths(event, project_root):
+    """
+    Return the project-relative paths an event writes, or None if undecidable.
+
+    Paths outside the project make the answer undecidable, since the hooks'
+    own checks see them differently.
+    """
+    tool_input = event.get("tool_input") if isinstance(event, dict) else None
+    if not isinstance(tool_input, dict):
+        return None
+    raw = [tool_input[k] for k in ("file_path", "notebook_path") if tool_input.get(k)]
+    root = os.path.normpath(project_root)
+    rel_paths = []
+    for path in raw:
+        full = os.path.normpath(os.path.join(root, path))
+        if full != root and not full.startswith(root + os.sep):
+            return None
+        rel_paths.append(Path(os.path.relpath(full, root)).as_posix())
+    return rel_paths
+
+
+def select_hooks(filters, hook_names, event, project_root):
+    """Return the hooks in a chain that would act on an event, in order."""
+    if not isinstance(event, dict):
+        return list(hook_names)
+    rel_paths = event_rel_paths(event, project_root)
+    tool_name = event.get("tool_name")
+    return [name for name in hook_names
+            if name not in filters or is_interested(filters[name], tool_name, rel_paths)]
+
+
+def load_filters(path):
+    """Load a generated filters file; an unreadable file filters nothing."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            filters = json.load(f)
+        return filters if isinstance(filters, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def generate(hooks_dir, hook_names, rules, command_dir=None, python="python"):
+    """
+    Build the hooks settings and filters for a set of enabled hooks.
+
+    Args:
+        hooks_dir: Source hooks directory the HOOK_INTEREST declarations are read from.
+        hook_names: Enabled hooks, in chain order.
+        rules: Parsed agent_rules.json (or None).
+        command_dir: Hooks directory as referenced by the installed commands
+            (defaults to hooks_dir).
+
+    Returns:
+        Tuple of (settings "hooks" section, filters dict).
+    """
+    from common.loader import HOOK_REGISTRY
+
+    hooks_dir = Path(hooks_dir)
+    command_dir = Path(command_dir or hooks_dir)
+    filters = {}
+    events = {}
+    timeouts = {}
+    for name in hook_names:
+        interest = read_interest(hooks_dir / HOOK_REGISTRY[name])
+        if not interest:
+            raise ValueError(f"Hook {name} declares no HOOK_INTEREST")
+        filters[name] = build_filter(interest, rules)
+        if interest.get("timeout"):
+            timeouts[name] = interest["timeout"]
+        for event in interest.get("events", []):
+            events.setdefault(event, []).append(name)
+
+    # Stop/session hooks have no tools; keep tool and path filters for the rest only
+    filters = {name: f for name, f in filters.items()
+               if f["tools"] or f["include"] or f["exclude"]}
+
+    section = {}
+    for event, names in events.items():
+        tools = sorted({tool for name in names for tool in filters.get(name, {}).get("tools", [])})
+        prefilter = f"--prefilter {command_dir / FILTERS_NAME} " if any(n in filters for n in names) else ""
+        command = (f"{python} {command_dir / 'hook_client.py'} {prefilter}"
+                   + (f"run_chain {' '.join(names)}" if len(names) > 1 else names[0]))
+        hook = {"type": "command", "command": command}
+        # Chained hooks run one after another in the same command
+        timeout = sum(timeouts.get(name, 0) for name in names)
+        if timeout:
+            hook["timeout"] = timeout
+        entry = {"hooks": [hook]}
+        if tools:
+            entry = {"matcher": "|".join(tools), **entry}
+        section[event] = [entry]
+    return section, filters
+
+
+def write_generated(settings_path, filters_dir, hooks_dir, hook_names, rules,
+                    command_dir=None, python="python"):
+    """
+    Generate and write the settings "hooks" section and hook_filters.json.
+
+    Other keys already in the settings file are kept.
+
+    Returns:
+        Tuple of (settings path, filters path).
+    """
+    section, filters = generate(hooks_dir, hook_names, rules, command_dir, python)
+
+    settings_path = Path(settings_path)
+    settings = {}
+    if settings_path.exists():
+        with open(settings_path, "r", encoding="utf-8") as f:
+            settings = json.load(f)
+    settings["hooks"] = section
+
+    settings_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(settings_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+        f.write("\n")
+
+    filters_path = Path(filters_dir) / FILTERS_NAME
+    filters_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(filters_path, "w", encoding="utf-8") as f:
+        json.dump(filters, f, indent=2)
+        f.write("\n")
+    return settings_path, filters_path
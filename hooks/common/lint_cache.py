@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of per-file lint results.
+
+Entries are keyed by path and the sha256 of the file's bytes, grouped under
+a fingerprint of the linter: its resolved binary (path, mtime, size) and the
+contents of its config files in the project root. Upgrading the linter or
+editing its config changes the fingerprint and drops that linter's entries,
+so a Stop event only re-lints files that changed since they were last
+checked.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+CACHE_VERSION = 1
+
+# Config files whose contents affect each linter's results
+LINTER_CONFIG_FILES = {
+    "ruff": ["pyproject.toml", "ruff.toml", ".ruff.toml"],
+    "eslint": [
+        ".eslintrc", ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.json",
+        ".eslintrc.yml", ".eslintrc.yaml", "eslint.config.js",
+        "eslint.config.mjs", "eslint.config.cjs", "package.json", ".eslintignore"
+    ]
+}
+
+
+def file_hash(path):
+    """Return the sha256 of a file's bytes, or None if it can't be read."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def linter_fingerprint(name, command, project_root):
+    """
+    Fingerprint a linter's version and configuration.
+
+    The binary is identified by stat() rather than by running `--version`,
+    which would cost the spawn the cache is meant to save.
+    """
+    digest = hashlib.sha256()
+    binary = shutil.which(command[0])
+    if binary:
+        try:
+            st = os.stat(binary)
+            digest.update(f"{os.path.realpath(binary)}:{st.st_mtime_ns}:{st.st_size}".encode())
+        except OSError:
+            digest.update(binary.encode())
+    digest.update(" ".join(command).encode())
+
+    for config_name in LINTER_CONFIG_FILES.get(name, []):
+        config_digest = file_hash(Path(project_root) / config_name)
+        if config_digest:
+            digest.update(f"{config_name}:{config_digest}".encode())
+    return digest.hexdigest()
+
+
+class LintCache:
+    """Per-linter lint results stored in a JSON file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.linters = self.load()
+
+    def load(self):
+        """Return the cached linters dict (empty if missing or unreadable)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("linters", {})
+
+    def save(self):
+        """Write the cache atomically; failures are warned about and ignored."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".lint_cache.")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({"version": CACHE_VERSION, "linters": self.linters}, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"Warning: Could not save lint cache: {e}", file=sys.stderr)
+
+    def files_for(self, linter, fingerprint):
+        """
+        Return the file entries for a linter.
+
+        Entries recorded under a different fingerprint (new binary or
+        changed config) are discarded.
+        """
+        section = self.linters.get(linter)
+        if not section or section.get("fingerprint") != fingerprint:
+            section = {"fingerprint": fingerprint, "files": {}}
+            self.linters[linter] = section
+        return section["files"]
+
+    def get(self, linter, fingerprint, file_path, digest):
+        """Return the cached {"passed", "output"} for a file, or None if stale."""
+        entry = self.files_for(linter, fingerprint).get(file_path)
+        if entry is None or digest is None or entry.get("hash") != digest:
+            return None
+        return entry
+
+    def put(self, linter, fingerprint, file_path, digest, passed, output=""):
+        """Record a file's lint result for its current content."""
+        if digest is None:
+            return
+        self.files_for(linter, fingerprint)[file_path] = {
+            "hash": digest,
+            "passed": passed,
+            "output": output
+        }
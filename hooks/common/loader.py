@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Hook loader: imports hook scripts as modules and runs them in-process.
+Used by the hook host daemon and the chain runner so a hook's main() can be
+executed without paying interpreter startup for every call.
+"""
+
+import importlib.util
+import io
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+from common import paths
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+
+# Hook name -> script path relative to hooks/
+HOOK_REGISTRY = {
+    "root_protection": "auxiliary/root_protection.py",
+    "docs_update_trigger": "auxiliary/docs_update_trigger.py",
+    "quality_gate": "core/quality_gate.py",
+    "completion_checker": "core/completion_checker.py",
+    "file_write_validator": "core/file_write_validator.py",
+    "session_tracker": "session/session_tracker.py",
+    "run_chain": "run_chain.py",
+}
+
+# Hook name -> (mtime_ns, module)
+_loaded = {}
+
+
+def hook_path(name):
+    """Return the script path for a registered hook, or None if unknown."""
+    relative = HOOK_REGISTRY.get(name)
+    if relative is None:
+        return None
+    return HOOKS_DIR / relative
+
+
+def load_hook(name):
+    """Import a hook script as a module, re-importing it if the file changed."""
+    path = hook_path(name)
+    if path is None:
+        raise KeyError(f"Unknown hook: {name}")
+
+    mtime = path.stat().st_mtime_ns
+    cached = _loaded.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    spec = importlib.util.spec_from_file_location(f"hook_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _loaded[name] = (mtime, module)
+    return module
+
+
+def preload_hooks():
+    """Import every registered hook. Returns {name: error} for failures."""
+    errors = {}
+    for name in HOOK_REGISTRY:
+        try:
+            load_hook(name)
+        except Exception as e:
+            errors[name] = str(e)
+    return errors
+
+
+def enter_project():
+    """
+    Resolve the project root for a request from the current cwd and env.
+
+    Hook modules derive globals (PROJECT_ROOT, STORE, ...) from the root at
+    import time. When the request belongs to another project than the one
+    the loaded hooks were imported for, they are dropped so load_hook
+    re-imports them for this root. Meant for the hook host's forked
+    children: the parent keeps its modules.
+
+    Returns:
+        The project root.
+    """
+    imported_root = paths._project_root
+    paths.reset_project_root()
+    root = paths.project_root(HOOKS_DIR / "run_chain.py")
+    if root != imported_root:
+        _loaded.clear()
+        # Hooks importing each other by name (completion_checker -> quality_gate)
+        scripts = {str(hook_path(name)) for name in HOOK_REGISTRY}
+        for name, module in list(sys.modules.items()):
+            if getattr(module, "__file__", None) in scripts:
+                del sys.modules[name]
+    return root
+
+
+def stale_hooks():
+    """Return names of loaded hooks whose script changed on disk."""
+    stale = []
+    for name, (mtime, _) in list(_loaded.items()):
+        try:
+            if hook_path(name).stat().st_mtime_ns != mtime:
+                stale.append(name)
+        except OSError:
+            stale.append(name)
+    return stale
+
+
+def run_hook(module, payload, argv=None):
+    """
+    Run a hook module's main() in-process.
+
+    stdin is backed by a real file so hooks that select() on it still work;
+    stdout and stderr are captured. SystemExit is translated into an exit
+    code the same way the interpreter would.
+
+    Returns:
+        Dict with keys: exit_code, stdout, stderr
+    """
+    stdin_file = tempfile.TemporaryFile()
+    stdin_file.write(payload)
+    stdin_file.seek(0)
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    saved = (sys.stdin, sys.stdout, sys.stderr, sys.argv)
+
+    sys.stdin = io.TextIOWrapper(stdin_file, encoding="utf-8")
+    sys.stdout = stdout
+    sys.stderr = stderr
+    sys.argv = argv or [getattr(module, "__file__", "hook")]
+
+    exit_code = 0
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=stderr)
+            exit_code = 1
+    except Exception:
+        traceback.print_exc(file=stderr)
+        exit_code = 1
+    finally:
+        sys.stdin, sys.stdout, sys.stderr, sys.argv = saved
+        stdin_file.close()
+
+    return {
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue()
+    }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Per-hook latency metrics.
+
+Each hook's main() is wrapped with @timed_hook, which records one sample
+per invocation: total wall time, exit code, payload size and the time
+spent in named spans (stdin parse, config load, subprocess calls, state
+I/O). Samples are appended as compact JSON lines to
+.claude/state/hook_metrics.jsonl (rotated like the hook log) and
+summarized by scripts/hooks_report.py.
+
+Set HOOK_METRICS=0 to disable recording.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+METRICS_NAME = "hook_metrics.jsonl"
+
+_lock = threading.Lock()
+# One span dict per instrumented call in progress, innermost last
+# (the chain runner's hooks nest inside its own call)
+_frames = []
+_payload_bytes = None
+
+
+def enabled():
+    """Check whether metrics recording is switched on."""
+    return os.environ.get("HOOK_METRICS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+@contextmanager
+def span(name):
+    """
+    Time a block and add it to the current invocation's `name` span.
+
+    A no-op outside an instrumented hook (e.g. in the review worker).
+    Repeated spans with the same name are summed.
+    """
+    if not _frames:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        with _lock:
+            if _frames:
+                spans = _frames[-1]
+                spans[name] = spans.get(name, 0.0) + elapsed
+
+
+def record_payload(size):
+    """Note the size in bytes of the hook's stdin payload."""
+    global _payload_bytes
+    _payload_bytes = size
+
+
+def write_sample(hook_name, total_ms, exit_code, spans):
+    """Append one invocation sample to the metrics file."""
+    # Imported lazily so hooks pay for it only when a sample is written
+    from common.hook_log import append_entry
+    from common.paths import project_root
+
+    sample = {
+        "t": round(time.time(), 3),
+        "h": hook_name,
+        "ms": round(total_ms, 2),
+        "x": exit_code,
+        "b": _payload_bytes,
+        "s": {name: round(ms, 2) for name, ms in spans.items()}
+    }
+    append_entry(project_root() / ".claude" / "state" / METRICS_NAME, sample)
+
+
+def timed_hook(hook_name):
+    """
+    Decorator for a hook's main(): records one sample per call.
+
+    SystemExit is inspected for the exit code and re-raised unchanged, so
+    hook exit semantics are unaffected. A hook called from inside another
+    instrumented call gets its own sample and shows up in the outer one as
+    a "hook:<name>" span.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return func(*args, **kwargs)
+
+            with _lock:
+                _frames.append({})
+            exit_code = 0
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                raise
+            except BaseException:
+                exit_code = 1
+                raise
+            finally:
+                total_ms = (time.perf_counter() - start) * 1000
+                with _lock:
+                    spans = _frames.pop()
+                    if _frames:
+                        _frames[-1][f"hook:{hook_name}"] = total_ms
+                try:
+                    write_sample(hook_name, total_ms, exit_code, spans)
+                except Exception as e:
+                    print(f"Warning: Could not record hook metrics: {e}", file=sys.stderr)
+        return wrapper
+    return decorator
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Project root resolution shared by all hooks.
+
+The root is resolved once per process and cached, so hooks running in the
+same process (chain runner, hook host) don't each walk parent directories.
+The hook host resets it for every request, which may come from another
+project.
+"""
+
+import os
+from pathlib import Path
+
+_project_root = None
+
+
+def project_root(hook_file=None):
+    """
+    Return the project root for the current hook process.
+
+    Resolution order:
+    1. CLAUDE_PROJECT_DIR (set by Claude Code for hook commands)
+    2. The directory containing .claude/ when the hook is installed under
+       .claude/hooks/
+    3. The nearest parent of the working directory that has a .claude/ dir
+    4. The working directory
+    """
+    global _project_root
+    if _project_root is not None:
+        return _project_root
+
+    env_dir = os.environ.get("CLAUDE_PROJECT_DIR")
+    if env_dir:
+        _project_root = Path(env_dir)
+        return _project_root
+
+    if hook_file:
+        for parent in Path(hook_file).resolve().parents:
+            if parent.name == "hooks" and parent.parent.name == ".claude":
+                _project_root = parent.parent.parent
+                return _project_root
+
+    current = Path.cwd()
+    while current != current.parent:
+        if (current / ".claude").exists():
+            _project_root = current
+            return _project_root
+        current = current.parent
+
+    _project_root = Path.cwd()
+    return _project_root
+
+
+def reset_project_root():
+    """Forget the cached root so the next project_root() call resolves it again."""
+    global _project_root
+    _project_root = None
+
+
+def set_project_root(path):
+    """Pin the project root (used by runners that resolve it up front)."""
+    global _project_root
+    _project_root = Path(path)
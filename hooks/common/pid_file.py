@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Single-instance pid files for the background workers.
+
+The pid file is created and flock'ed in one step and the lock is held for
+the worker's lifetime, so two workers started at the same moment can't
+both pass a "is one running?" check and both write their pid. Readers
+(review_queue.worker_pid, docs_queue.runner_pid) still just read the pid.
+"""
+
+import fcntl
+import os
+from pathlib import Path
+
+
+class PidFile:
+    """An exclusively locked pid file owned by the current process."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.fd = None
+
+    def acquire(self):
+        """
+        Lock the pid file and write this process's pid to it.
+
+        Returns:
+            False if another live process holds it.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            # The previous owner may have unlinked the file between our open
+            # and flock; then we locked an orphan and must retry on the new one
+            try:
+                if os.fstat(fd).st_ino == os.stat(self.path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self.fd = fd
+        return True
+
+    def release(self):
+        """Remove the pid file and drop the lock (no-op if not held)."""
+        if self.fd is None:
+            return
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+        os.close(self.fd)
+        self.fd = None
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of quality gate verdicts.
+
+Entries are keyed by (content hash, reviewer, prompt version), so saving a
+file again, reverting it, or reformatting only trailing whitespace reuses
+the earlier verdict instead of calling the reviewer. The cache is a single
+JSON file evicted least-recently-used first, bounded by entry count and by
+the total size of stored review text.
+
+A hit doesn't rewrite the cache: it appends the key to a small hits log
+next to it, which the next put() folds into the LRU order before evicting.
+Puts are read-modify-write under an fcntl lock on a sidecar file, so
+parallel reviews never drop each other's verdicts.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+MAX_ENTRIES = int(os.environ.get("REVIEW_CACHE_MAX_ENTRIES", "500"))
+MAX_BYTES = int(os.environ.get("REVIEW_CACHE_MAX_BYTES", str(2 * 1024 * 1024)))
+
+CACHE_VERSION = 1
+
+
+def content_hash(content):
+    """
+    Hash file content for cache lookups.
+
+    Line endings and trailing whitespace are normalized first, so changes a
+    formatter makes to them alone don't invalidate a verdict.
+    """
+    lines = [line.rstrip() for line in content.splitlines()]
+    while lines and not lines[-1]:
+        lines.pop()
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def cache_key(content, reviewer, prompt_version):
+    """Return the cache key for reviewing `content` with `reviewer`."""
+    return f"{content_hash(content)}:{reviewer}:{prompt_version}"
+
+
+class ReviewCache:
+    """LRU cache of review verdicts stored in a JSON file."""
+
+    def __init__(self, path, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".json.lock")
+        self.hits_path = self.path.with_suffix(".json.hits")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def load(self):
+        """Return the cached entries dict (empty if missing or unreadable)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def save(self, entries):
+        """Write entries atomically so concurrent readers never see a partial file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".review_cache.")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @contextmanager
+    def _locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def get(self, key):
+        """
+        Return the cached result for a key, or None.
+
+        A hit is logged for the LRU order; the cache file is not rewritten.
+        """
+        entry = self.load().get(key)
+        if entry is None:
+            return None
+
+        try:
+            # One short O_APPEND write per hit, so concurrent hits don't interleave
+            fd = os.open(self.hits_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, f"{time.time():.3f} {key}\n".encode("utf-8"))
+            finally:
+                os.close(fd)
+        except OSError:
+            pass  # A missed LRU refresh is harmless
+
+        result = dict(entry["result"])
+        result["cached"] = True
+        return result
+
+    def apply_hits(self, entries):
+        """Fold logged hits into the entries and clear the log (caller holds the lock)."""
+        try:
+            with open(self.hits_path, 'r+', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+                f.truncate(0)
+        except OSError:
+            return
+        for line in lines:
+            used, _, key = line.partition(" ")
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            try:
+                entry["last_used"] = max(entry.get("last_used", 0), float(used))
+            except ValueError:
+                continue
+            entry["hits"] = entry.get("hits", 0) + 1
+
+    def put(self, key, result, file_path=None):
+        """Store a review result, then evict down to the size limits."""
+        try:
+            with self._locked():
+                entries = self.load()
+                self.apply_hits(entries)
+                self._add(entries, key, result, file_path)
+                self.evict(entries)
+                self.save(entries)
+        except OSError as e:
+            print(f"Warning: Could not save review cache: {e}", file=sys.stderr)
+
+    def _add(self, entries, key, result, file_path):
+        now = time.time()
+        entries[key] = {
+            "result": {
+                "success": result.get("success", False),
+                "approved": result.get("approved", True),
+                "review": result.get("review", "")
+            },
+            "file_path": file_path,
+            "created": now,
+            "last_used": now,
+            "hits": 0
+        }
+
+    def evict(self, entries):
+        """Drop least-recently-used entries until both limits hold."""
+        total = sum(len(e["result"].get("review", "")) for e in entries.values())
+        if len(entries) <= self.max_entries and total <= self.max_bytes:
+            return
+
+        for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0)):
+            if len(entries) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= len(entries.pop(key)["result"].get("review", ""))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Chunked reviews for large files.
+
+Files longer than REVIEW_CHUNK_LINES are split along top-level definitions
+(ast for Python, brace depth for JS/TS) so each chunk fits in one reviewer
+call. Verdicts from the chunks are merged: the most severe status wins.
+"""
+
+import os
+import re
+
+CHUNK_LINES = int(os.environ.get("REVIEW_CHUNK_LINES", "400"))
+
+# Higher is more severe; the merged verdict takes the maximum
+STATUS_SEVERITY = {"APPROVED": 0, "CHANGES_NEEDED": 1, "REJECTED": 2}
+
+STATUS_PATTERN = re.compile(r"<status>\s*(APPROVED|CHANGES_NEEDED|REJECTED)\s*</status>")
+
+JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+
+# Strings and line comments, removed before counting braces
+JS_NOISE = re.compile(r"""//.*$|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`(?:\\.|[^`\\])*`""")
+
+
+def parse_status(output):
+    """
+    Return the review status from reviewer output.
+
+    Uses the first <status> tag; output without one falls back to the old
+    keyword check.
+    """
+    match = STATUS_PATTERN.search(output or "")
+    if match:
+        return match.group(1)
+    return "APPROVED" if "APPROVED" in (output or "") else "CHANGES_NEEDED"
+
+
+def python_boundaries(content, max_lines=CHUNK_LINES):
+    """
+    Return line numbers where a new top-level definition starts.
+
+    Classes too large for one chunk contribute their member boundaries too.
+    Returns None if the source does not parse.
+    """
+    import ast
+
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    def start_line(node):
+        decorators = getattr(node, "decorator_list", [])
+        return min([node.lineno] + [d.lineno for d in decorators])
+
+    boundaries = []
+    for node in tree.body:
+        boundaries.append(start_line(node))
+        size = node.end_lineno - start_line(node) + 1
+        if isinstance(node, ast.ClassDef) and size > max_lines:
+            boundaries.extend(start_line(member) for member in node.body)
+    return boundaries
+
+
+def brace_boundaries(content):
+    """
+    Return line numbers following a line that closes back to brace depth 0.
+
+    A heuristic for JS/TS: strings and // comments are ignored, block
+    comments and regex literals are not.
+    """
+    boundaries = []
+    depth = 0
+    for number, line in enumerate(content.splitlines(), start=1):
+        code = JS_NOISE.sub("", line)
+        depth = max(0, depth + code.count("{") - code.count("}"))
+        if depth == 0 and code.strip():
+            boundaries.append(number + 1)
+    return boundaries
+
+
+def line_boundaries(total_lines, max_lines):
+    """Fixed-size split points for files with no usable structure."""
+    return list(range(max_lines + 1, total_lines + 1, max_lines))
+
+
+def pack_chunks(boundaries, total_lines, max_lines):
+    """
+    Group lines into chunks of at most `max_lines`, cutting only at
+    boundaries. A single definition longer than `max_lines` stays whole.
+
+    Returns:
+        List of (start_line, end_line) pairs, 1-based and inclusive.
+    """
+    cuts = sorted(b for b in set(boundaries) if 1 < b <= total_lines) + [total_lines + 1]
+    chunks = []
+    start = 1
+    previous = None
+    for cut in cuts:
+        if cut - start > max_lines and previous is not None and previous > start:
+            chunks.append((start, previous - 1))
+            start = previous
+        previous = cut
+    chunks.append((start, total_lines))
+    return chunks
+
+
+def split_chunks(file_path, content, max_lines=CHUNK_LINES):
+    """
+    Split a file into review chunks.
+
+    Returns:
+        List of (start_line, end_line, text). A single chunk means the file
+        is small enough to review whole.
+    """
+    lines = content.splitlines(keepends=True)
+    if len(lines) <= max_lines:
+        return [(1, len(lines), content)]
+
+    boundaries = None
+    if str(file_path).endswith('.py'):
+        boundaries = python_boundaries(content, max_lines)
+    elif str(file_path).endswith(JS_EXTENSIONS):
+        boundaries = brace_boundaries(content)
+    if not boundaries:
+        boundaries = line_boundaries(len(lines), max_lines)
+
+    return [
+        (start, end, "".join(lines[start - 1:end]))
+        for start, end in pack_chunks(boundaries, len(lines), max_lines)
+    ]
+
+
+def merge_verdicts(chunk_results):
+    """
+    Merge per-chunk review results into one.
+
+    Args:
+        chunk_results: List of ((start_line, end_line), result dict).
+
+    Returns:
+        A single result dict. It fails if any chunk could not be reviewed,
+        and is approved only if every chunk is APPROVED.
+    """
+    errors = [f"lines {start}-{end}: {result.get('error')}"
+              for (start, end), result in chunk_results if not result.get('success')]
+    if errors:
+        return {'success': False, 'error': "; ".join(errors)}
+
+    status = max((result.get('status', 'APPROVED') for _, result in chunk_results),
+                 key=STATUS_SEVERITY.get)
+    review = "\n\n".join(f"### Lines {start}-{end}: {result.get('status')}\n{result.get('review', '')}"
+                         for (start, end), result in chunk_results)
+    return {
+        'success': True,
+        'approved': status == "APPROVED",
+        'status': status,
+        'review': f"<status>{status}</status>\n\n{review}"
+    }
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Durable index of quality gate verdicts per file and content.
+
+Every verdict the quality gate gets (sync, async worker or Stop) is
+recorded in .claude/state/review_index.json under the project-relative
+path and the normalized content hash (see review_cache.content_hash), with
+the verdict, reviewer, latency and review text. Unlike `pending_reviews`
+in session state nothing is pruned by age; only the oldest versions of a
+file beyond REVIEW_INDEX_VERSIONS (default 5) are dropped.
+
+The Stop hook asks "does every changed file have an approved review of its
+current content?" (review_status), and scripts/review_report.py answers
+the same question from the command line.
+
+Writes are read-modify-write under an fcntl lock on a sidecar file and
+replace the index atomically, so parallel reviews never drop each other's
+verdicts.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from common.review_cache import content_hash
+
+INDEX_NAME = "review_index.json"
+INDEX_VERSION = 1
+
+MAX_VERSIONS = int(os.environ.get("REVIEW_INDEX_VERSIONS", "5"))
+
+# review_status() results
+APPROVED = "approved"
+FLAGGED = "flagged"
+UNREVIEWED = "unreviewed"
+MISSING = "missing"
+UNREADABLE = "unreadable"
+
+
+def verdict_entry(result, reviewer, latency_ms, prompt_version=None):
+    """Build an index entry from a quality gate result."""
+    approved = result.get("approved", True)
+    return {
+        "verdict": result.get("status") or ("APPROVED" if approved else "CHANGES_NEEDED"),
+        "approved": approved,
+        "reviewer": reviewer,
+        "latency_ms": round(latency_ms, 1),
+        "cached": bool(result.get("cached")),
+        "prompt_version": prompt_version,
+        "reviewed_at": time.time(),
+        "review": result.get("review", "")
+    }
+
+
+class ReviewIndex:
+    """Verdicts keyed by file and content hash, stored in one JSON file."""
+
+    def __init__(self, path, max_versions=MAX_VERSIONS):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".json.lock")
+        self.max_versions = max_versions
+
+    def load(self):
+        """Return {rel_path: {content_hash: entry}} (empty if missing or unreadable)."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def lookup(self, rel_path, digest, files=None):
+        """Return the entry for one version of a file, or None."""
+        files = self.load() if files is None else files
+        return files.get(rel_path, {}).get(digest)
+
+    def history(self, rel_path, files=None):
+        """Return a file's recorded versions as (content_hash, entry), newest first."""
+        files = self.load() if files is None else files
+        versions = files.get(rel_path, {})
+        return sorted(versions.items(), key=lambda item: -item[1].get("reviewed_at", 0))
+
+    @contextmanager
+    def _locked(self):
+        # flock locks belong to the open file, so each call (process or
+        # pool thread) opens its own descriptor and they exclude each other
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def record(self, rel_path, digest, entry):
+        """Store the verdict for one version of a file."""
+        with self._locked():
+            files = self.load()
+            versions = files.setdefault(rel_path, {})
+            versions[digest] = entry
+            # Keep the newest versions of each file
+            for old in sorted(versions, key=lambda d: versions[d].get("reviewed_at", 0))[:-self.max_versions]:
+                del versions[old]
+            self._write(files)
+
+    def _write(self, files):
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".review_index.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": files}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def file_digest(root, rel_path):
+    """
+    Return the content hash of a project file.
+
+    Returns:
+        The hash, MISSING if the file does not exist, or UNREADABLE if it
+        is not UTF-8 text.
+    """
+    try:
+        with open(Path(root) / rel_path, "r", encoding="utf-8") as f:
+            return content_hash(f.read())
+    except FileNotFoundError:
+        return MISSING
+    except (OSError, UnicodeDecodeError):
+        return UNREADABLE
+
+
+def review_status(root, rel_paths, index):
+    """
+    Check each file's current content against the index.
+
+    Returns:
+        List of dicts with file, status (APPROVED, FLAGGED, UNREVIEWED,
+        MISSING or UNREADABLE) and the matching entry (or None), in input
+        order.
+    """
+    files = index.load()
+    statuses = []
+    for rel_path in rel_paths:
+        digest = file_digest(root, rel_path)
+        entry = None
+        if digest in (MISSING, UNREADABLE):
+            status = digest
+        else:
+            entry = index.lookup(rel_path, digest, files)
+            if entry is None:
+                status = UNREVIEWED
+            else:
+                status = APPROVED if entry.get("approved") else FLAGGED
+        statuses.append({"file": rel_path, "status": status, "entry": entry})
+    return statuses
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Asynchronous review queue shared by the quality gate, the review worker and
+the completion checker.
+
+With QUALITY_GATE_MODE=async the quality gate only enqueues a review job in
+session state (`pending_reviews`) and returns. A detached review worker runs
+queued jobs concurrently. Failed verdicts are surfaced by the next quality
+gate call or by the Stop hook, whichever comes first, and only once.
+
+With QUALITY_GATE_MODE=stop nothing is reviewed per edit; the Stop hook
+reviews the changed files without an approved verdict in the review index
+(common/review_index.py) in parallel.
+
+Edits to a file that already has a queued job are coalesced into it: the
+job's not_before time moves to the end of a quiet window
+(QUALITY_GATE_COALESCE_SECONDS), and the worker reviews the file once the
+edits stop. A job for an older version of a file that is already queued
+again is superseded rather than reported.
+
+Job statuses:
+    pending     queued, waiting for the worker (not before not_before)
+    running     claimed by the worker (worker_pid records which one)
+    completed   reviewer approved
+    failed      reviewer flagged issues or the review could not run
+    superseded  flagged an older version that has been queued again
+"""
+
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ACTIVE_STATUSES = ("pending", "running")
+
+WORKER_SCRIPT = Path(__file__).resolve().parent.parent / "core" / "review_worker.py"
+
+
+def review_mode():
+    """Return the quality gate mode: "sync" (default), "async" or "stop"."""
+    mode = os.environ.get("QUALITY_GATE_MODE", "sync").strip().lower()
+    return mode if mode in ("sync", "async", "stop") else "sync"
+
+
+def coalesce_seconds():
+    """Return the quiet window edits to one file are merged within."""
+    try:
+        return max(0.0, float(os.environ.get("QUALITY_GATE_COALESCE_SECONDS", "3")))
+    except ValueError:
+        return 3.0
+
+
+def quiet_window_end(now=None):
+    """Return the not_before timestamp for a job touched at `now`."""
+    now = now or datetime.now()
+    return (now + timedelta(seconds=coalesce_seconds())).isoformat()
+
+
+def is_due(review, now=None):
+    """Check whether a pending job's quiet window has passed."""
+    not_before = review.get("not_before")
+    if not not_before:
+        return True
+    try:
+        return datetime.fromisoformat(not_before) <= (now or datetime.now())
+    except ValueError:
+        return True
+
+
+def release_coalesced(state):
+    """
+    Make every queued job due immediately (used at Stop, when no more edits
+    are coming). Returns True if any job changed.
+    """
+    changed = False
+    for review in async_reviews(state, ("pending",)):
+        if review.get("not_before"):
+            review["not_before"] = None
+            changed = True
+    return changed
+
+
+def is_superseded(job, state):
+    """Check whether a newer job for the same file is queued or running."""
+    return any(
+        review.get("file_path") == job.get("file_path") and
+        review.get("review_id") != job.get("review_id") and
+        review.get("timestamp", "") > job.get("timestamp", "")
+        for review in async_reviews(state)
+    )
+
+
+def worker_pid_file(project_root):
+    """Return the pid file of the review worker for a project."""
+    return Path(project_root) / ".claude" / "state" / "review_worker.pid"
+
+
+def worker_pid(project_root):
+    """Return the pid of a live review worker, or None."""
+    try:
+        pid = int(worker_pid_file(project_root).read_text().strip())
+        os.kill(pid, 0)
+        return pid
+    except (OSError, ValueError):
+        return None
+
+
+def start_worker(project_root):
+    """
+    Start a detached review worker unless one is already running.
+
+    Returns:
+        True if a worker is running or was started.
+    """
+    if worker_pid(project_root):
+        return True
+
+    try:
+        subprocess.Popen(
+            [sys.executable, str(WORKER_SCRIPT)],
+            cwd=str(project_root),
+            env=dict(os.environ, CLAUDE_PROJECT_DIR=str(project_root)),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        print(f"Warning: Could not start review worker: {e}", file=sys.stderr)
+        return False
+    return True
+
+
+def async_reviews(state, statuses=ACTIVE_STATUSES):
+    """Return async review jobs in the given statuses."""
+    return [
+        review for review in state.get("pending_reviews", [])
+        if review.get("mode") == "async" and review.get("status") in statuses
+    ]
+
+
+def take_failed_reviews(state):
+    """
+    Return failed async reviews not yet reported and mark them surfaced.
+
+    The caller is responsible for saving the state afterwards.
+    """
+    failed = [review for review in async_reviews(state, ("failed",))
+              if not review.get("surfaced")]
+    for review in failed:
+        review["surfaced"] = True
+    return failed
+
+
+def format_failed_reviews(reviews):
+    """Build a stopReason message for failed async reviews."""
+    parts = []
+    for review in reviews:
+        result = review.get("result", {})
+        detail = result.get("review") or result.get("error") or "no details"
+        parts.append(f"Code review by {review.get('reviewer')} flagged issues in "
+                     f"{review.get('file_path')}. Review: {detail}")
+    return "\n\n".join(parts)
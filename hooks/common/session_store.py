@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Session state store shared by all hooks.
+
+One place to read and write .claude/state/session_state.json:
+- Writes go to a temp file that is renamed over the state file, so readers
+  never see a missing or half-written file. The previous version is kept as
+  session_state.json.backup.
+- Read-modify-write runs as a transaction under an exclusive fcntl lock on a
+  sidecar lock file, so concurrent hooks and the review worker don't drop
+  each other's updates.
+- Reads are cached in-process and revalidated with one stat() call, so
+  hooks sharing a process (chain runner, hook host) parse the file once.
+
+Usage:
+    store = session_store(STATE_FILE)
+    state = store.load()                # read-only snapshot
+    with store.transaction() as state:  # locked read-modify-write
+        state["last_agent"] = "glm"
+"""
+
+import copy
+import fcntl
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from common.metrics import span
+
+DEFAULT_STATE = {
+    "current_task": "",
+    "delegated_to_glm": [],
+    "delegated_to_codex": [],
+    "pending_reviews": [],
+    "changed_files": {},
+    "pending_docs_reviews": {},
+    "last_agent": "claude",
+    "glm_failures": 0,
+    "codex_failures": 0,
+    "session_start": None,
+    "total_tasks_completed": 0,
+    "hooks_executed": [],
+    "last_activity": None,
+    "session_id": None
+}
+
+
+def default_state():
+    """Return a fresh default session state."""
+    return copy.deepcopy(DEFAULT_STATE)
+
+
+class SessionStore:
+    """Locked, atomically written JSON session state."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix('.json.lock')
+        self.backup_path = self.path.with_suffix('.json.backup')
+        # (st_mtime_ns, st_size, st_ino) of the file the cache was read from
+        self._cache_key = None
+        self._cache = None
+        # fcntl locks are per process; threads also need to exclude each other
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_fd = None
+
+    def _stat_key(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load(self):
+        """
+        Return the current state (a private copy the caller may modify).
+
+        Missing keys are filled from the defaults; a missing or unreadable
+        file yields the default state.
+        """
+        key = self._stat_key()
+        if key is None:
+            return default_state()
+
+        if key != self._cache_key:
+            try:
+                with span("state_read"), open(self.path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load session state: {e}", file=sys.stderr)
+                return default_state()
+            if not isinstance(state, dict):
+                return default_state()
+            for name, value in DEFAULT_STATE.items():
+                state.setdefault(name, copy.deepcopy(value))
+            self._cache_key = key
+            self._cache = state
+
+        return copy.deepcopy(self._cache)
+
+    @contextmanager
+    def lock(self):
+        """Hold the exclusive state lock (re-entrant within a process)."""
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+                with span("state_lock_wait"):
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+                    os.close(self._lock_fd)
+                    self._lock_fd = None
+
+    @contextmanager
+    def transaction(self):
+        """
+        Locked read-modify-write.
+
+        Yields the current state; it is written back when the block exits
+        normally and discarded if the block raises.
+        """
+        with self.lock():
+            state = self.load()
+            yield state
+            self._write(state)
+
+    def save(self, state):
+        """Replace the whole state under the lock. Returns True on success."""
+        try:
+            with self.lock():
+                self._write(state)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error: Could not save session state: {e}", file=sys.stderr)
+            return False
+
+    def _write(self, state):
+        """Atomically replace the state file, keeping the previous version."""
+        with span("state_write"):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".session_state.")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, indent=2, ensure_ascii=False)
+
+                # Keep a backup without ever removing the live file
+                if self.path.exists():
+                    backup_tmp = f"{tmp_path}.backup"
+                    try:
+                        os.link(self.path, backup_tmp)
+                        os.replace(backup_tmp, self.backup_path)
+                    except OSError:
+                        pass
+
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+        self._cache_key = self._stat_key()
+        self._cache = copy.deepcopy(state)
+
+_stores = {}
+
+
+def session_store(path):
+    """Return the shared store for a state file (one per path per process)."""
+    key = str(Path(path).resolve())
+    if key not in _stores:
+        _stores[key] = SessionStore(path)
+    return _stores[key]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Snapshot store for diff-scoped reviews.
+
+Keeps the last approved content of each reviewed file under
+.claude/state/review_snapshots/, so the quality gate can send a reviewer
+only what changed since then instead of the whole file.
+"""
+
+import difflib
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+# Unchanged lines shown around each changed region
+CONTEXT_LINES = int(os.environ.get("REVIEW_CONTEXT_LINES", "20"))
+
+
+class SnapshotStore:
+    """Last approved content per file, one snapshot file per path."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def snapshot_path(self, file_path):
+        """Return where the snapshot of a file is stored."""
+        digest = hashlib.sha256(str(file_path).encode("utf-8")).hexdigest()[:24]
+        return self.root / digest
+
+    def load(self, file_path):
+        """Return the last snapshot of a file, or None on first sight."""
+        try:
+            return self.snapshot_path(file_path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def save(self, file_path, content):
+        """Store a snapshot atomically. Returns True on success."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".snapshot.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, self.snapshot_path(file_path))
+            return True
+        except OSError:
+            return False
+
+
+def diff_hunks(old, new, file_path, context=CONTEXT_LINES):
+    """
+    Return unified diff hunks from `old` to `new`.
+
+    Each hunk carries at most `context` unchanged lines on either side, so
+    its size depends on the change rather than the file. Returns an empty
+    string when nothing changed.
+    """
+    lines = difflib.unified_diff(
+        old.splitlines(keepends=True),
+        new.splitlines(keepends=True),
+        fromfile=f"a/{file_path} (last approved)",
+        tofile=f"b/{file_path}",
+        n=context
+    )
+    return "".join(line if line.endswith("\n") else line + "\n" for line in lines)
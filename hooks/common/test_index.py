@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Source-to-test index for the Stop hook.
+
+Every Python file in the project is recorded once with the modules it
+imports (from its AST) and whether it is a test file (test_*.py, *_test.py,
+or anything under a tests/ directory). From that the index answers "which
+tests cover this file" with dictionary lookups, matching a source file to
+tests that import it and to tests named after it (test_foo.py, foo_test.py,
+tests/ mirrors). Following imports in reverse also gives the tests
+impacted by a change through intermediate modules.
+
+The index is persisted in .claude/state/test_index.json. It is built by
+walking the tree the first time, then kept current by re-parsing only the
+changed paths each hook passes in (skipped when their stat is unchanged).
+"""
+
+import ast
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+INDEX_VERSION = 1
+
+# Directories never scanned for sources or tests
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", ".claude", ".agents", ".postbox", "node_modules",
+    "__pycache__", ".venv", "venv", "env", ".tox", ".nox", ".mypy_cache",
+    ".pytest_cache", ".ruff_cache", "build", "dist", "site-packages"
+}
+
+
+def is_test_file(rel_path):
+    """Check whether a project-relative path is a Python test file."""
+    path = Path(rel_path)
+    if path.suffix != ".py":
+        return False
+    name = path.stem
+    return (name.startswith("test_") or name.endswith("_test")
+            or "tests" in path.parts[:-1] or "test" in path.parts[:-1]) \
+        and name not in ("__init__", "conftest")
+
+
+def test_subject(rel_path):
+    """Return the module stem a test file is named after (test_foo.py -> foo)."""
+    name = Path(rel_path).stem
+    if name.startswith("test_"):
+        return name[len("test_"):]
+    if name.endswith("_test"):
+        return name[:-len("_test")]
+    return None
+
+
+def module_name(rel_path):
+    """Return the dotted module path of a project-relative Python file."""
+    parts = list(Path(rel_path).with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def module_suffixes(rel_path):
+    """
+    Return every dotted suffix of a file's module path.
+
+    backend/app/models.py can be imported as backend.app.models, app.models
+    or models depending on which directory is on sys.path.
+    """
+    parts = module_name(rel_path).split(".")
+    return [".".join(parts[i:]) for i in range(len(parts)) if parts[i:] != [""]]
+
+
+def parse_imports(path, rel_path):
+    """
+    Return the modules a file imports, as dotted names.
+
+    `from a.b import c` yields both a.b and a.b.c, since c may be a
+    submodule. Relative imports are resolved against the file's package.
+    """
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return []
+
+    package = module_name(rel_path).split(".")
+    if Path(rel_path).name != "__init__.py":
+        package = package[:-1]
+
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[:len(package) - node.level + 1] if node.level <= len(package) + 1 else []
+                prefix = ".".join(base + ([node.module] if node.module else []))
+            else:
+                prefix = node.module or ""
+            if prefix:
+                imports.add(prefix)
+            for alias in node.names:
+                if alias.name != "*":
+                    imports.add(f"{prefix}.{alias.name}" if prefix else alias.name)
+    return sorted(imports)
+
+
+class TestIndex:
+    """Persisted map from source files to the tests that cover them."""
+
+    def __init__(self, root, path):
+        self.root = Path(root)
+        self.path = Path(path)
+        self.files = {}
+        self._dirty = False
+        self._lookups = None
+
+    def load(self):
+        """Load the saved index, building it from the tree if there is none."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("version") == INDEX_VERSION \
+                    and data.get("root") == str(self.root):
+                self.files = data.get("files", {})
+                return self
+        except (OSError, ValueError):
+            pass
+        self.build()
+        return self
+
+    def save(self):
+        """Write the index atomically if it changed."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".test_index.")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": INDEX_VERSION, "root": str(self.root),
+                               "files": self.files}, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save test index: {e}", file=sys.stderr)
+
+    def build(self):
+        """Index every Python file under the root."""
+        self.files = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    rel_path = os.path.relpath(os.path.join(dirpath, filename), self.root)
+                    self._index_file(Path(rel_path).as_posix())
+        self._dirty = True
+        self._lookups = None
+
+    def update(self, changed_paths):
+        """Re-index changed Python files; drop the ones that no longer exist."""
+        for rel_path in changed_paths:
+            if rel_path.endswith(".py") and self._index_file(rel_path):
+                self._dirty = True
+                self._lookups = None
+
+    def _index_file(self, rel_path):
+        """Record one file's imports. Returns True if the index changed."""
+        try:
+            st = os.stat(self.root / rel_path)
+        except OSError:
+            return self.files.pop(rel_path, None) is not None
+
+        stat_key = [st.st_mtime_ns, st.st_size]
+        entry = self.files.get(rel_path)
+        if entry and entry.get("stat") == stat_key:
+            return False
+        self.files[rel_path] = {
+            "stat": stat_key,
+            "test": is_test_file(rel_path),
+            "imports": parse_imports(self.root / rel_path, rel_path)
+        }
+        return True
+
+    def lookups(self):
+        """
+        Return (importers by module, tests by imported module, tests by subject name).
+
+        Derived from the file entries on first use after a change.
+        """
+        if self._lookups is None:
+            importers, by_import, by_subject = {}, {}, {}
+            for rel_path, entry in self.files.items():
+                for name in entry.get("imports", []):
+                    importers.setdefault(name, set()).add(rel_path)
+                if not entry.get("test"):
+                    continue
+                for name in entry.get("imports", []):
+                    by_import.setdefault(name, set()).add(rel_path)
+                subject = test_subject(rel_path)
+                if subject:
+                    by_subject.setdefault(subject, set()).add(rel_path)
+            self._lookups = (importers, by_import, by_subject)
+        return self._lookups
+
+    def _named_tests(self, rel_path, by_subject):
+        stem = Path(rel_path).stem
+        if stem == "__init__":
+            stem = Path(rel_path).parent.name
+        return by_subject.get(stem, set())
+
+    def tests_for(self, rel_path):
+        """Return the test files that import or are named after a source file."""
+        _, by_import, by_subject = self.lookups()
+        tests = set()
+        for name in module_suffixes(rel_path):
+            tests |= by_import.get(name, set())
+        tests |= self._named_tests(rel_path, by_subject)
+        tests.discard(rel_path)
+        return sorted(tests)
+
+    def impacted_tests(self, changed_paths):
+        """
+        Return the tests affected by a set of changed files.
+
+        Follows the import graph in reverse: a test is impacted if it
+        changed, is named after a changed file, or imports (directly or
+        through other modules) a changed file.
+        """
+        importers, _, by_subject = self.lookups()
+        seen = {p for p in changed_paths if p.endswith(".py")}
+        pending = list(seen)
+        tests = set()
+        while pending:
+            rel_path = pending.pop()
+            if is_test_file(rel_path):
+                if rel_path in self.files:
+                    tests.add(rel_path)
+                continue
+            tests |= self._named_tests(rel_path, by_subject)
+            for name in module_suffixes(rel_path):
+                for importer in importers.get(name, ()):
+                    if importer not in seen:
+                        seen.add(importer)
+                        pending.append(importer)
+        return sorted(tests)
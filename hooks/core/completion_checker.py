@@ -9,55 +9,286 @@ Checks for:
 """
 
 import json
+import os
 import sys
+import time
 from pathlib import Path
 
-# Handle __file__ potentially being undefined when run as a hook command
-if '__file__' in globals():
-    PROJECT_ROOT = Path(__file__).parent.parent.parent
-else:
-    # Assume we're running from the project root or hooks are in .claude/hooks
-    PROJECT_ROOT = Path.cwd()
-    if (PROJECT_ROOT / ".claude" / "hooks").exists():
-        # We're in the project root
-        pass
-    else:
-        # Try to find the project root by looking for .claude directory
-        current = PROJECT_ROOT
-        while current != current.parent:
-            if (current / ".claude").exists():
-                PROJECT_ROOT = current
-                break
-            current = current.parent
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+
+from common.changed_files import changed_files as get_changed_files  # noqa: E402
+from common.event import read_event  # noqa: E402
+from common.hook_matchers import build_filter, is_interested  # noqa: E402
+from common.lint_cache import LintCache, file_hash, linter_fingerprint  # noqa: E402
+from common.metrics import span, timed_hook  # noqa: E402
+from common.paths import project_root  # noqa: E402
+from common.review_index import (  # noqa: E402
+    APPROVED, FLAGGED, INDEX_NAME, UNREVIEWED, ReviewIndex, review_status
+)
+from common.session_store import session_store  # noqa: E402
+from common.test_index import TestIndex, is_test_file  # noqa: E402
+from common.review_queue import (  # noqa: E402
+    async_reviews, format_failed_reviews, release_coalesced, review_mode,
+    start_worker, take_failed_reviews, worker_pid
+)
+
+# What this hook acts on (read by common/hook_matchers.py to generate settings)
+# "timeout" is emitted into the generated Stop entry: STOP_HOOK_BUDGET plus a
+# reviewer call started just before the budget ran out, plus linting
+HOOK_INTEREST = {"events": ["Stop"], "timeout": 180}
+
+PROJECT_ROOT = project_root(__file__)
 
 STATE_FILE = PROJECT_ROOT / ".claude" / "state" / "session_state.json"
+STORE = session_store(STATE_FILE)
 POSTBOX = PROJECT_ROOT / ".postbox"
+LINT_CACHE_FILE = PROJECT_ROOT / ".claude" / "state" / "lint_cache.json"
+TEST_INDEX_FILE = PROJECT_ROOT / ".claude" / "state" / "test_index.json"
+GIT_STATUS_CACHE = PROJECT_ROOT / ".claude" / "state" / "git_status.json"
+REVIEW_INDEX_FILE = PROJECT_ROOT / ".claude" / "state" / INDEX_NAME
+
+# Linters run by the Stop hook; unix-style output (path:line:col: message)
+# lets failures be attributed to files in a batched run
+LINTERS = {
+    "ruff": {
+        "label": "Ruff",
+        "extensions": ('.py',),
+        "command": ['ruff', 'check', '--output-format', 'concise']
+    },
+    "eslint": {
+        "label": "ESLint",
+        "extensions": ('.js', '.jsx', '.ts', '.tsx'),
+        "command": ['eslint', '--format', 'unix']
+    }
+}
+
+# Seconds shared by all Stop work that waits or scales with the change: the
+# wait for background reviews, stop-mode reviews and impacted tests. Each
+# gets at most what is left of it, so together they stay within the hook's
+# timeout (Claude kills a hook after 60s unless its settings set one).
+STOP_BUDGET = float(os.environ.get("STOP_HOOK_BUDGET", "90"))
+
+# Seconds to wait at Stop for background reviews still in flight
+REVIEW_STOP_TIMEOUT = float(os.environ.get("REVIEW_STOP_TIMEOUT", "30"))
+
+# QUALITY_GATE_MODE=stop: reviews run at once, and at most this many per Stop
+REVIEW_WORKERS = int(os.environ.get("REVIEW_WORKERS", "4"))
+STOP_REVIEW_MAX_FILES = int(os.environ.get("STOP_REVIEW_MAX_FILES", "20"))
+
+# Opt-in: run the tests impacted by the changed files at Stop
+RUN_IMPACTED_TESTS = os.environ.get("RUN_IMPACTED_TESTS", "").strip().lower() in ("1", "true", "yes", "on")
+IMPACTED_TEST_WORKERS = int(os.environ.get("IMPACTED_TEST_WORKERS", "4"))
+IMPACTED_TEST_BUDGET = float(os.environ.get("IMPACTED_TEST_BUDGET", "45"))
+
+def test_scope():
+    """
+    Return the path fragments whose Python files must have tests (empty = all).
 
-def check_tests_exist(changed_files):
+    A file is in scope if its path contains a fragment anywhere, so the
+    default "backend/" also covers services/backend/ and src/backend/.
+    """
+    scope = os.environ.get("TEST_CHECK_SCOPE", "backend/")
+    return [p.strip() for p in scope.split(",") if p.strip() and p.strip() != "*"]
+
+def load_test_index(changed_files):
+    """Load the source-to-test index, refreshed for the changed files."""
+    with span("test_index"):
+        index = TestIndex(PROJECT_ROOT, TEST_INDEX_FILE).load()
+        index.update(changed_files)
+        index.save()
+    return index
+
+def check_tests_exist(changed_files, index=None):
     """Verify tests exist for changed files."""
-    for file in changed_files:
-        if file.endswith('.py') and 'backend/' in file:
-            # Check if corresponding test exists
-            test_file = file.replace('backend/', 'backend/tests/').replace('.py', '_test.py')
-            test_path = PROJECT_ROOT / test_file
-            if not test_path.exists():
-                return False, f"Missing test for {file}"
+    scope = test_scope()
+    sources = [f for f in changed_files
+               if f.endswith('.py') and not is_test_file(f)
+               and (not scope or any(fragment in f for fragment in scope))
+               and Path(f).name != '__init__.py' and (PROJECT_ROOT / f).exists()]
+    if not sources:
+        return True, "Tests OK"
+
+    index = index or load_test_index(changed_files)
+    missing = [f for f in sources if not index.tests_for(f)]
+    if missing:
+        return False, f"Missing tests for {', '.join(missing)}"
     return True, "Tests OK"
 
+def run_test_shard(tests, timeout):
+    """
+    Run one shard of test files in a pytest process.
+
+    Returns:
+        Tuple of (status, failure lines) where status is "passed", "failed",
+        "timeout" or "unavailable".
+    """
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            [sys.executable, '-m', 'pytest', '-q', '-rfE', '--no-header'] + tests,
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_ROOT,
+            timeout=max(timeout, 1)
+        )
+    except subprocess.TimeoutExpired:
+        return "timeout", []
+
+    # 5 = no tests collected
+    if result.returncode in (0, 5):
+        return "passed", []
+    if "No module named pytest" in result.stderr:
+        return "unavailable", []
+
+    failures = [line for line in result.stdout.splitlines()
+                if line.startswith(("FAILED ", "ERROR "))]
+    return "failed", failures or [f"pytest exited {result.returncode} for {', '.join(tests)}"]
+
+def check_impacted_tests(changed_files, index, stop_deadline):
+    """
+    Run the tests impacted by the changed files.
+
+    Tests are split into shards run by parallel pytest processes, all
+    bounded by IMPACTED_TEST_BUDGET seconds and by what is left of the Stop
+    budget. Shards that run out of time are warned about rather than
+    failed, so a slow suite can't block stopping.
+    """
+    tests = index.impacted_tests(changed_files)
+    if not tests:
+        return True, "No impacted tests"
+
+    budget = min(IMPACTED_TEST_BUDGET, stop_deadline - time.monotonic())
+    if budget <= 0:
+        print(f"Warning: Stop budget used up, skipping {len(tests)} impacted tests", file=sys.stderr)
+        return True, "Impacted tests skipped"
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = max(1, min(IMPACTED_TEST_WORKERS, len(tests)))
+    shards = [tests[i::workers] for i in range(workers)]
+    deadline = time.monotonic() + budget
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            lambda shard: run_test_shard(shard, deadline - time.monotonic()), shards))
+
+    statuses = [status for status, _ in results]
+    if "unavailable" in statuses:
+        print("Warning: pytest not installed, skipping impacted tests", file=sys.stderr)
+    timed_out = sum(len(shard) for shard, status in zip(shards, statuses) if status == "timeout")
+    if timed_out:
+        print(f"Warning: {timed_out} impacted tests did not finish within "
+              f"{budget:.0f}s", file=sys.stderr)
+
+    failures = [line for status, lines in results if status == "failed" for line in lines]
+    if failures:
+        shown = failures[:10] + ([f"... and {len(failures) - 10} more"] if len(failures) > 10 else [])
+        return False, f"Impacted tests failed: {'; '.join(shown)}"
+    return True, f"{len(tests)} impacted tests passed"
+
 def check_pending_delegations():
     """Check if there are pending tasks delegated to GLM/Codex."""
-    try:
-        if STATE_FILE.exists():
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
-                pending = [d for d in state.get('delegated_to_glm', []) 
-                          if not d.get('completed', False)]
-                if pending:
-                    return False, f"{len(pending)} delegated tasks not completed"
-    except:
-        pass
+    pending = [d for d in STORE.load().get('delegated_to_glm', [])
+               if not d.get('completed', False)]
+    if pending:
+        return False, f"{len(pending)} delegated tasks not completed"
     return True, "No pending delegations"
 
+def check_async_reviews(stop_deadline):
+    """Wait briefly for background reviews, then report any that failed."""
+    state = STORE.load()
+    if not state.get("pending_reviews"):
+        return True, "No background reviews"
+
+    # No more edits are coming, so queued jobs need not wait out their window
+    if any(r.get("not_before") for r in async_reviews(state, ("pending",))):
+        with STORE.transaction() as state:
+            release_coalesced(state)
+
+    # Jobs queued after the last worker exited still need one
+    if async_reviews(state) and not worker_pid(PROJECT_ROOT):
+        start_worker(PROJECT_ROOT)
+
+    deadline = min(time.monotonic() + REVIEW_STOP_TIMEOUT, stop_deadline)
+    while async_reviews(state) and time.monotonic() < deadline:
+        time.sleep(0.5)
+        state = STORE.load()
+
+    if take_failed_reviews(state):
+        # Claim them under the lock so a concurrent quality gate can't report them too
+        with STORE.transaction() as state:
+            failed = take_failed_reviews(state)
+        if failed:
+            return False, format_failed_reviews(failed)
+
+    in_flight = async_reviews(state)
+    if in_flight:
+        return False, f"{len(in_flight)} background reviews still running"
+    return True, "Background reviews passed"
+
+def check_reviews(changed_files, stop_deadline):
+    """
+    Require an approved review of every changed file's current content.
+
+    Files without a verdict in the review index are reviewed in parallel
+    (QUALITY_GATE_MODE=stop, where the quality gate skips per-edit reviews).
+    No review starts once the Stop budget is used up; those files are
+    reported as not reviewed yet.
+    """
+    # The quality gate lives next to this hook; imported only in stop mode
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import quality_gate
+
+    gate_filter = build_filter(quality_gate.HOOK_INTEREST)
+    reviewable = [f for f in changed_files if is_interested(gate_filter, None, [f])]
+    statuses = review_status(PROJECT_ROOT, reviewable, ReviewIndex(REVIEW_INDEX_FILE))
+
+    flagged = [(s["file"], s["entry"]) for s in statuses if s["status"] == FLAGGED]
+    approved = sum(1 for s in statuses if s["status"] == APPROVED)
+    todo = [s["file"] for s in statuses if s["status"] == UNREVIEWED]
+    over_limit = len(todo[STOP_REVIEW_MAX_FILES:])
+    todo = todo[:STOP_REVIEW_MAX_FILES]
+    out_of_time = 0
+
+    def review_in_budget(file_path):
+        if time.monotonic() >= stop_deadline:
+            return None
+        return quality_gate.review_file(file_path)
+
+    if todo:
+        from concurrent.futures import ThreadPoolExecutor
+
+        print(f"Reviewing {len(todo)} changed files", file=sys.stderr)
+        with ThreadPoolExecutor(max_workers=max(1, REVIEW_WORKERS)) as pool:
+            results = list(pool.map(review_in_budget, todo))
+        for file_path, reviewed in zip(todo, results):
+            if reviewed is None:
+                out_of_time += 1
+                continue
+            reviewer, result = reviewed
+            if not result.get('success'):
+                # Same as the per-edit gate: a reviewer that can't run doesn't block
+                print(f"Review of {file_path} failed: {result.get('error')}", file=sys.stderr)
+            elif not result.get('approved', True):
+                flagged.append((file_path, {"reviewer": reviewer, "review": result.get('review', '')}))
+            else:
+                approved += 1
+
+    problems = [f"Code review by {entry.get('reviewer')} flagged issues in {file_path}. "
+                f"Review: {entry.get('review') or 'no details'}" for file_path, entry in flagged]
+    if over_limit:
+        problems.append(f"{over_limit} more changed files not reviewed yet "
+                        f"(at most {STOP_REVIEW_MAX_FILES} per stop)")
+    if out_of_time:
+        problems.append(f"{out_of_time} changed files not reviewed yet "
+                        f"(Stop budget of {STOP_BUDGET:.0f}s used up)")
+    if problems:
+        return False, "\n\n".join(problems)
+    return True, f"{approved} changed files approved by review"
+
 def check_documentation():
     """Verify documentation is updated for significant changes."""
     docs_updated = (PROJECT_ROOT / "docs" / "tasks_2025-10-22.md").exists()
@@ -65,73 +296,149 @@ def check_documentation():
         return False, "Task documentation not updated"
     return True, "Documentation OK"
 
-def check_linting(changed_files):
-    """Run linters on changed files."""
-    import subprocess
-
+def group_files_by_linter(changed_files):
+    """Group existing changed files by the linter that checks them."""
+    groups = {}
     for file in changed_files:
-        if file.endswith('.py'):
-            # Check if the file exists (might be a symlink)
-            file_path = PROJECT_ROOT / file
-            if not file_path.exists():
-                # Skip linting for files that don't exist (e.g., broken symlinks)
-                continue
+        for name, linter in LINTERS.items():
+            if file.endswith(linter["extensions"]):
+                # Skip files that don't exist (deleted, broken symlinks)
+                if (PROJECT_ROOT / file).exists():
+                    groups.setdefault(name, []).append(file)
+                break
+    return groups
 
-            # Run ruff
-            result = subprocess.run(
-                ['ruff', 'check', str(file_path)],
-                capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT
-            )
-            if result.returncode != 0:
-                return False, f"Ruff linting failed: {file}\n{result.stdout}"
-        
-        elif file.endswith(('.js', '.jsx', '.ts', '.tsx')):
-            # Run eslint
-            result = subprocess.run(
-                ['eslint', file],
-                capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT
-            )
-            if result.returncode != 0:
-                return False, f"ESLint failed: {file}\n{result.stdout}"
-    
-    return True, "Linting passed"
+def output_by_file(output, files):
+    """Split linter output into the lines reported for each file in a batch."""
+    lines_by_path = {}
+    for line in output.splitlines():
+        path = line.split(":", 1)[0].strip()
+        if path:
+            lines_by_path.setdefault(path, []).append(line)
 
-def main():
-    """Main hook: Check if we're really done."""
-    # Check if there's data on stdin (for Stop hooks, there won't be)
-    import select
-    if select.select([sys.stdin], [], [], 0.0)[0]:
-        try:
-            tool_data = json.load(sys.stdin)
-        except json.JSONDecodeError:
-            tool_data = None
-    else:
-        tool_data = None
-    
-    # Get changed files from git
+    by_file = {}
+    for f in files:
+        lines = lines_by_path.get(f, []) + lines_by_path.get(str(PROJECT_ROOT / f), [])
+        if lines:
+            by_file[f] = "\n".join(lines)
+    return by_file
+
+def run_linter(name, files):
+    """
+    Run one linter over a batch of files.
+
+    Returns:
+        Tuple of (passed, output), or None if the linter isn't installed.
+    """
     import subprocess
+
+    linter = LINTERS[name]
     try:
         result = subprocess.run(
-            ['git', 'diff', '--name-only'],
+            linter["command"] + files,
             capture_output=True,
             text=True,
             cwd=PROJECT_ROOT
         )
-        changed_files = result.stdout.strip().split('\n') if result.stdout.strip() else []
-    except:
-        changed_files = []
+    except FileNotFoundError:
+        print(f"Warning: {linter['label']} not installed, skipping {len(files)} files", file=sys.stderr)
+        return None
+
+    return result.returncode == 0, result.stdout.strip() or result.stderr.strip()
+
+def lint_group(cache, name, files):
+    """
+    Lint one linter's files, re-running it only on files not cached as fresh.
+
+    Returns:
+        Tuple of (passed, failure report).
+    """
+    linter = LINTERS[name]
+    fingerprint = linter_fingerprint(name, linter["command"], PROJECT_ROOT)
+    digests = {f: file_hash(PROJECT_ROOT / f) for f in files}
+
+    failures = {}
+    stale = []
+    for f in files:
+        entry = cache.get(name, fingerprint, f, digests[f])
+        if entry is None:
+            stale.append(f)
+        elif not entry["passed"]:
+            failures[f] = entry["output"]
+
+    unattributed = ""
+    if stale:
+        with span(f"lint:{name}"):
+            result = run_linter(name, stale)
+        if result is not None:
+            passed, output = result
+            by_file = {} if passed else output_by_file(output, stale)
+            if passed or by_file:
+                for f in stale:
+                    cache.put(name, fingerprint, f, digests[f], f not in by_file, by_file.get(f, ""))
+                failures.update(by_file)
+            else:
+                # Failure we can't pin on a file (e.g. a config error): report it, cache nothing
+                failures.update({f: "" for f in stale})
+                unattributed = output
+
+    if not failures:
+        return True, ""
+    details = "\n".join(text for text in list(failures.values()) + [unattributed] if text)
+    return False, f"{linter['label']} failed for {len(failures)} file(s): {', '.join(failures)}\n{details}"
+
+def check_linting(changed_files):
+    """
+    Run linters on changed files.
+
+    Each linter runs once over all of its files whose lint result isn't
+    cached for their current content, linters run concurrently, and every
+    failure is reported together.
+    """
+    groups = group_files_by_linter(changed_files)
+    if not groups:
+        return True, "Linting passed"
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = LintCache(LINT_CACHE_FILE)
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        results = list(pool.map(lambda item: lint_group(cache, *item), groups.items()))
+    cache.save()
+
+    failures = [report for passed, report in results if not passed]
+    if failures:
+        return False, "\n".join(failures)
+    return True, "Linting passed"
+
+@timed_hook("completion_checker")
+def main():
+    """Main hook: Check if we're really done."""
+    # Stop hooks may not receive any data on stdin; nothing in it is used yet
+    tool_data = read_event(fields=("hook_event_name", "stop_hook_active"))
+    stop_deadline = time.monotonic() + STOP_BUDGET
     
+    # Staged, unstaged and untracked files, plus edits recorded this session
+    changed_files = get_changed_files(PROJECT_ROOT, STORE, GIT_STATUS_CACHE)
+    
+    # Only load the test index up front when both checks will use it
+    index = load_test_index(changed_files) if RUN_IMPACTED_TESTS else None
+
     # Run checks
     checks = [
-        check_tests_exist(changed_files),
+        check_tests_exist(changed_files, index),
         check_pending_delegations(),
+        check_async_reviews(stop_deadline),
         check_documentation(),
-        check_linting(changed_files)  # Added linting check
     ]
+    if review_mode() == "stop":
+        with span("reviews"):
+            checks.append(check_reviews(changed_files, stop_deadline))
+    with span("lint"):
+        checks.append(check_linting(changed_files))
+    if RUN_IMPACTED_TESTS:
+        with span("tests"):
+            checks.append(check_impacted_tests(changed_files, index, stop_deadline))
     
     failed_checks = [(check, reason) for check, reason in checks if not check]
     
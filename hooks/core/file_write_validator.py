@@ -6,128 +6,199 @@ Prevents agents from modifying protected files and directories
 """
 
 import json
+import re
 import sys
-import os
-from pathlib import Path
-
-# Handle __file__ potentially being undefined when run as a hook command
-if '__file__' in globals():
-    HOOKS_DIR = Path(__file__).parent
-    PROJECT_ROOT = HOOKS_DIR.parent.parent
-else:
-    PROJECT_ROOT = Path.cwd()
-    if (PROJECT_ROOT / "hooks" / "core").exists():
-        HOOKS_DIR = PROJECT_ROOT / "hooks" / "core"
-    else:
-        # Try to find project root
-        current = PROJECT_ROOT
-        while current != current.parent:
-            if (current / "config" / "agent_rules.json").exists():
-                PROJECT_ROOT = current
-                HOOKS_DIR = current / "hooks" / "core"
-                break
-            current = current.parent
+from pathlib import Path, PurePosixPath
+
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+
+from common.changed_files import event_file_paths  # noqa: E402
+from common.event import TOOL_FIELDS, read_event  # noqa: E402
+from common.metrics import span, timed_hook  # noqa: E402
+from common.paths import project_root  # noqa: E402
+
+PROJECT_ROOT = project_root(__file__)
 
+# The project's own rules, else the ones shipped next to the hooks
 CONFIG_FILE = PROJECT_ROOT / "config" / "agent_rules.json"
+if not CONFIG_FILE.exists():
+    CONFIG_FILE = HOOKS_ROOT.parent / "config" / "agent_rules.json"
+
+# What this hook acts on (read by common/hook_matchers.py to generate settings).
+# Only forbidden/protected paths and root markdown can block or warn;
+# write_freely paths are allowed before any other check.
+HOOK_INTEREST = {
+    "events": ["PreToolUse"],
+    "tools": ["Edit", "Write"],
+    "include": ["*.md"],
+    "include_rules": ["forbidden_paths", "protected_paths"],
+    "exclude_rules": ["allowed_paths.write_freely"]
+}
+
+
+# Cached (config mtime_ns, rules, compiled rules); refreshed when the config changes
+_rules_cache = None
+
+DEFAULT_RULES = {
+    "forbidden_paths": {
+        "root_markdown": ["README.md", "*.md"],
+        "config": ["config/*"],
+        "hooks": ["hooks/*"]
+    },
+    "protected_paths": {
+        "require_approval": ["docs/", ".env", ".gitignore"]
+    },
+    "allowed_paths": {
+        "write_freely": [".agents/", "docs/coordination/", "docs/analysis/"]
+    },
+    "enforcement": {
+        "block_root_md_writes": True,
+        "require_approval_for_protected": True
+    },
+    "block_message": "BLOCKED: Cannot modify protected file: {file_path}\n\nReason: {reason}"
+}
 
 
 def load_agent_rules():
-    """Load agent writing rules from config file."""
-    if not CONFIG_FILE.exists():
+    """Load agent writing rules from config file (cached on config mtime)."""
+    global _rules_cache
+
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
         # Return default restrictive rules if config missing
-        return {
-            "forbidden_paths": {
-                "root_markdown": ["README.md", "*.md"],
-                "config": ["config/*"],
-                "hooks": ["hooks/*"]
-            },
-            "protected_paths": {
-                "require_approval": ["docs/", ".env", ".gitignore"]
-            },
-            "allowed_paths": {
-                "write_freely": [".agents/", "docs/coordination/", "docs/analysis/"]
-            },
-            "enforcement": {
-                "block_root_md_writes": True,
-                "require_approval_for_protected": True
-            },
-            "block_message": "BLOCKED: Cannot modify protected file: {file_path}\n\nReason: {reason}"
-        }
+        return DEFAULT_RULES
+
+    if _rules_cache and _rules_cache[0] == mtime:
+        return _rules_cache[1]
 
     try:
         with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
+            rules = json.load(f)
     except (json.JSONDecodeError, IOError) as e:
         print(f"Warning: Could not load agent rules: {e}", file=sys.stderr)
         return None
 
+    _rules_cache = (mtime, rules, compile_rules(rules))
+    return rules
+
 
 def parse_tool_input():
     """Parse tool input from stdin."""
-    import select
-    if select.select([sys.stdin], [], [], 0.0)[0]:
-        try:
-            tool_data = json.load(sys.stdin)
-            return tool_data
-        except json.JSONDecodeError:
-            return None
-    else:
-        return None
+    return read_event(fields=TOOL_FIELDS)
 
 
 def get_file_paths_from_tool(tool_input):
     """Extract file paths from tool input."""
-    file_paths = []
+    return event_file_paths(tool_input)
+
+
+class PathRuleSet:
+    """
+    A category of path patterns compiled for single-pass matching.
+
+    Plain and directory patterns ("docs/", "setup.py") go into a prefix trie
+    keyed by path component, so a lookup costs one step per component no
+    matter how many rules exist. Wildcard patterns are merged into one
+    alternation regex with a named group per pattern.
+    """
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns: Iterable of (pattern, label) pairs, in priority order.
+        """
+        self.trie = {}
+        self.glob_labels = {}
+        globs = []
+
+        for pattern, label in patterns:
+            if '*' in pattern or '?' in pattern:
+                group = f"g{len(globs)}"
+                regex = re.escape(pattern).replace(r'\*', '.*').replace(r'\?', '.')
+                globs.append(f"(?P<{group}>{regex})")
+                self.glob_labels[group] = label
+                continue
+
+            node = self.trie
+            for part in PurePosixPath(pattern).parts:
+                node = node.setdefault(part, {})
+            # Keep the first (highest priority) label for duplicate patterns
+            node.setdefault(None, label)
+
+        self.glob_regex = re.compile("|".join(globs)) if globs else None
+
+    def match(self, parts, path_str):
+        """
+        Return the label of the first matching pattern, or None.
+
+        Args:
+            parts: Path components relative to the project root.
+            path_str: The same path as a '/'-joined string.
+        """
+        node = self.trie
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                break
+            if None in node:
+                return node[None]
 
-    if not tool_input:
-        return file_paths
+        if self.glob_regex:
+            m = self.glob_regex.fullmatch(path_str)
+            if m:
+                return self.glob_labels[m.lastgroup]
+
+        return None
 
-    # Handle different tool formats
-    tool_name = tool_input.get('tool_name', '')
 
-    if tool_name == 'Write':
-        # Write tool has 'file_path'
-        if 'file_path' in tool_input.get('tool_input', {}):
-            file_paths.append(tool_input['tool_input']['file_path'])
+def compile_rules(rules):
+    """Compile a rules dict into per-category PathRuleSets."""
+    def category_patterns(section):
+        return [
+            (pattern, (category, pattern))
+            for category, patterns in rules.get(section, {}).items()
+            for pattern in patterns
+        ]
 
-    elif tool_name == 'Edit':
-        # Edit tool has 'file_path'
-        if 'file_path' in tool_input.get('tool_input', {}):
-            file_paths.append(tool_input['tool_input']['file_path'])
+    write_freely = rules.get('allowed_paths', {}).get('write_freely', [])
+    return {
+        "allowed": PathRuleSet((p, ("write_freely", p)) for p in write_freely),
+        "forbidden": PathRuleSet(category_patterns('forbidden_paths')),
+        "protected": PathRuleSet(category_patterns('protected_paths'))
+    }
 
-    elif tool_name == 'Glob':
-        # Glob tool - we only care about write operations
-        pass
 
-    # Also check for direct 'file_path' or 'files' keys
-    if 'file_path' in tool_input:
-        file_paths.append(tool_input['file_path'])
-    if 'files' in tool_input:
-        file_paths.extend(tool_input['files'])
+def get_compiled_rules(rules):
+    """Return compiled rules, reusing the cache when rules came from it."""
+    if _rules_cache and _rules_cache[1] is rules:
+        return _rules_cache[2]
+    return compile_rules(rules)
 
-    return file_paths
+
+def normalize_path(file_path):
+    """
+    Resolve a path once and split it relative to the project root.
+
+    Returns:
+        Tuple of (resolved Path, relative parts, relative path string).
+        Paths outside the project keep their absolute parts.
+    """
+    path = Path(file_path).resolve()
+    try:
+        parts = path.relative_to(PROJECT_ROOT).parts
+    except ValueError:
+        parts = path.parts
+    return path, parts, "/".join(parts)
 
 
 def matches_pattern(path_str, pattern):
-    """Check if a path matches a pattern (supports wildcards)."""
-    path = Path(path_str).resolve()
-    pattern_path = Path(pattern).resolve()
-
-    # Simple wildcard matching
-    if '*' in pattern:
-        # Convert glob pattern to regex
-        import re
-        regex = re.escape(pattern)
-        regex = regex.replace(r'\*', '.*')
-        regex = regex.replace(r'\?', '.')
-        regex = f'^{regex}$'
-        return re.match(regex, str(path)) is not None
-
-    # Exact match or prefix match for directories
-    if pattern.endswith('/'):
-        return str(path).startswith(str(pattern_path))
-    else:
-        return path == pattern_path or path.is_relative_to(pattern_path)
+    """Check if a project-relative path matches a single pattern."""
+    parts = PurePosixPath(path_str).parts
+    return PathRuleSet([(pattern, pattern)]).match(parts, "/".join(parts)) is not None
 
 
 def is_forbidden(file_path, rules):
@@ -135,15 +206,10 @@ def is_forbidden(file_path, rules):
     if not rules or 'forbidden_paths' not in rules:
         return False, None
 
-    path = Path(file_path).resolve()
-    relative_path = path.relative_to(PROJECT_ROOT) if path.is_relative_to(PROJECT_ROOT) else path
-
-    # Check each forbidden category
-    for category, patterns in rules.get('forbidden_paths', {}).items():
-        for pattern in patterns:
-            if matches_pattern(str(relative_path), pattern):
-                return True, f"Category: {category}, Pattern: {pattern}"
-
+    _, parts, path_str = normalize_path(file_path)
+    label = get_compiled_rules(rules)["forbidden"].match(parts, path_str)
+    if label:
+        return True, f"Category: {label[0]}, Pattern: {label[1]}"
     return False, None
 
 
@@ -152,14 +218,10 @@ def is_protected(file_path, rules):
     if not rules or 'protected_paths' not in rules:
         return False, None
 
-    path = Path(file_path).resolve()
-    relative_path = path.relative_to(PROJECT_ROOT) if path.is_relative_to(PROJECT_ROOT) else path
-
-    for category, patterns in rules.get('protected_paths', {}).items():
-        for pattern in patterns:
-            if matches_pattern(str(relative_path), pattern):
-                return True, f"Category: {category}"
-
+    _, parts, path_str = normalize_path(file_path)
+    label = get_compiled_rules(rules)["protected"].match(parts, path_str)
+    if label:
+        return True, f"Category: {label[0]}"
     return False, None
 
 
@@ -168,16 +230,9 @@ def is_allowed(file_path, rules):
     if not rules or 'allowed_paths' not in rules:
         return False
 
-    path = Path(file_path).resolve()
-    relative_path = path.relative_to(PROJECT_ROOT) if path.is_relative_to(PROJECT_ROOT) else path
-
-    # Only check write_freely patterns, not read_only
-    write_patterns = rules.get('allowed_paths', {}).get('write_freely', [])
-    for pattern in write_patterns:
-        if matches_pattern(str(relative_path), pattern):
-            return True
-
-    return False
+    # Only write_freely patterns are compiled, not read_only
+    _, parts, path_str = normalize_path(file_path)
+    return get_compiled_rules(rules)["allowed"].match(parts, path_str) is not None
 
 
 def check_root_markdown_violation(file_path, rules):
@@ -185,22 +240,11 @@ def check_root_markdown_violation(file_path, rules):
     enforcement = rules.get('enforcement', {})
 
     if not enforcement.get('block_root_md_writes', True):
-        return False
+        return False, None
 
     path = Path(file_path).resolve()
-    relative_path = path.relative_to(PROJECT_ROOT) if path.is_relative_to(PROJECT_ROOT) else path
-
-    # Check if it's a markdown file in root
-    if path.suffix.lower() == '.md':
-        # Check if parent is project root
-        try:
-            if path.parent == PROJECT_ROOT:
-                return True, "Markdown files cannot be created in project root"
-        except:
-            # If we can't resolve relative to project root, check path depth
-            parts = relative_path.parts
-            if len(parts) == 1 and path.suffix.lower() == '.md':
-                return True, "Markdown files cannot be created in project root"
+    if path.suffix.lower() == '.md' and path.parent == PROJECT_ROOT:
+        return True, "Markdown files cannot be created in project root"
 
     return False, None
 
@@ -210,32 +254,37 @@ def validate_file_writes(file_paths, rules):
     if not rules:
         return [], [], []  # No rules to enforce
 
+    compiled = get_compiled_rules(rules)
+    block_root_md = rules.get('enforcement', {}).get('block_root_md_writes', True)
+
     blocked = []
     warnings = []
     allowed = []
 
     for file_path in file_paths:
+        # One normalization per file; every check below reuses it
+        path, parts, path_str = normalize_path(file_path)
+
         # Check if explicitly allowed first
-        if is_allowed(file_path, rules):
+        if compiled["allowed"].match(parts, path_str):
             allowed.append(file_path)
             continue
 
         # Check for root markdown violations
-        is_root_md, reason = check_root_markdown_violation(file_path, rules)
-        if is_root_md:
-            blocked.append((file_path, reason))
+        if block_root_md and path.suffix.lower() == '.md' and path.parent == PROJECT_ROOT:
+            blocked.append((file_path, "Markdown files cannot be created in project root"))
             continue
 
         # Check forbidden paths
-        is_bad, reason = is_forbidden(file_path, rules)
-        if is_bad:
-            blocked.append((file_path, f"Protected path: {reason}"))
+        label = compiled["forbidden"].match(parts, path_str)
+        if label:
+            blocked.append((file_path, f"Protected path: Category: {label[0]}, Pattern: {label[1]}"))
             continue
 
         # Check protected paths
-        is_prot, reason = is_protected(file_path, rules)
-        if is_prot:
-            warnings.append((file_path, f"Protected path: {reason}"))
+        label = compiled["protected"].match(parts, path_str)
+        if label:
+            warnings.append((file_path, f"Protected path: Category: {label[0]}"))
             continue
 
         # Default to allowed if no rules matched
@@ -272,6 +321,7 @@ def format_block_message(rules, blocked_items):
     return "\n".join(lines)
 
 
+@timed_hook("file_write_validator")
 def main():
     """Main hook execution."""
     tool_input = parse_tool_input()
@@ -285,7 +335,8 @@ def main():
         sys.exit(0)
 
     # Load rules
-    rules = load_agent_rules()
+    with span("config"):
+        rules = load_agent_rules()
     if not rules:
         sys.exit(0)  # Allow if no rules
 
@@ -296,7 +347,8 @@ def main():
         sys.exit(0)
 
     # Validate
-    blocked, warnings, allowed = validate_file_writes(file_paths, rules)
+    with span("validate"):
+        blocked, warnings, allowed = validate_file_writes(file_paths, rules)
 
     # Print warnings for protected files
     for file_path, reason in warnings:
@@ -5,85 +5,89 @@ This prevents LLMs from overestimating their own capabilities.
 """
 
 import json
+import os
 import sys
 import subprocess
+import time
 from datetime import datetime
 from pathlib import Path
 
-# Handle __file__ potentially being undefined when run as a hook command
-if '__file__' in globals():
-    PROJECT_ROOT = Path(__file__).parent.parent.parent
-else:
-    # Assume we're running from the project root or hooks are in .claude/hooks
-    PROJECT_ROOT = Path.cwd()
-    if (PROJECT_ROOT / ".claude" / "hooks").exists():
-        # We're in the project root
-        pass
-    else:
-        # Try to find the project root by looking for .claude directory
-        current = PROJECT_ROOT
-        while current != current.parent:
-            if (current / ".claude").exists():
-                PROJECT_ROOT = current
-                break
-            current = current.parent
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+
+from common.changed_files import record_changed_files, relative_path  # noqa: E402
+from common.event import TOOL_FIELDS, read_event  # noqa: E402
+from common.hook_matchers import build_filter, is_interested  # noqa: E402
+from common.metrics import span, timed_hook  # noqa: E402
+from common.paths import project_root  # noqa: E402
+from common.review_cache import ReviewCache, cache_key, content_hash  # noqa: E402
+from common.review_chunks import merge_verdicts, parse_status, split_chunks  # noqa: E402
+from common.review_index import INDEX_NAME, ReviewIndex, verdict_entry  # noqa: E402
+from common.session_store import session_store  # noqa: E402
+from common.snapshot_store import SnapshotStore, diff_hunks  # noqa: E402
+from common.review_queue import (  # noqa: E402
+    async_reviews, format_failed_reviews, quiet_window_end, review_mode,
+    start_worker, take_failed_reviews
+)
+
+# What this hook acts on (read by common/hook_matchers.py to generate settings).
+# Agent outputs, runtime state, lockfiles and binaries are never reviewed.
+# A synchronous review may take the reviewer's full 60s, so ask for more.
+HOOK_INTEREST = {
+    "events": ["PostToolUse"],
+    "timeout": 90,
+    "tools": ["Edit", "MultiEdit", "Write"],
+    "exclude": [
+        ".agents/", ".claude/state/", "*.lock", "**/package-lock.json",
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.ico", "*.webp", "*.pdf",
+        "*.zip", "*.gz", "*.woff", "*.woff2"
+    ]
+}
+
+PROJECT_ROOT = project_root(__file__)
 
 STATE_FILE = PROJECT_ROOT / ".claude" / "state" / "session_state.json"
+STORE = session_store(STATE_FILE)
+REVIEW_CACHE_FILE = PROJECT_ROOT / ".claude" / "state" / "review_cache.json"
+REVIEW_INDEX_FILE = PROJECT_ROOT / ".claude" / "state" / INDEX_NAME
+SNAPSHOT_DIR = PROJECT_ROOT / ".claude" / "state" / "review_snapshots"
 
-def load_session_state():
-    """Load session state from file with error handling."""
-    try:
-        if STATE_FILE.exists():
-            with open(STATE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except (json.JSONDecodeError, IOError, OSError) as e:
-        print(f"Warning: Could not load session state: {e}", file=sys.stderr)
-
-    # Return default state if file doesn't exist or is invalid
-    return {
-        "current_task": "",
-        "delegated_to_glm": [],
-        "delegated_to_codex": [],
-        "pending_reviews": [],
-        "last_agent": "claude",
-        "glm_failures": 0,
-        "codex_failures": 0,
-        "session_start": None,
-        "total_tasks_completed": 0,
-        "hooks_executed": [],
-        "last_activity": None,
-        "session_id": None
-    }
+# Bump whenever the review prompt changes so cached verdicts are not reused
+PROMPT_VERSION = "3"
 
-def save_session_state(state):
-    """Save session state to file with error handling."""
-    try:
-        # Ensure the state directory exists
-        state_dir = STATE_FILE.parent
-        state_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create backup before saving
-        if STATE_FILE.exists():
-            backup_file = STATE_FILE.with_suffix('.json.backup')
-            STATE_FILE.rename(backup_file)
-
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
-        return True
-    except (IOError, OSError, json.JSONEncodeError) as e:
-        print(f"Error: Could not save session state: {e}", file=sys.stderr)
-        return False
+# Reviewer calls running at once when a large file is reviewed in chunks
+CHUNK_WORKERS = int(os.environ.get("REVIEW_CHUNK_WORKERS", "4"))
+
+REVIEW_CRITERIA = """Review criteria:
+1. Code quality and style
+2. Security issues
+3. Performance concerns
+4. Adherence to PMM pattern (vanilla JS, no build tools)
+5. Module size (<400 lines)
+
+Return your review in this format:
+<review>
+<status>APPROVED|CHANGES_NEEDED|REJECTED</status>
+<issues>
+- List any issues found
+</issues>
+<recommendations>
+- List recommendations
+</recommendations>
+</review>
+"""
 
 def get_last_agent():
     """Determine which agent made the last change."""
     try:
-        state = load_session_state()
-        return state.get('last_agent', 'claude')
+        return STORE.load().get('last_agent', 'claude')
     except:
         return 'claude'
 
 def is_review_already_pending(file_path, reviewer, state):
-    """Check if a review is already pending for this file and reviewer."""
+    """Check if a review is already queued for this file and reviewer."""
     if "pending_reviews" not in state:
         return False
 
@@ -94,35 +98,42 @@ def is_review_already_pending(file_path, reviewer, state):
             return True
     return False
 
-def add_pending_review(file_path, reviewer, last_agent, state):
+def add_pending_review(file_path, reviewer, last_agent, state, mode="sync"):
     """Add a pending review to the session state."""
     if "pending_reviews" not in state:
         state["pending_reviews"] = []
 
+    now = datetime.now()
     review_entry = {
         "file_path": file_path,
         "reviewer": reviewer,
         "author": last_agent,
         "status": "pending",
-        "timestamp": datetime.now().isoformat(),
-        "review_id": f"review_{int(datetime.now().timestamp())}"
+        "mode": mode,
+        "timestamp": now.isoformat(),
+        "review_id": f"review_{now.strftime('%Y%m%d%H%M%S%f')}"
     }
 
     state["pending_reviews"].append(review_entry)
     return state
 
-def update_review_completion(file_path, reviewer, result, state):
+def update_review_completion(file_path, reviewer, result, state, review_id=None):
     """Update the review status when completed."""
     if "pending_reviews" not in state:
         return state
 
-    # Find and update the pending review
+    # Find and update the pending review (by id when the caller has one)
     for review in state["pending_reviews"]:
-        if (review.get("file_path") == file_path and
-            review.get("reviewer") == reviewer and
-            review.get("status") == "pending"):
+        if review_id is not None:
+            matches = review.get("review_id") == review_id
+        else:
+            matches = (review.get("file_path") == file_path and
+                       review.get("reviewer") == reviewer and
+                       review.get("status") == "pending")
+        if matches:
 
             review["status"] = "completed" if result.get("approved", True) else "failed"
+            review.pop("worker_pid", None)
             review["completion_timestamp"] = datetime.now().isoformat()
             review["result"] = {
                 "approved": result.get("approved", True),
@@ -147,10 +158,14 @@ def cleanup_old_reviews(state):
             # Keep pending reviews and recent completed reviews
             review_time = datetime.fromisoformat(review.get("timestamp", ""))
 
-            if review.get("status") == "pending":
-                # Keep all pending reviews
+            if review.get("status") in ("pending", "running"):
+                # Keep all queued and in-progress reviews
+                cleaned_reviews.append(review)
+            elif review.get("status") == "failed" and review.get("mode") == "async" \
+                    and not review.get("surfaced"):
+                # Keep async failures until a hook has reported them
                 cleaned_reviews.append(review)
-            elif review.get("status") in ["completed", "failed"]:
+            elif review.get("status") in ["completed", "failed", "superseded"]:
                 # Keep completed/failed reviews for 1 hour
                 completion_time = datetime.fromisoformat(review.get("completion_timestamp", review.get("timestamp")))
                 if (current_time - completion_time).total_seconds() < 3600:
@@ -171,74 +186,108 @@ def choose_reviewer(last_agent):
     }
     return reviewers.get(last_agent, 'glm')
 
-def call_reviewer(reviewer, file_path, tool_output):
-    """Call the reviewer LLM to check the changes."""
-    
-    # Read the file content
+def read_file_content(file_path):
+    """Read a file to review. Returns (content, error)."""
     try:
         full_path = PROJECT_ROOT / file_path
         with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            return f.read(), None
     except Exception as e:
-        return {
-            'success': False,
-            'error': f"Could not read file: {e}"
-        }
-    
-    prompt = f"""You are reviewing code changes for quality and correctness.
+        return None, f"Could not read file: {e}"
+
+def cached_review(reviewer, file_path):
+    """Return the cached verdict for the file's current content, or None."""
+    content, error = read_file_content(file_path)
+    if error:
+        return None
+    with span("review_cache"):
+        return ReviewCache(REVIEW_CACHE_FILE).get(cache_key(content, reviewer, PROMPT_VERSION))
+
+def review_header(file_path):
+    """Opening lines shared by every review prompt."""
+    return f"""You are reviewing code changes for quality and correctness.
 
 File: {file_path}
 Changed by: {get_last_agent()}
+"""
 
+def build_review_prompt(file_path, content, snapshot):
+    """
+    Build the reviewer prompt.
+
+    On first sight (no snapshot) the whole file is sent. Afterwards only the
+    diff hunks against the last approved version are sent, with a bounded
+    window of surrounding lines, unless the diff would be larger than the
+    file itself.
+
+    Returns:
+        The prompt, or None when the whole file should be reviewed.
+    """
+    hunks = diff_hunks(snapshot, content, file_path) if snapshot is not None else None
+    if hunks and len(hunks) < len(content):
+        total_lines = len(content.splitlines())
+        return f"""{review_header(file_path)}
+The rest of this file ({total_lines} lines) was approved in an earlier review.
+Review only these changes since then (unified diff with surrounding context):
+```diff
+{hunks}```
+
+{REVIEW_CRITERIA}"""
+
+    return None
+
+def build_chunk_prompt(file_path, chunk, chunk_count, total_lines):
+    """Build the prompt for one chunk of a file (or the whole file)."""
+    start, end, text = chunk
+    if chunk_count == 1:
+        return f"""{review_header(file_path)}
 File content:
 ```
-{content}
+{text}
 ```
 
-Review criteria:
-1. Code quality and style
-2. Security issues
-3. Performance concerns
-4. Adherence to PMM pattern (vanilla JS, no build tools)
-5. Module size (<400 lines)
+{REVIEW_CRITERIA}"""
 
-Return your review in this format:
-<review>
-<status>APPROVED|CHANGES_NEEDED|REJECTED</status>
-<issues>
-- List any issues found
-</issues>
-<recommendations>
-- List recommendations
-</recommendations>
-</review>
-"""
-    
-    # Call appropriate reviewer CLI
+    return f"""{review_header(file_path)}
+This file has {total_lines} lines and is reviewed in {chunk_count} parts.
+Below are lines {start}-{end}; judge only this part, and ignore criteria
+that need the whole file (such as module size).
+
+File content (lines {start}-{end}):
+```
+{text}
+```
+
+{REVIEW_CRITERIA}"""
+
+def reviewer_command(reviewer, prompt):
+    """Return the CLI command for a reviewer, or None for the placeholder."""
     if reviewer == 'glm':
-        cmd = ['python', 'scripts/llm/glm_cli.py', '--prompt', prompt]
+        return ['python', 'scripts/llm/glm_cli.py', '--prompt', prompt]
     elif reviewer == 'codex':
-        cmd = ['python', 'scripts/llm/codex_cli.py', '--prompt', prompt]
-    else:  # claude subagent
-        return {'success': True, 'approved': True}  # Placeholder
-    
+        return ['python', 'scripts/llm/codex_cli.py', '--prompt', prompt]
+    return None  # claude subagent
+
+def run_reviewer(cmd):
+    """Run a reviewer CLI and parse its verdict."""
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60,
-            cwd=PROJECT_ROOT
-        )
-        
+        with span("reviewer"):
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=60,
+                cwd=PROJECT_ROOT
+            )
+
         if result.returncode == 0:
             # Parse review
             output = result.stdout
-            approved = 'APPROVED' in output
-            
+            status = parse_status(output)
             return {
                 'success': True,
-                'approved': approved,
+                'approved': status == "APPROVED",
+                'status': status,
                 'review': output
             }
         else:
@@ -252,68 +301,150 @@ Return your review in this format:
             'error': str(e)
         }
 
-def main():
-    """Main hook: Review changes with different LLM with session state integration."""
-    # Check if there's data on stdin
-    import select
-    if select.select([sys.stdin], [], [], 0.0)[0]:
-        try:
-            tool_data = json.load(sys.stdin)
-        except json.JSONDecodeError:
-            sys.exit(0)
-    else:
-        sys.exit(0)
-
-    tool_input = tool_data.get('tool_input', {})
-    file_path = tool_input.get('file_path', '')
-
-    if not file_path:
-        sys.exit(0)  # Nothing to review
-
-    # Load current session state
-    state = load_session_state()
-
-    # Determine reviewer
-    last_agent = get_last_agent()
-    reviewer = choose_reviewer(last_agent)
-
-    # Check if review is already pending
-    if is_review_already_pending(file_path, reviewer, state):
-        print(f"Review already pending for {file_path} by {reviewer}", file=sys.stderr)
-        sys.exit(0)  # Skip duplicate review
-
-    print(f"Reviewing {file_path} with {reviewer} (changed by {last_agent})", file=sys.stderr)
-
-    # Add pending review to session state
-    state = add_pending_review(file_path, reviewer, last_agent, state)
-
-    # Clean up old reviews before adding new one
-    state = cleanup_old_reviews(state)
+def review_whole_file(reviewer, file_path, content):
+    """
+    Review a whole file, in parallel chunks when it is large.
+
+    Chunks follow top-level definitions; at most CHUNK_WORKERS reviewer
+    calls run at once, so wall time is bounded by the slowest chunk when
+    there are no more chunks than workers.
+    """
+    chunks = split_chunks(file_path, content)
+    total_lines = len(content.splitlines())
+    prompts = [build_chunk_prompt(file_path, chunk, len(chunks), total_lines)
+               for chunk in chunks]
+
+    if len(chunks) == 1:
+        return run_reviewer(reviewer_command(reviewer, prompts[0]))
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    print(f"Reviewing {file_path} in {len(chunks)} chunks", file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=max(1, CHUNK_WORKERS)) as pool:
+        results = list(pool.map(
+            lambda prompt: run_reviewer(reviewer_command(reviewer, prompt)), prompts
+        ))
+    return merge_verdicts([((start, end), result)
+                           for (start, end, _), result in zip(chunks, results)])
+
+def record_verdict(file_path, content, reviewer, result, started):
+    """Add a verdict to the durable review index (read by the Stop hook)."""
+    rel_path = relative_path(file_path, PROJECT_ROOT) or str(file_path)
+    entry = verdict_entry(result, reviewer, (time.monotonic() - started) * 1000, PROMPT_VERSION)
+    try:
+        ReviewIndex(REVIEW_INDEX_FILE).record(rel_path, content_hash(content), entry)
+    except OSError as e:
+        print(f"Warning: Could not record review in the index: {e}", file=sys.stderr)
 
-    # Save updated state
-    if not save_session_state(state):
-        print("Warning: Could not save pending review to session state", file=sys.stderr)
+def call_reviewer(reviewer, file_path):
+    """Call the reviewer LLM to check the changes."""
+    started = time.monotonic()
 
-    tool_output = tool_data.get('tool_response', {})
-    result = call_reviewer(reviewer, file_path, tool_output)
+    # Read the file content
+    content, error = read_file_content(file_path)
+    if error:
+        return {
+            'success': False,
+            'error': error
+        }
 
-    # Update session state with review results
-    updated_state = load_session_state()  # Reload to get latest state
-    updated_state = update_review_completion(file_path, reviewer, result, updated_state)
+    # Identical content was already reviewed with this prompt
+    cache = ReviewCache(REVIEW_CACHE_FILE)
+    key = cache_key(content, reviewer, PROMPT_VERSION)
+    cached = cache.get(key)
+    if cached:
+        record_verdict(file_path, content, reviewer, cached, started)
+        return cached
+
+    if reviewer_command(reviewer, "") is None:
+        result = {'success': True, 'approved': True}  # Placeholder
+        record_verdict(file_path, content, reviewer, result, started)
+        return result
+
+    snapshots = SnapshotStore(SNAPSHOT_DIR)
+    prompt = build_review_prompt(file_path, content, snapshots.load(file_path))
+    if prompt:
+        review = run_reviewer(reviewer_command(reviewer, prompt))
+    else:
+        review = review_whole_file(reviewer, file_path, content)
+
+    if review['success']:
+        cache.put(key, review, file_path=file_path)
+        record_verdict(file_path, content, reviewer, review, started)
+        # Later edits are reviewed as a diff against this version
+        if review['approved']:
+            snapshots.save(file_path, content)
+    return review
+
+def review_file(file_path):
+    """Review one file with the reviewer chosen for its last author. Returns (reviewer, result)."""
+    reviewer = choose_reviewer(get_last_agent())
+    return reviewer, call_reviewer(reviewer, file_path)
+
+def surface_failed_reviews():
+    """Block on async review failures that no hook has reported yet."""
+    if not take_failed_reviews(STORE.load()):
+        sys.exit(0)
 
-    # Update last activity timestamp
-    updated_state["last_activity"] = datetime.now().isoformat()
-    updated_state["last_agent"] = last_agent
+    # Claim them under the lock so a concurrent Stop hook can't report them too
+    with STORE.transaction() as state:
+        failed = take_failed_reviews(state)
+    if not failed:
+        sys.exit(0)
 
-    # Add quality_gate to hooks_executed if not present
-    if "hooks_executed" not in updated_state:
-        updated_state["hooks_executed"] = []
-    if "quality_gate" not in updated_state["hooks_executed"]:
-        updated_state["hooks_executed"].append("quality_gate")
+    output = {
+        "continue": False,
+        "stopReason": format_failed_reviews(failed)
+    }
+    print(json.dumps(output))
+    sys.exit(2)  # Exit code 2 = blocking error
+
+
+def coalesce_review(file_path, reviewer, last_agent, state):
+    """
+    Merge this edit into a job already queued for the file.
+
+    A queued job reads the file when it runs, so it covers this edit too;
+    its quiet window restarts so a burst of edits gets one review.
+
+    Returns:
+        True if the edit was merged into an existing job.
+    """
+    for review in async_reviews(state, ("pending",)):
+        if review.get("file_path") == file_path:
+            review["reviewer"] = reviewer
+            review["author"] = last_agent
+            review["not_before"] = quiet_window_end()
+            review["edits"] = review.get("edits", 1) + 1
+            return True
+    return False
 
-    # Save final state
-    save_session_state(updated_state)
 
+def enqueue_review(file_path, reviewer, last_agent):
+    """Queue a review for the background worker without waiting for it."""
+    try:
+        with STORE.transaction() as state:
+            coalesced = coalesce_review(file_path, reviewer, last_agent, state)
+            if not coalesced:
+                add_pending_review(file_path, reviewer, last_agent, state, mode="async")
+                state["pending_reviews"][-1]["not_before"] = quiet_window_end()
+                state["pending_reviews"][-1]["edits"] = 1
+            cleanup_old_reviews(state)
+            state["last_activity"] = datetime.now().isoformat()
+            if "quality_gate" not in state.setdefault("hooks_executed", []):
+                state["hooks_executed"].append("quality_gate")
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not save queued review to session state: {e}", file=sys.stderr)
+        return
+
+    if coalesced:
+        print(f"Coalesced edit of {file_path} into its queued review", file=sys.stderr)
+    elif start_worker(PROJECT_ROOT):
+        print(f"Queued review of {file_path} by {reviewer} (changed by {last_agent})", file=sys.stderr)
+
+
+def report_result(reviewer, result):
+    """Exit the hook according to a review result."""
     if not result['success']:
         print(f"Review failed: {result.get('error')}", file=sys.stderr)
         sys.exit(0)
@@ -330,5 +461,87 @@ def main():
         print(f"Review passed by {reviewer}", file=sys.stderr)
         sys.exit(0)
 
+@timed_hook("quality_gate")
+def main():
+    """Main hook: Review changes with different LLM with session state integration."""
+    tool_data = read_event(fields=TOOL_FIELDS)
+    if not tool_data:
+        sys.exit(0)
+
+    # Feed the shared changed-file set that the Stop hook reads
+    try:
+        record_changed_files(STORE, tool_data, PROJECT_ROOT)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not record changed files: {e}", file=sys.stderr)
+
+    tool_input = tool_data.get('tool_input', {})
+    file_path = tool_input.get('file_path', '')
+
+    if not file_path:
+        sys.exit(0)  # Nothing to review
+
+    # Same check the generated prefilter applies before this hook is run
+    rel_path = relative_path(file_path, PROJECT_ROOT)
+    if rel_path and not is_interested(build_filter(HOOK_INTEREST), tool_data.get('tool_name'), [rel_path]):
+        sys.exit(0)
+
+    # Stop mode: the Stop hook reviews changed files that lack an approved
+    # review of their current content, all at once
+    if review_mode() == "stop":
+        sys.exit(0)
+
+    # Content already reviewed: reuse the verdict without an LLM call
+    last_agent = get_last_agent()
+    reviewer = choose_reviewer(last_agent)
+    result = cached_review(reviewer, file_path)
+    if result:
+        print(f"Using cached review of {file_path} by {reviewer}", file=sys.stderr)
+        if review_mode() == "sync" or not result.get('approved', True):
+            report_result(reviewer, result)
+
+    if review_mode() == "async":
+        if not result:
+            enqueue_review(file_path, reviewer, last_agent)
+        # Earlier background reviews that failed block now; this one runs later
+        surface_failed_reviews()
+
+    # Check and record the pending review in one locked step, so two hooks
+    # can't both start a review of the same file
+    try:
+        with STORE.transaction() as state:
+            duplicate = is_review_already_pending(file_path, reviewer, state)
+            if not duplicate:
+                # Clean up old reviews before adding new one
+                cleanup_old_reviews(state)
+                add_pending_review(file_path, reviewer, last_agent, state)
+    except (OSError, ValueError) as e:
+        duplicate = False
+        print(f"Warning: Could not save pending review to session state: {e}", file=sys.stderr)
+
+    if duplicate:
+        print(f"Review already pending for {file_path} by {reviewer}", file=sys.stderr)
+        sys.exit(0)  # Skip duplicate review
+
+    print(f"Reviewing {file_path} with {reviewer} (changed by {last_agent})", file=sys.stderr)
+
+    result = call_reviewer(reviewer, file_path)
+
+    # Update session state with review results (the reviewer call runs unlocked)
+    try:
+        with STORE.transaction() as state:
+            update_review_completion(file_path, reviewer, result, state)
+
+            # Update last activity timestamp
+            state["last_activity"] = datetime.now().isoformat()
+            state["last_agent"] = last_agent
+
+            # Add quality_gate to hooks_executed if not present
+            if "quality_gate" not in state.setdefault("hooks_executed", []):
+                state["hooks_executed"].append("quality_gate")
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not save review result to session state: {e}", file=sys.stderr)
+
+    report_result(reviewer, result)
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Review worker: runs queued quality gate reviews in the background.
+
+Started on demand by quality_gate.py when QUALITY_GATE_MODE=async. Claims
+pending review jobs whose coalescing window has passed, runs up to
+REVIEW_WORKERS reviews concurrently, records each verdict and exits after
+REVIEW_WORKER_IDLE seconds with an empty queue. Only one worker runs per
+project (pid file in .claude/state/).
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common.paths import project_root  # noqa: E402
+from common.pid_file import PidFile  # noqa: E402
+from common.review_queue import (  # noqa: E402
+    async_reviews, is_due, is_superseded, worker_pid_file
+)
+import quality_gate  # noqa: E402
+
+PROJECT_ROOT = project_root(__file__)
+STORE = quality_gate.STORE
+
+MAX_WORKERS = int(os.environ.get("REVIEW_WORKERS", "4"))
+IDLE_TIMEOUT = float(os.environ.get("REVIEW_WORKER_IDLE", "10"))
+POLL_INTERVAL = 0.5
+
+
+def recover_orphaned_jobs():
+    """Requeue jobs claimed by a worker that is no longer running."""
+    with STORE.transaction() as state:
+        for review in async_reviews(state, ("running",)):
+            pid = review.get("worker_pid")
+            try:
+                os.kill(pid, 0)
+            except (OSError, TypeError):
+                review["status"] = "pending"
+                review.pop("worker_pid", None)
+
+
+def claim_jobs(limit):
+    """
+    Mark up to `limit` due pending jobs as running.
+
+    Returns:
+        Tuple of (claimed jobs, number of jobs still waiting in the queue).
+    """
+    # Cheap unlocked check first; the worker polls this twice a second
+    pending = async_reviews(STORE.load(), ("pending",))
+    now = datetime.now()
+    if limit <= 0 or not any(is_due(job, now) for job in pending):
+        return [], len(pending)
+
+    with STORE.transaction() as state:
+        pending = async_reviews(state, ("pending",))
+        jobs = [job for job in pending if is_due(job, now)][:limit]
+        for job in jobs:
+            job["status"] = "running"
+            job["worker_pid"] = os.getpid()
+            job["started_timestamp"] = datetime.now().isoformat()
+    return [dict(job) for job in jobs], len(pending) - len(jobs)
+
+
+def run_review(job):
+    """Run one review job. Executes in a pool thread."""
+    return quality_gate.call_reviewer(job["reviewer"], job["file_path"])
+
+
+def finish_job(job, result):
+    """Record a review verdict in session state."""
+    with STORE.transaction() as state:
+        quality_gate.update_review_completion(
+            job["file_path"], job["reviewer"], result, state, review_id=job["review_id"]
+        )
+
+        # The file was edited again while this review ran; its newer job decides
+        if is_superseded(job, state):
+            for review in state.get("pending_reviews", []):
+                if review.get("review_id") == job["review_id"] and review.get("status") == "failed":
+                    review["status"] = "superseded"
+
+
+def serve(pid_file):
+    """Process the queue until it has been empty for IDLE_TIMEOUT seconds."""
+    recover_orphaned_jobs()
+
+    in_flight = {}
+    idle_since = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        while True:
+            jobs, waiting = claim_jobs(MAX_WORKERS - len(in_flight))
+            for job in jobs:
+                in_flight[pool.submit(run_review, job)] = job
+
+            if not in_flight:
+                # Jobs inside their coalescing window keep the worker alive
+                if waiting:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since >= IDLE_TIMEOUT:
+                    with STORE.transaction() as state:
+                        if not async_reviews(state, ("pending",)):
+                            # Give up the pid file under the lock, so a quality gate
+                            # queueing right now either sees a worker that will take
+                            # its job or no worker and starts one
+                            pid_file.release()
+                            return
+                    idle_since = time.monotonic()
+                    continue
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            done, _ = wait(in_flight, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                # Verdicts are recorded from this thread only
+                finish_job(job, result)
+            idle_since = time.monotonic()
+
+
+def main():
+    """Run the worker unless another one already serves this project."""
+    pid_file = PidFile(worker_pid_file(PROJECT_ROOT))
+    if not pid_file.acquire():
+        sys.exit(0)
+
+    try:
+        serve(pid_file)
+    finally:
+        pid_file.release()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Hook client: forwards a Claude hook call to the hook host daemon.
+
+Usage (in settings.json):
+    python /path/to/.claude/hooks/hook_client.py quality_gate
+    python /path/to/.claude/hooks/hook_client.py --prefilter hook_filters.json run_chain a b
+
+Reads the hook payload from stdin, sends it over a Unix socket to
+hook_host.py, and relays the hook's stdout, stderr and exit code. If no
+host is running (the connect fails), the hook script is executed directly
+instead, so hooks keep working without the daemon. Once the payload is
+being sent the hook may already be running in the host, so later failures
+are reported as a non-blocking error instead of running it a second time.
+
+With --prefilter, hooks whose generated filter (see common/hook_matchers.py)
+rejects the event's tool or paths are dropped first; if none are left the
+client exits 0 without contacting the host or starting any hook.
+
+Kept deliberately small: only builtin modules are imported on the fast path.
+"""
+
+import json
+import os
+import socket
+import sys
+import zlib
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Reviews can legitimately take a while; don't hang forever on a dead host
+RESPONSE_TIMEOUT = 600
+
+
+def socket_path(hooks_dir=HOOKS_DIR):
+    """Return the host socket path for a hooks directory."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    digest = zlib.crc32(os.path.realpath(hooks_dir).encode("utf-8"))
+    return os.path.join(runtime_dir, f"agent-hooks-{os.getuid()}-{digest:08x}.sock")
+
+
+def run_direct(hook_name, payload=None):
+    """
+    Run the hook script without the host.
+
+    If stdin has not been consumed yet the process is replaced by the hook;
+    otherwise the already-read payload is piped into a child process.
+    """
+    sys.path.insert(0, HOOKS_DIR)
+    from common.loader import hook_path
+
+    path = hook_path(hook_name)
+    if path is None:
+        print(f"Unknown hook: {hook_name}", file=sys.stderr)
+        sys.exit(1)
+
+    argv = [sys.executable, str(path)] + sys.argv[2:]
+    if payload is None:
+        os.execv(sys.executable, argv)
+
+    import subprocess
+    sys.exit(subprocess.run(argv, input=payload).returncode)
+
+
+def recv_line(sock):
+    """Read one newline-terminated message from the socket."""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+def prefilter(filters_file, payload):
+    """
+    Drop hooks that would ignore this event from sys.argv.
+
+    Returns:
+        False if no hook is left to run.
+    """
+    sys.path.insert(0, HOOKS_DIR)
+    from common.event import TOOL_FIELDS, extract_fields
+    from common.hook_matchers import load_filters, select_hooks
+
+    filters = load_filters(filters_file)
+    if not filters:
+        return True
+    # Only the tool name and paths are decoded, never the written content
+    event = extract_fields(payload, TOOL_FIELDS)
+
+    root = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    if sys.argv[1] == "run_chain":
+        kept = select_hooks(filters, sys.argv[2:], event, root)
+        sys.argv[2:] = kept
+    else:
+        kept = select_hooks(filters, sys.argv[1:2], event, root)
+    return bool(kept)
+
+
+def main():
+    payload = None
+    if len(sys.argv) > 2 and sys.argv[1] == "--prefilter":
+        filters_file = sys.argv[2]
+        del sys.argv[1:3]
+        if len(sys.argv) >= 2:
+            payload = sys.stdin.buffer.read()
+            if not prefilter(filters_file, payload):
+                sys.exit(0)
+
+    if len(sys.argv) < 2:
+        print("Usage: hook_client.py [--prefilter FILE] <hook_name>", file=sys.stderr)
+        sys.exit(1)
+
+    hook_name = sys.argv[1]
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        # No host running: run the hook directly, with stdin untouched if possible
+        sock.close()
+        run_direct(hook_name, payload)
+        return
+
+    if payload is None:
+        payload = sys.stdin.buffer.read()
+    header = {
+        "hook": hook_name,
+        "argv": sys.argv[2:],
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "size": len(payload)
+    }
+
+    try:
+        sock.settimeout(RESPONSE_TIMEOUT)
+        sock.sendall(json.dumps(header).encode("utf-8") + b"\n" + payload)
+        line = recv_line(sock)
+        if not line:
+            raise OSError("empty response")
+        response = json.loads(line)
+    except (OSError, ValueError) as e:
+        sock.close()
+        print(f"Hook host failed while running {hook_name}: {e}", file=sys.stderr)
+        sys.exit(1)
+    sock.close()
+
+    if response.get("stdout"):
+        sys.stdout.write(response["stdout"])
+        sys.stdout.flush()
+    if response.get("stderr"):
+        sys.stderr.write(response["stderr"])
+        sys.stderr.flush()
+    sys.exit(response.get("exit_code", 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Hook host: a persistent daemon that runs Claude hooks without per-call
+interpreter startup.
+
+All hook modules are imported once at startup. Each call from
+hook_client.py is served in a forked child, so hooks keep their
+process-per-call isolation (sys.exit, module globals, crashes) while
+paying only for a fork instead of a Python startup plus imports.
+Hook scripts edited on disk are re-imported automatically.
+
+One host serves every project using its hooks directory. Each child
+resolves the project root from the caller's cwd and environment, and
+re-imports the hooks when it differs from the root they were imported
+for, so hooks never write into another project's state.
+
+Usage:
+    python hook_host.py start     # Start the host in the background
+    python hook_host.py serve     # Run the host in the foreground
+    python hook_host.py stop      # Stop a running host
+    python hook_host.py status    # Show whether the host is running
+"""
+
+import json
+import os
+import signal
+import socketserver
+import sys
+import time
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(HOOKS_DIR))
+
+from common.loader import (  # noqa: E402
+    enter_project, load_hook, preload_hooks, run_hook, stale_hooks
+)
+from hook_client import socket_path  # noqa: E402
+
+SOCKET_PATH = socket_path(str(HOOKS_DIR))
+PID_FILE = SOCKET_PATH[:-len(".sock")] + ".pid"
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    """Runs one hook call. Executes in a forked child process."""
+
+    def handle(self):
+        try:
+            header = json.loads(self.rfile.readline())
+            payload = self.rfile.read(header.get("size", 0))
+        except ValueError:
+            return
+        if len(payload) != header.get("size", 0):
+            # Client went away mid-request: don't run the hook on a partial payload
+            return
+
+        response = self.run(header, payload)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    def run(self, header, payload):
+        """Execute the requested hook with the caller's cwd and environment."""
+        try:
+            os.chdir(header.get("cwd") or "/")
+            if header.get("env") is not None:
+                os.environ.clear()
+                os.environ.update(header["env"])
+            enter_project()
+
+            module = load_hook(header.get("hook", ""))
+        except (KeyError, OSError) as e:
+            return {"exit_code": 1, "stdout": "", "stderr": f"Hook host error: {e}\n"}
+
+        argv = [module.__file__] + header.get("argv", [])
+        return run_hook(module, payload, argv=argv)
+
+
+class HookHostServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Forking Unix socket server with hook hot-reloading."""
+
+    def service_actions(self):
+        """Re-import hooks whose scripts changed (runs between requests)."""
+        super().service_actions()
+        for name in stale_hooks():
+            try:
+                load_hook(name)
+            except Exception as e:
+                print(f"Warning: could not reload hook {name}: {e}", file=sys.stderr)
+
+
+def read_pid():
+    """Return the pid of a running host, or None."""
+    try:
+        pid = int(Path(PID_FILE).read_text().strip())
+        os.kill(pid, 0)
+        return pid
+    except (OSError, ValueError):
+        return None
+
+
+def serve():
+    """Run the host in the foreground until SIGTERM/SIGINT."""
+    if read_pid():
+        print(f"Hook host already running (pid {read_pid()})", file=sys.stderr)
+        return 1
+
+    errors = preload_hooks()
+    for name, error in errors.items():
+        print(f"Warning: could not preload hook {name}: {error}", file=sys.stderr)
+
+    if os.path.exists(SOCKET_PATH):
+        os.unlink(SOCKET_PATH)
+
+    def terminate(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+
+    server = HookHostServer(SOCKET_PATH, HookRequestHandler)
+    os.chmod(SOCKET_PATH, 0o600)
+    Path(PID_FILE).write_text(str(os.getpid()))
+    print(f"Hook host listening on {SOCKET_PATH}", file=sys.stderr)
+
+    try:
+        server.serve_forever(poll_interval=1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for path in (SOCKET_PATH, PID_FILE):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    return 0
+
+
+def start():
+    """Start the host as a detached background process."""
+    import subprocess
+
+    if read_pid():
+        print(f"Hook host already running (pid {read_pid()})")
+        return 0
+
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+    # Wait briefly for the socket so the next hook call can use it
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        if os.path.exists(SOCKET_PATH) and read_pid():
+            print(f"Hook host started (pid {read_pid()})")
+            return 0
+        time.sleep(0.05)
+
+    print("Hook host did not start within 5 seconds", file=sys.stderr)
+    return 1
+
+
+def stop():
+    """Stop a running host."""
+    pid = read_pid()
+    if not pid:
+        print("Hook host is not running")
+        return 0
+
+    os.kill(pid, signal.SIGTERM)
+    deadline = time.time() + 5
+    while time.time() < deadline and read_pid():
+        time.sleep(0.05)
+
+    print(f"Hook host stopped (pid {pid})")
+    return 0
+
+
+def status():
+    """Report whether the host is running."""
+    pid = read_pid()
+    if pid:
+        print(f"Hook host running (pid {pid}) on {SOCKET_PATH}")
+        return 0
+    print("Hook host is not running")
+    return 1
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Persistent host for Claude hooks")
+    parser.add_argument("command", choices=["start", "serve", "stop", "status"],
+                        help="Action to perform")
+    args = parser.parse_args()
+
+    commands = {"start": start, "serve": serve, "stop": stop, "status": status}
+    return commands[args.command]()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
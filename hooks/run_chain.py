@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Hook chain runner: runs several hooks for one event in a single process.
+
+Usage (in settings.json):
+    python /path/to/.claude/hooks/run_chain.py root_protection quality_gate
+    python /path/to/.claude/hooks/run_chain.py    # default chain for the event
+
+The event is parsed once and the project root is resolved once; every hook
+in the chain reuses both. Hooks run in order and the chain stops at the
+first hook that blocks, except that bookkeeping hooks (session_tracker)
+still run so a blocked Stop is recorded like one run as separate commands.
+
+Exit codes follow Claude's hook semantics:
+    0      every hook passed (stdout of each hook is relayed)
+    2      a hook blocked (only its stdout is relayed, later checks skipped)
+    other  first non-blocking error code, after running the remaining hooks
+"""
+
+import json
+import sys
+from pathlib import Path
+
+HOOKS_ROOT = Path(__file__).resolve().parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
+
+from common.event import extract_fields, read_payload  # noqa: E402
+from common.loader import load_hook, run_hook  # noqa: E402
+from common.metrics import record_payload, span, timed_hook  # noqa: E402
+from common.paths import project_root  # noqa: E402
+
+# Hooks run when no names are given, keyed by hook_event_name
+DEFAULT_CHAINS = {
+    "PostToolUse": ["root_protection", "quality_gate"],
+    "Stop": ["completion_checker", "session_tracker"]
+}
+
+# Hooks that only record activity: they run even after a hook blocked, and
+# their output never changes the chain's decision
+BOOKKEEPING_HOOKS = {"session_tracker"}
+
+BLOCKING_EXIT_CODE = 2
+
+
+def is_blocking(result):
+    """Check whether a hook result blocks the tool call or stop."""
+    if result["exit_code"] == BLOCKING_EXIT_CODE:
+        return True
+
+    try:
+        output = json.loads(result["stdout"])
+    except ValueError:
+        return False
+    return isinstance(output, dict) and (
+        output.get("continue") is False or output.get("decision") == "block"
+    )
+
+
+def run_chain(hook_names, payload):
+    """
+    Run hooks in order, skipping all but bookkeeping hooks after one blocks.
+
+    Returns:
+        List of result dicts (hook, exit_code, stdout, stderr, blocked).
+    """
+    results = []
+    blocked = False
+    for name in hook_names:
+        if blocked and name not in BOOKKEEPING_HOOKS:
+            continue
+        try:
+            module = load_hook(name)
+        except (KeyError, OSError, SyntaxError) as e:
+            results.append({"hook": name, "exit_code": 1, "stdout": "",
+                            "stderr": f"Could not load hook {name}: {e}\n", "blocked": False})
+            continue
+
+        result = run_hook(module, payload)
+        result["hook"] = name
+        result["blocked"] = name not in BOOKKEEPING_HOOKS and is_blocking(result)
+        results.append(result)
+        blocked = blocked or result["blocked"]
+
+    return results
+
+
+def combine_results(results):
+    """
+    Merge per-hook results into one (exit_code, stdout, stderr).
+
+    A blocking hook wins outright; otherwise the first non-zero exit code is
+    reported and every hook's stdout is relayed.
+    """
+    stderr = "".join(r["stderr"] for r in results)
+
+    blocked = [r for r in results if r["blocked"]]
+    if blocked:
+        return BLOCKING_EXIT_CODE, blocked[0]["stdout"], stderr
+
+    stdout = "\n".join(r["stdout"].rstrip("\n") for r in results if r["stdout"].strip())
+    errors = [r["exit_code"] for r in results if r["exit_code"] != 0]
+    return (errors[0] if errors else 0), stdout, stderr
+
+
+@timed_hook("run_chain")
+def main():
+    """Main chain execution."""
+    # Read stdin and resolve the root once; hooks in this process reuse both
+    # and each decodes only the fields it needs from the shared payload
+    payload = read_payload()
+    record_payload(len(payload))
+    project_root(__file__)
+
+    hook_names = sys.argv[1:]
+    if not hook_names:
+        with span("parse"):
+            event = extract_fields(payload, ("hook_event_name",)) or {}
+        hook_names = DEFAULT_CHAINS.get(event.get("hook_event_name", ""), [])
+
+    exit_code, stdout, stderr = combine_results(run_chain(hook_names, payload))
+
+    if stdout:
+        print(stdout)
+    if stderr:
+        sys.stderr.write(stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
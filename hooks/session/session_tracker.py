@@ -9,114 +9,40 @@ Handles:
 - Hook execution tracking
 """
 
-import json
 import sys
-import os
 from datetime import datetime
 from pathlib import Path
 
-# Handle __file__ potentially being undefined when run as a hook command
-if '__file__' in globals():
-    # Calculate project root relative to the hook location
-    PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
-else:
-    # Assume we're running from the project root or hooks are in .claude/hooks
-    PROJECT_ROOT = Path.cwd()
-    if (PROJECT_ROOT / ".claude" / "hooks").exists():
-        # We're in the project root
-        pass
-    else:
-        # Try to find the project root by looking for .claude directory
-        current = PROJECT_ROOT
-        while current != current.parent:
-            if (current / ".claude").exists():
-                PROJECT_ROOT = current
-                break
-            current = current.parent
+# Shared hook helpers live in hooks/common
+HOOKS_ROOT = Path(__file__).resolve().parent.parent
+if str(HOOKS_ROOT) not in sys.path:
+    sys.path.insert(0, str(HOOKS_ROOT))
 
-STATE_FILE = PROJECT_ROOT / ".claude" / "state" / "session_state.json"
-HOOKS_LOG_FILE = PROJECT_ROOT / ".claude" / "state" / "hooks_log.json"
-
-def ensure_state_directory():
-    """Ensure the state directory exists."""
-    state_dir = STATE_FILE.parent
-    state_dir.mkdir(parents=True, exist_ok=True)
-    return state_dir
-
-def load_session_state():
-    """Load session state from file with error handling."""
-    default_state = {
-        "current_task": "",
-        "delegated_to_glm": [],
-        "delegated_to_codex": [],
-        "pending_reviews": [],
-        "last_agent": "claude",
-        "glm_failures": 0,
-        "codex_failures": 0,
-        "session_start": None,
-        "total_tasks_completed": 0,
-        "hooks_executed": [],
-        "last_activity": None,
-        "session_id": None
-    }
+from common.event import read_event  # noqa: E402
+from common.hook_log import append_entry, log_path  # noqa: E402
+from common.metrics import span, timed_hook  # noqa: E402
+from common.paths import project_root  # noqa: E402
+from common.session_store import default_state, session_store  # noqa: E402
 
-    try:
-        if STATE_FILE.exists():
-            with open(STATE_FILE, 'r', encoding='utf-8') as f:
-                state = json.load(f)
-                # Merge with default to ensure all fields exist
-                for key, value in default_state.items():
-                    if key not in state:
-                        state[key] = value
-                return state
-        else:
-            return default_state
-    except (json.JSONDecodeError, IOError, OSError) as e:
-        print(f"Warning: Could not load session state: {e}", file=sys.stderr)
-        return default_state
+# What this hook acts on (read by common/hook_matchers.py to generate settings)
+HOOK_INTEREST = {"events": ["Stop"]}
 
-def save_session_state(state):
-    """Save session state to file with error handling."""
-    try:
-        ensure_state_directory()
+PROJECT_ROOT = project_root(__file__)
 
-        # Create backup before saving
-        if STATE_FILE.exists():
-            backup_file = STATE_FILE.with_suffix('.json.backup')
-            STATE_FILE.rename(backup_file)
-
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
-        return True
-    except (IOError, OSError, json.JSONEncodeError) as e:
-        print(f"Error: Could not save session state: {e}", file=sys.stderr)
-        return False
+STATE_FILE = PROJECT_ROOT / ".claude" / "state" / "session_state.json"
+STORE = session_store(STATE_FILE)
+HOOKS_LOG_FILE = log_path(PROJECT_ROOT / ".claude" / "state")
 
 def log_hook_execution(hook_name, status="success", details=None):
     """Log hook execution for tracking purposes."""
     try:
-        logs = []
-        if HOOKS_LOG_FILE.exists():
-            with open(HOOKS_LOG_FILE, 'r', encoding='utf-8') as f:
-                logs = json.load(f)
-
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "hook": hook_name,
-            "status": status,
-            "details": details
-        }
-
-        logs.append(log_entry)
-
-        # Keep only last 100 log entries
-        if len(logs) > 100:
-            logs = logs[-100:]
-
-        ensure_state_directory()
-        with open(HOOKS_LOG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(logs, f, indent=2, ensure_ascii=False)
-
+        with span("log_write"):
+            append_entry(HOOKS_LOG_FILE, {
+                "timestamp": datetime.now().isoformat(),
+                "hook": hook_name,
+                "status": status,
+                "details": details
+            })
     except Exception as e:
         print(f"Warning: Could not log hook execution: {e}", file=sys.stderr)
 
@@ -163,8 +89,13 @@ def track_cross_agent_reviews(state):
     for review in state.get("pending_reviews", []):
         try:
             review_time = datetime.fromisoformat(review.get("timestamp", ""))
-            # Keep reviews from last hour
-            if (current_time - review_time).total_seconds() < 3600:
+            # Keep reviews from last hour, plus queued background reviews
+            # and background failures no hook has reported yet
+            unreported = review.get("mode") == "async" and (
+                review.get("status") in ("pending", "running") or
+                (review.get("status") == "failed" and not review.get("surfaced"))
+            )
+            if unreported or (current_time - review_time).total_seconds() < 3600:
                 cleaned_reviews.append(review)
         except:
             # Keep malformed reviews for safety
@@ -201,37 +132,22 @@ def end_session(state):
     log_hook_execution("session_tracker", "session_end", session_end_log)
 
     # Reset session state but keep some statistics
-    final_state = {
-        "current_task": "",
-        "delegated_to_glm": [],
-        "delegated_to_codex": [],
-        "pending_reviews": [],
-        "last_agent": "claude",
-        "glm_failures": 0,
-        "codex_failures": 0,
-        "session_start": None,
+    final_state = default_state()
+    final_state.update({
         "total_tasks_completed": state.get("total_tasks_completed", 0),
-        "hooks_executed": [],
         "last_activity": current_time,
-        "session_id": None,
         "previous_session_id": state.get("session_id")
-    }
+    })
 
     return final_state
 
+@timed_hook("session_tracker")
 def main():
     """Main hook function."""
     try:
         # Parse input from stdin (hook system passes tool data)
-        tool_data = {}
-        try:
-            tool_data = json.load(sys.stdin)
-        except json.JSONDecodeError:
-            # No input or invalid JSON, continue with defaults
-            pass
-
-        # Get current state
-        state = load_session_state()
+        # No input or invalid JSON: continue with defaults
+        tool_data = read_event(fields=("action", "agent", "task", "hook_name")) or {}
 
         # Determine hook action based on tool data
         action = tool_data.get("action", "update")
@@ -241,8 +157,17 @@ def main():
 
         if action == "end_session":
             # Handle session end
-            final_state = end_session(state)
-            if save_session_state(final_state):
+            try:
+                with STORE.transaction() as state:
+                    final_state = end_session(state)
+                    state.clear()
+                    state.update(final_state)
+                saved = True
+            except (OSError, ValueError) as e:
+                print(f"Error: Could not save session state: {e}", file=sys.stderr)
+                saved = False
+
+            if saved:
                 log_hook_execution(hook_name, "success", {"action": "end_session"})
                 print("Session ended successfully", file=sys.stderr)
                 sys.exit(0)
@@ -251,17 +176,25 @@ def main():
                 sys.exit(1)
 
         else:
-            # Update session activity
-            state = update_session_activity(state, agent_name, task_description)
-
-            # Track hook execution
-            state = track_hook_execution(state, hook_name)
-
-            # Track cross-agent reviews
-            state = track_cross_agent_reviews(state)
+            # Read-modify-write under the state lock so concurrent hooks
+            # don't overwrite each other's updates
+            try:
+                with STORE.transaction() as state:
+                    # Update session activity
+                    update_session_activity(state, agent_name, task_description)
+
+                    # Track hook execution
+                    track_hook_execution(state, hook_name)
+
+                    # Track cross-agent reviews
+                    track_cross_agent_reviews(state)
+                saved = True
+            except (OSError, ValueError) as e:
+                print(f"Error: Could not save session state: {e}", file=sys.stderr)
+                saved = False
 
             # Save updated state
-            if save_session_state(state):
+            if saved:
                 log_hook_execution(hook_name, "success", {
                     "action": "update",
                     "agent": agent_name,
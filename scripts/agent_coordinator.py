@@ -7,7 +7,6 @@ Manages status updates, task tracking, and AI code reviews
 import json
 import os
 import sys
-import subprocess
 from datetime import datetime
 from pathlib import Path
 
@@ -18,10 +17,6 @@ TASKS_FILE = PROJECT_ROOT / ".agents" / "tasks.json"
 REVIEWS_DIR = PROJECT_ROOT / ".agents" / "reviews"
 AI_AGENT_SCRIPT = PROJECT_ROOT / "scripts" / "agents" / "ai-agent.sh"
 
-# Ensure directories exist
-TASKS_FILE.parent.mkdir(exist_ok=True)
-REVIEWS_DIR.mkdir(exist_ok=True)
-
 def load_tasks():
     """Load task history"""
     if TASKS_FILE.exists():
@@ -31,6 +26,7 @@ def load_tasks():
 
 def save_tasks(tasks):
     """Save task history"""
+    TASKS_FILE.parent.mkdir(exist_ok=True)
     with open(TASKS_FILE, 'w') as f:
         json.dump(tasks, f, indent=2)
 
@@ -104,7 +100,10 @@ def request_review(prompt, *files):
         print("ERROR: AI agent script not found")
         return
     
+    import subprocess
+
     # Generate review filename
+    REVIEWS_DIR.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     review_file = REVIEWS_DIR / f"review_{timestamp}.md"
     
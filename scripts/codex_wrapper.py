@@ -3,7 +3,6 @@
 Codex CLI wrapper for code review and security analysis
 """
 
-import subprocess
 import json
 import sys
 import os
@@ -71,6 +70,8 @@ Format your response as:
     # Add prompt as positional argument (not --prompt flag)
     cmd.append(prompt)
 
+    import subprocess
+
     try:
         result = subprocess.run(
             cmd,
@@ -4,13 +4,21 @@ Fix hook paths in all Claude configuration files
 
 This script updates all Claude configuration files to use absolute paths
 for hooks, preventing issues when working in subdirectories.
+
+With --regenerate it instead rewrites the hooks section of
+.claude/settings.json from the hooks' declared interests and
+config/agent_rules.json, with narrow matchers and path prefilters (see
+hooks/common/hook_matchers.py).
 """
 
 import os
+import sys
 import json
 import glob
 from pathlib import Path
 
+HOOKS_SRC = Path(__file__).resolve().parent.parent / "hooks"
+
 def fix_hook_paths(project_root=None):
     """Fix hooks in all Claude configuration files"""
 
@@ -68,10 +76,48 @@ def fix_hook_paths(project_root=None):
     print("\nTo verify the fix:")
     print(f"grep -n '{hooks_path}' {project_root}/.claude/settings.json")
 
+def regenerate_hook_settings(project_root=None, hook_names=None):
+    """Write generated hook matchers and prefilters into .claude/settings.json"""
+    sys.path.insert(0, str(HOOKS_SRC))
+    from common.hook_matchers import DEFAULT_HOOKS, write_generated
+
+    project_root = Path(project_root or os.getcwd()).resolve()
+    claude_dir = project_root / ".claude"
+    hooks_path = claude_dir / "hooks"
+
+    rules = None
+    rules_file = project_root / "config" / "agent_rules.json"
+    if not rules_file.exists():
+        rules_file = HOOKS_SRC.parent / "config" / "agent_rules.json"
+    try:
+        with open(rules_file, 'r') as f:
+            rules = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠ Could not load {rules_file}: {e} (generating without rule-derived filters)")
+
+    try:
+        settings_path, filters_path = write_generated(
+            claude_dir / "settings.json", hooks_path, HOOKS_SRC,
+            hook_names or DEFAULT_HOOKS, rules, command_dir=hooks_path
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Error generating hook settings: {e}")
+        return False
+
+    print(f"✓ Generated: {settings_path}")
+    print(f"✓ Generated: {filters_path}")
+    return True
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Fix Claude hook paths")
     parser.add_argument("--project-root", help="Project root directory", default=None)
+    parser.add_argument("--regenerate", action="store_true",
+                        help="Regenerate the hooks section with narrow matchers and prefilters")
+    parser.add_argument("--hooks", nargs="+", default=None,
+                        help="Hooks to enable when regenerating (default: the standard set)")
     args = parser.parse_args()
 
+    if args.regenerate:
+        sys.exit(0 if regenerate_hook_settings(args.project_root, args.hooks) else 1)
     fix_hook_paths(args.project_root)
\ No newline at end of file
@@ -10,12 +10,13 @@ Usage:
 
 import os
 import sys
-import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 import argparse
 
+from session_archive import SessionArchive
+
 
 class GarbageCollector:
     """Cleans up old agent outputs and logs"""
@@ -93,6 +94,7 @@ class GarbageCollector:
                         if dry_run:
                             print(f"Would delete: {item}")
                         else:
+                            import shutil
                             shutil.rmtree(item)
                             print(f"Deleted: {item}")
                         deleted.append(item)
@@ -126,6 +128,12 @@ class GarbageCollector:
                         print(f"Deleted: {log_file}")
                     deleted.append(log_file)
 
+        # Clean session archives (whole segments only)
+        archive = SessionArchive(self.agents_dir / "runtime" / "logs" / "sessions")
+        for segment in archive.prune(cutoff, dry_run=dry_run):
+            print(f"{'Would delete' if dry_run else 'Deleted'}: {segment}")
+            deleted.append(segment)
+
         # Clean runtime/logs/
         runtime_logs = self.runtime_dir / "logs"
         if runtime_logs.exists():
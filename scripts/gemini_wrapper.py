@@ -3,7 +3,6 @@
 Gemini CLI wrapper for large context analysis (up to 1M tokens)
 """
 
-import subprocess
 import json
 import sys
 import os
@@ -71,6 +70,8 @@ Note: You have access to the full context, so please provide holistic insights.
     # Add prompt
     cmd.extend(['--prompt', prompt])
 
+    import subprocess
+
     try:
         result = subprocess.run(
             cmd,
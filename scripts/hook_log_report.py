@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Hook Log Report - Tail and filter the append-only hook execution log
+
+Hooks append to .claude/state/hooks_log.jsonl, rotated into gzip segments
+(see hooks/common/hook_log.py). The last N matching entries are found by
+reading the newest segments first, so older segments are only decompressed
+when the recent ones don't hold enough matches.
+
+Usage:
+    python hook_log_report.py                       # Last 20 entries
+    python hook_log_report.py -n 100 --hook quality_gate
+    python hook_log_report.py --status error --since 2025-01-01T09:00
+    python hook_log_report.py --all --json          # Whole history, JSON lines
+    python hook_log_report.py --follow              # Keep printing new entries
+"""
+
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from common.hook_log import log_path, read_entries, read_entries_newest_first  # noqa: E402
+
+
+def matches(entry, args):
+    """Check an entry against the command-line filters."""
+    if args.hook and entry.get("hook") != args.hook:
+        return False
+    if args.status and entry.get("status") != args.status:
+        return False
+    if args.since and entry.get("timestamp", "") < args.since:
+        return False
+    if args.grep and args.grep not in json.dumps(entry.get("details"), ensure_ascii=False):
+        return False
+    return True
+
+
+def format_entry(entry, as_json):
+    """Render one entry for output."""
+    if as_json:
+        return json.dumps(entry, ensure_ascii=False)
+    details = entry.get("details")
+    detail_text = json.dumps(details, ensure_ascii=False) if details else ""
+    return f"{entry.get('timestamp', '?'):<26} {entry.get('hook', '?'):<22} " \
+           f"{entry.get('status', '?'):<12} {detail_text}"
+
+
+def follow(path, args):
+    """Print entries appended to the live log until interrupted."""
+    position = path.stat().st_size if path.exists() else 0
+    try:
+        while True:
+            if path.exists() and path.stat().st_size < position:
+                position = 0  # Rotated
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    f.seek(position)
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        if matches(entry, args):
+                            print(format_entry(entry, args.json), flush=True)
+                    position = f.tell()
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tail and filter the hook execution log")
+    parser.add_argument("--project", default=".",
+                        help="Project root containing .claude/state (default: current directory)")
+    parser.add_argument("-n", "--lines", type=int, default=20,
+                        help="Number of matching entries to show (default: 20)")
+    parser.add_argument("--all", action="store_true", help="Show every matching entry")
+    parser.add_argument("--hook", help="Only entries from this hook")
+    parser.add_argument("--status", help="Only entries with this status (e.g. error)")
+    parser.add_argument("--since", help="Only entries at or after this ISO timestamp")
+    parser.add_argument("--grep", help="Only entries whose details contain this text")
+    parser.add_argument("--current", action="store_true",
+                        help="Read only the live log, not rotated segments")
+    parser.add_argument("--follow", "-f", action="store_true",
+                        help="Keep printing new entries as they are logged")
+    parser.add_argument("--json", action="store_true", help="Output JSON lines")
+    args = parser.parse_args()
+
+    path = log_path(Path(args.project).resolve() / ".claude" / "state")
+
+    if args.all:
+        shown = [e for e in read_entries(path, include_rotated=not args.current)
+                 if matches(e, args)]
+    else:
+        newest = (e for e in read_entries_newest_first(path, include_rotated=not args.current)
+                  if matches(e, args))
+        shown = list(islice(newest, max(args.lines, 0)))[::-1]
+    for entry in shown:
+        print(format_entry(entry, args.json))
+
+    if args.follow:
+        follow(path, args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Hooks Report - Per-hook latency summary from recorded metrics
+
+Every instrumented hook appends one sample per call to
+.claude/state/hook_metrics.jsonl (see hooks/common/metrics.py). This report
+shows, per hook, the call count and p50/p95/p99 wall time, where the time
+goes (per-span p50/p95), and the slowest individual invocations with their
+payload sizes.
+
+Usage:
+    python hooks_report.py                      # Report for the current project
+    python hooks_report.py --hook quality_gate  # One hook only
+    python hooks_report.py --since 24h          # Recent samples only
+    python hooks_report.py --slowest 20         # More slow invocations
+    python hooks_report.py --json               # Machine-readable output
+"""
+
+import json
+import math
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from common.hook_log import read_entries  # noqa: E402
+from common.metrics import METRICS_NAME  # noqa: E402
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Multiply before dividing so exact ranks (p95 of 20) don't pick up float error
+    rank = max(1, math.ceil(pct * len(ordered) / 100))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def parse_since(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a --since value into an epoch timestamp.
+
+    Accepts a duration ("30m", "24h", "7d") or an ISO timestamp.
+    """
+    if not value:
+        return None
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value[-1] in units and value[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def load_samples(metrics_path: Path, hook: Optional[str] = None,
+                 since: Optional[float] = None) -> List[Dict]:
+    """Load samples from the metrics file and its rotated segments."""
+    samples = []
+    for sample in read_entries(metrics_path):
+        if hook and sample.get("h") != hook:
+            continue
+        if since and sample.get("t", 0) < since:
+            continue
+        samples.append(sample)
+    return samples
+
+
+def summarize(samples: List[Dict], slowest: int = 10) -> Dict:
+    """
+    Build the report from raw samples.
+
+    Returns:
+        Dict with per-hook stats (sorted by p95, slowest first) and the
+        slowest invocations overall.
+    """
+    by_hook: Dict[str, List[Dict]] = {}
+    for sample in samples:
+        by_hook.setdefault(sample.get("h", "?"), []).append(sample)
+
+    hooks = []
+    for name, hook_samples in by_hook.items():
+        totals = [s.get("ms", 0.0) for s in hook_samples]
+        span_values: Dict[str, List[float]] = {}
+        for s in hook_samples:
+            for span_name, ms in (s.get("s") or {}).items():
+                span_values.setdefault(span_name, []).append(ms)
+
+        hooks.append({
+            "hook": name,
+            "calls": len(hook_samples),
+            "errors": sum(1 for s in hook_samples if s.get("x") not in (0, None)),
+            "p50_ms": round(percentile(totals, 50), 1),
+            "p95_ms": round(percentile(totals, 95), 1),
+            "p99_ms": round(percentile(totals, 99), 1),
+            "max_ms": round(max(totals), 1),
+            "spans": {
+                span_name: {
+                    "calls": len(values),
+                    "p50_ms": round(percentile(values, 50), 1),
+                    "p95_ms": round(percentile(values, 95), 1)
+                }
+                for span_name, values in sorted(span_values.items(),
+                                                key=lambda item: -percentile(item[1], 95))
+            }
+        })
+    hooks.sort(key=lambda h: h["p95_ms"], reverse=True)
+
+    slow = sorted(samples, key=lambda s: s.get("ms", 0.0), reverse=True)[:slowest]
+    return {
+        "samples": len(samples),
+        "hooks": hooks,
+        "slowest": [
+            {
+                "hook": s.get("h"),
+                "time": datetime.fromtimestamp(s.get("t", 0)).isoformat(timespec="seconds"),
+                "ms": s.get("ms"),
+                "exit_code": s.get("x"),
+                "payload_bytes": s.get("b"),
+                "spans": s.get("s") or {}
+            }
+            for s in slow
+        ]
+    }
+
+
+def print_report(report: Dict) -> None:
+    """Print the report as text tables."""
+    print(f"Hook latency report ({report['samples']} samples)")
+    print()
+    print(f"{'Hook':<24} {'calls':>6} {'errors':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for h in report["hooks"]:
+        print(f"{h['hook']:<24} {h['calls']:>6} {h['errors']:>6} {h['p50_ms']:>8.1f} "
+              f"{h['p95_ms']:>8.1f} {h['p99_ms']:>8.1f} {h['max_ms']:>8.1f}")
+        for span_name, stats in h["spans"].items():
+            print(f"    {span_name:<20} {stats['calls']:>6} {'':>6} {stats['p50_ms']:>8.1f} "
+                  f"{stats['p95_ms']:>8.1f}")
+    print()
+    print("Slowest invocations (ms):")
+    for s in report["slowest"]:
+        payload = "-" if s["payload_bytes"] is None else f"{s['payload_bytes']} B"
+        top_spans = ", ".join(f"{name} {ms:.1f}" for name, ms in
+                              sorted(s["spans"].items(), key=lambda item: -item[1])[:3])
+        print(f"  {s['ms']:>9.1f}  {s['hook']:<22} {s['time']}  exit {s['exit_code']}  "
+              f"payload {payload}" + (f"  [{top_spans}]" if top_spans else ""))
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-hook latency report")
+    parser.add_argument("--project", default=".",
+                        help="Project root containing .claude/state (default: current directory)")
+    parser.add_argument("--hook", help="Only report this hook")
+    parser.add_argument("--since", help="Only samples newer than a duration (30m, 24h, 7d) "
+                                        "or an ISO timestamp")
+    parser.add_argument("--slowest", type=int, default=10,
+                        help="Number of slowest invocations to list (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    metrics_path = Path(args.project).resolve() / ".claude" / "state" / METRICS_NAME
+    try:
+        since = parse_since(args.since)
+    except ValueError:
+        print(f"Invalid --since value: {args.since}", file=sys.stderr)
+        return 1
+
+    samples = load_samples(metrics_path, hook=args.hook, since=since)
+    if not samples:
+        print(f"No hook metrics recorded in {metrics_path}", file=sys.stderr)
+        return 1
+
+    report = summarize(samples, slowest=args.slowest)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
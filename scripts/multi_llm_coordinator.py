@@ -7,26 +7,30 @@ Supports GLM, Codex, Gemini, and OpenCode
 import json
 import sys
 import os
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
-# Import wrappers
+# Wrappers are imported on first use (see load_wrapper) so that usage
+# errors and routing analysis don't pay for subprocess-heavy imports.
 sys.path.insert(0, str(Path(__file__).parent))
-try:
-    from glm_direct import call_glm_direct as call_glm_func
-except ImportError:
-    call_glm_func = None
 
-try:
-    from codex_wrapper import call_codex
-except ImportError:
-    call_codex = None
+WRAPPERS = {
+    'glm': ('glm_direct', 'call_glm_direct'),
+    'codex': ('codex_wrapper', 'call_codex'),
+    'gemini': ('gemini_wrapper', 'call_gemini')
+}
 
-try:
-    from gemini_wrapper import call_gemini
-except ImportError:
-    call_gemini = None
+
+def load_wrapper(llm):
+    """Import the wrapper function for an LLM, or return None if unavailable."""
+    if llm not in WRAPPERS:
+        return None
+    module_name, func_name = WRAPPERS[llm]
+    try:
+        module = __import__(module_name)
+    except ImportError:
+        return None
+    return getattr(module, func_name, None)
 
 def analyze_task_requirements(task_description, context_files=None):
     """
@@ -113,18 +117,11 @@ def route_and_execute(task_description, context_files=None, parallel=False):
     for llm, purpose in execution_plan:
         print(f"  - {llm.upper()}: {purpose}", file=sys.stderr)
 
-        if llm == 'glm' and call_glm_func:
-            # Direct GLM API integration
-            result = call_glm_func(task_description, context_files)
-            results['glm'] = result
-
-        elif llm == 'codex' and call_codex:
-            result = call_codex(task_description, context_files)
-            results['codex'] = result
+        wrapper = load_wrapper(llm)
 
-        elif llm == 'gemini' and call_gemini:
-            result = call_gemini(task_description, context_files)
-            results['gemini'] = result
+        if wrapper:
+            # Direct API / CLI integration
+            results[llm] = wrapper(task_description, context_files)
 
         elif llm == 'opencode':
             # OpenCode would be implemented similarly
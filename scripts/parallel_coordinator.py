@@ -8,7 +8,6 @@ import os
 import sys
 import json
 import time
-import subprocess
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
@@ -21,12 +20,117 @@ OUTPUT_DIR = AGENTS_DIR / "output"
 COORDINATED_DIR = AGENTS_DIR / "coordinated"
 GLM_WORKER = PROJECT_ROOT / "scripts" / "agents" / "glm_worker.py"
 
+# Marker checks when inotify is not available (non-Linux)
+MARKER_POLL_INTERVAL = 2.0
+
+# Seconds a finished worker (marker written) is given to exit with a code
+EXIT_CODE_GRACE = 1.0
+
+# End of each worker log kept in the proposal (full logs stay on disk)
+LOG_TAIL_BYTES = 4096
+
+
+def log_tail(path, limit=LOG_TAIL_BYTES):
+    """Return the last `limit` bytes of a log file as text ("" if missing)"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - limit))
+            data = f.read()
+    except OSError:
+        return ""
+    text = data.decode("utf-8", errors="replace")
+    return text if size <= limit else "..." + text
+
+
+def stop_worker(proc):
+    """Terminate a worker and its process group (workers run in their own session)"""
+    import signal
+
+    if proc.poll() is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+
+class MarkerWatcher:
+    """Report .done markers written to a directory, via inotify (Linux, ctypes)"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory, on_marker):
+        self.directory = directory
+        self.on_marker = on_marker
+        self.fd = None
+        self.wake_r = self.wake_w = None
+        self.thread = None
+
+    def start(self):
+        """Start watching; returns False if inotify is unavailable"""
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+            fd = libc.inotify_init1(self.IN_CLOEXEC)
+            if fd < 0:
+                return False
+            wd = libc.inotify_add_watch(fd, str(self.directory).encode(),
+                                        self.IN_CLOSE_WRITE | self.IN_MOVED_TO)
+            if wd < 0:
+                os.close(fd)
+                return False
+        except (OSError, AttributeError):
+            return False
+
+        import threading
+
+        self.fd = fd
+        self.wake_r, self.wake_w = os.pipe()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self):
+        import select
+        import struct
+
+        header = struct.Struct("iIII")
+        while True:
+            ready, _, _ = select.select([self.fd, self.wake_r], [], [])
+            if self.wake_r in ready:
+                return
+            data = os.read(self.fd, 65536)
+            offset = 0
+            while offset + header.size <= len(data):
+                _, _, _, length = header.unpack_from(data, offset)
+                name = data[offset + header.size:offset + header.size + length].rstrip(b"\0")
+                offset += header.size + length
+                if name.endswith(b".done"):
+                    self.on_marker(name[:-len(b".done")].decode(errors="replace"))
+
+    def stop(self):
+        """Stop the watch thread and release its descriptors"""
+        if self.thread is None:
+            return
+        os.write(self.wake_w, b"x")
+        self.thread.join()
+        for fd in (self.fd, self.wake_r, self.wake_w):
+            os.close(fd)
+        self.thread = None
+
 
 class TaskCoordinator:
     def __init__(self):
         self.task_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.output_dir = OUTPUT_DIR / self.task_id
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.task_results = {}
 
     def parse_request(self, request_text):
         """Parse user request into tasks
@@ -107,6 +211,8 @@ class TaskCoordinator:
 
     def spawn_workers(self, tasks):
         """Spawn GLM workers in parallel"""
+        import subprocess
+
         processes = []
 
         for task in tasks:
@@ -120,13 +226,17 @@ class TaskCoordinator:
             ]
             cmd.extend(task["files"])
 
-            # Spawn in background with nohup
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                start_new_session=True
-            )
+            # Output goes straight to per-task log files: nothing has to
+            # drain a pipe, so a verbose worker can never block on a full one
+            stdout_log, stderr_log = self.log_files(task["id"])
+            with open(stdout_log, 'wb') as stdout, open(stderr_log, 'wb') as stderr:
+                proc = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=stdout,
+                    stderr=stderr,
+                    start_new_session=True
+                )
             processes.append({
                 "task_id": task["id"],
                 "type": task["type"],
@@ -135,27 +245,120 @@ class TaskCoordinator:
 
         return processes
 
-    def wait_for_completion(self, tasks, timeout=300):
-        """Wait for all tasks to complete"""
-        start_time = time.time()
+    def wait_for_completion(self, tasks, processes, timeout=300, fail_fast=True):
+        """Wait for all tasks to complete
 
-        while True:
-            # Check if all tasks have .done markers
-            all_done = True
-            for task in tasks:
-                marker_file = self.output_dir / f"{task['id']}.done"
-                if not marker_file.exists():
-                    all_done = False
-                    break
+        Driven by the worker processes themselves: one thread per worker
+        blocks in wait() and reports its exit code, and .done markers are
+        reported by an inotify watch on the output directory (polled every
+        MARKER_POLL_INTERVAL seconds where inotify is unavailable). A task is
+        done when its marker exists; a worker that exits without one fails
+        the task at once. With fail_fast the first failure stops the
+        remaining workers instead of waiting for them.
 
-            if all_done:
-                return True
+        Returns:
+            Dict of task id -> {"status", "exit_code", "elapsed"}; status is
+            "done", "failed", "timeout" or "cancelled".
+        """
+        import queue
+        import subprocess
+        import threading
+
+        events = queue.Queue()
+        start_time = time.monotonic()
+        procs = {str(p["task_id"]): p["proc"] for p in processes}
+        pending = {str(task["id"]) for task in tasks}
+        results = {}
+
+        def finish(task_id, status, exit_code=None):
+            pending.discard(task_id)
+            results[task_id] = {
+                "status": status,
+                "exit_code": exit_code,
+                "elapsed": round(time.monotonic() - start_time, 2)
+            }
 
-            # Check timeout
-            if time.time() - start_time > timeout:
-                return False
+        def reap(task_id, proc):
+            events.put(("exit", task_id, proc.wait()))
+
+        for task_id, proc in procs.items():
+            threading.Thread(target=reap, args=(task_id, proc), daemon=True).start()
+        for task_id in pending - set(procs):
+            finish(task_id, "failed")  # Never started
+
+        watcher = MarkerWatcher(self.output_dir, lambda task_id: events.put(("marker", task_id, None)))
+        watching = watcher.start()
+        # Markers written before the watch was in place
+        for task_id in list(pending):
+            if self.marker_file(task_id).exists():
+                finish(task_id, "done", procs[task_id].poll())
+
+        try:
+            while pending:
+                remaining = timeout - (time.monotonic() - start_time)
+                if remaining <= 0:
+                    for task_id in list(pending):
+                        finish(task_id, "timeout")
+                    break
 
-            time.sleep(2)
+                try:
+                    kind, task_id, exit_code = events.get(
+                        timeout=remaining if watching else min(remaining, MARKER_POLL_INTERVAL))
+                except queue.Empty:
+                    for task_id in list(pending):
+                        if self.marker_file(task_id).exists():
+                            finish(task_id, "done", procs[task_id].poll())
+                    continue
+
+                if kind == "marker":
+                    if task_id in pending:
+                        finish(task_id, "done", procs[task_id].poll())
+                elif task_id in pending:
+                    ok = self.marker_file(task_id).exists()
+                    finish(task_id, "done" if ok else "failed", exit_code)
+                    if not ok and fail_fast:
+                        for other in list(pending):
+                            finish(other, "cancelled")
+                        break
+                elif results[task_id]["exit_code"] is None:
+                    # Marker came first; record the exit code as well
+                    results[task_id]["exit_code"] = exit_code
+        finally:
+            watcher.stop()
+
+        # Workers still running after a timeout or a failure are stopped;
+        # workers that wrote their marker get a moment to exit with a code
+        grace_end = time.monotonic() + EXIT_CODE_GRACE
+        for task_id, result in results.items():
+            if task_id not in procs:
+                continue
+            if result["status"] in ("timeout", "cancelled"):
+                stop_worker(procs[task_id])
+            elif result["exit_code"] is None:
+                try:
+                    result["exit_code"] = procs[task_id].wait(timeout=max(0, grace_end - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    pass
+
+        self.task_results = results
+        return results
+
+    def log_files(self, task_id):
+        """Return the (stdout, stderr) log files of a task's worker"""
+        return (self.output_dir / f"{task_id}.stdout.log",
+                self.output_dir / f"{task_id}.stderr.log")
+
+    def task_logs(self, task_id):
+        """Return a task's log paths with the last LOG_TAIL_BYTES of each"""
+        logs = {}
+        for name, path in zip(("stdout", "stderr"), self.log_files(task_id)):
+            logs[name] = str(path)
+            logs[f"{name}_tail"] = log_tail(path)
+        return logs
+
+    def marker_file(self, task_id):
+        """Return the .done marker a worker writes when its task is finished"""
+        return self.output_dir / f"{task_id}.done"
 
     def detect_conflicts(self, tasks):
         """Detect conflicts in task outputs"""
@@ -207,16 +410,29 @@ class TaskCoordinator:
         return safe_changes, risky_changes
 
     def generate_proposal(self, tasks, conflicts):
-        """Generate unified proposal for Claude Code"""
-        safe_changes, risky_changes = self.categorize_changes(tasks)
+        """
+        Generate unified proposal for Claude Code
+
+        Also written when tasks failed or timed out: only the outputs of
+        finished tasks are proposed, and failed_tasks with task_results and
+        task_logs show which worker died and why.
+        """
+        failed = sorted(task_id for task_id, result in self.task_results.items()
+                        if result["status"] != "done")
+        done = [task for task in tasks if str(task["id"]) not in failed]
+        safe_changes, risky_changes = self.categorize_changes(done)
 
         proposal = {
             "task_id": self.task_id,
             "completed_at": datetime.now().isoformat(),
+            "status": "failed" if failed else "completed",
             "total_tasks": len(tasks),
+            "failed_tasks": failed,
             "safe_changes": safe_changes,
             "risky_changes": risky_changes,
             "conflicts": conflicts,
+            "task_results": self.task_results,
+            "task_logs": {str(task["id"]): self.task_logs(task["id"]) for task in tasks},
             "output_dir": str(self.output_dir)
         }
 
@@ -258,27 +474,35 @@ def main():
 
     # Wait for completion
     print("Waiting for completion (timeout: 5 minutes)...", file=sys.stderr)
-    success = coordinator.wait_for_completion(tasks, timeout=300)
-
-    if not success:
-        print("ERROR: Timeout waiting for tasks to complete", file=sys.stderr)
-        sys.exit(1)
-
-    print("All tasks completed!", file=sys.stderr)
+    results = coordinator.wait_for_completion(tasks, processes, timeout=300)
+
+    failed = {task_id: r for task_id, r in results.items() if r["status"] != "done"}
+    if failed:
+        for task_id, result in sorted(failed.items()):
+            exit_code = "-" if result["exit_code"] is None else result["exit_code"]
+            print(f"ERROR: Task {task_id} {result['status']} after {result['elapsed']}s "
+                  f"(exit code {exit_code})", file=sys.stderr)
+            # Last lines of the worker's stderr, usually the error itself
+            for line in log_tail(coordinator.log_files(task_id)[1], 1024).splitlines()[-5:]:
+                print(f"    {line}", file=sys.stderr)
+        if any(r["status"] == "timeout" for r in failed.values()):
+            print("ERROR: Timeout waiting for tasks to complete", file=sys.stderr)
+    else:
+        print("All tasks completed!", file=sys.stderr)
 
     # Detect conflicts
     conflicts = coordinator.detect_conflicts(tasks)
     if conflicts:
         print(f"WARNING: Detected {len(conflicts)} conflicts", file=sys.stderr)
 
-    # Generate proposal
+    # Generate proposal (on failure too, so the results and log tails are kept)
     proposal_file = coordinator.generate_proposal(tasks, conflicts)
     print(f"Generated proposal: {proposal_file}", file=sys.stderr)
 
     # Output proposal path for slash command to read
     print(str(proposal_file))
 
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Review Report - Quality gate verdicts from the durable review index
+
+The quality gate records every verdict in .claude/state/review_index.json
+(see hooks/common/review_index.py), keyed by file and content hash. This
+report answers the Stop hook's question from the command line: does every
+changed file have an approved review of its current content? It can also
+list everything indexed, or show one file's review history.
+
+Usage:
+    python review_report.py                     # Changed files of the current project
+    python review_report.py --all               # Latest verdict of every indexed file
+    python review_report.py --file src/app.py   # One file's history with review text
+    python review_report.py --json              # Machine-readable output
+
+Exits 1 when a changed file lacks an approved review of its current content.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+
+from common.changed_files import changed_files, relative_path  # noqa: E402
+from common.hook_matchers import build_filter, is_interested, read_interest  # noqa: E402
+from common.review_index import (  # noqa: E402
+    APPROVED, INDEX_NAME, MISSING, ReviewIndex, file_digest, review_status
+)
+from common.session_store import session_store  # noqa: E402
+
+
+def reviewable_changes(project: Path) -> List[str]:
+    """Return the project's changed files the quality gate would review."""
+    state_dir = project / ".claude" / "state"
+    store = session_store(state_dir / "session_state.json")
+    interest = read_interest(HOOKS_DIR / "core" / "quality_gate.py") or {}
+    gate_filter = build_filter(interest)
+    return [f for f in changed_files(project, store, state_dir / "git_status.json")
+            if is_interested(gate_filter, None, [f])]
+
+
+def format_age(timestamp: Optional[float]) -> str:
+    """Format an epoch timestamp as a short age ("5m", "3h", "2d")."""
+    if not timestamp:
+        return "-"
+    seconds = max(0, time.time() - timestamp)
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
+
+
+def summary_row(file_path: str, status: str, entry: Optional[Dict]) -> Dict:
+    """Flatten one file's status and verdict for output."""
+    entry = entry or {}
+    return {
+        "file": file_path,
+        "status": status,
+        "verdict": entry.get("verdict"),
+        "reviewer": entry.get("reviewer"),
+        "latency_ms": entry.get("latency_ms"),
+        "reviewed_at": entry.get("reviewed_at")
+    }
+
+
+def indexed_rows(project: Path, index: ReviewIndex) -> List[Dict]:
+    """Latest verdict of every indexed file, and whether it covers the current content."""
+    files = index.load()
+    rows = []
+    for file_path in sorted(files):
+        digest, entry = index.history(file_path, files)[0]
+        current = file_digest(project, file_path)
+        if current == MISSING:
+            status = MISSING
+        else:
+            status = "current" if current == digest else "stale"
+        rows.append(summary_row(file_path, status, entry))
+    return rows
+
+
+def print_rows(rows: List[Dict]) -> None:
+    """Print file rows as a text table."""
+    print(f"{'Status':<11} {'Verdict':<15} {'Reviewer':<9} {'Latency':>9} {'Age':>5}  File")
+    for row in rows:
+        latency = "-" if row["latency_ms"] is None else f"{row['latency_ms'] / 1000:.1f}s"
+        print(f"{row['status']:<11} {row['verdict'] or '-':<15} {row['reviewer'] or '-':<9} "
+              f"{latency:>9} {format_age(row['reviewed_at']):>5}  {row['file']}")
+
+
+def print_history(file_path: str, current: str, history: List) -> None:
+    """Print one file's recorded reviews, newest first, with their text."""
+    print(f"Review history of {file_path} ({len(history)} versions)")
+    for digest, entry in history:
+        marker = "current content" if digest == current else "older content"
+        print()
+        print(f"{entry.get('verdict')} by {entry.get('reviewer')}, "
+              f"{entry.get('latency_ms', 0) / 1000:.1f}s, {format_age(entry.get('reviewed_at'))} ago "
+              f"[{marker}, {digest[:12]}]" + (" (cached)" if entry.get("cached") else ""))
+        if entry.get("review"):
+            print(entry["review"].rstrip())
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quality gate verdicts from the review index")
+    parser.add_argument("--project", default=".",
+                        help="Project root containing .claude/state (default: current directory)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--all", action="store_true", help="List every indexed file")
+    group.add_argument("--file", help="Show the review history of one file")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    project = Path(args.project).resolve()
+    index = ReviewIndex(project / ".claude" / "state" / INDEX_NAME)
+
+    if args.file:
+        file_path = relative_path(args.file, project) or args.file
+        history = index.history(file_path)
+        if not history:
+            print(f"No reviews recorded for {file_path}", file=sys.stderr)
+            return 1
+        current = file_digest(project, file_path)
+        if args.json:
+            print(json.dumps({"file": file_path, "current": current,
+                              "history": [dict(entry, content_hash=digest) for digest, entry in history]},
+                             indent=2))
+        else:
+            print_history(file_path, current, history)
+        return 0
+
+    if args.all:
+        rows = indexed_rows(project, index)
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        elif rows:
+            print_rows(rows)
+        else:
+            print("No reviews recorded", file=sys.stderr)
+        return 0
+
+    rows = [summary_row(s["file"], s["status"], s["entry"])
+            for s in review_status(project, reviewable_changes(project), index)]
+    missing = [row for row in rows if row["status"] not in (APPROVED, MISSING)]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    elif rows:
+        print_rows(rows)
+        print()
+        print(f"{len(rows) - len(missing)} of {len(rows)} changed files have an approved "
+              f"review of their current content")
+    else:
+        print("No changed files to review", file=sys.stderr)
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
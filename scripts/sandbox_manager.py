@@ -14,8 +14,6 @@ Usage:
 
 import os
 import sys
-import shutil
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
@@ -29,6 +27,8 @@ SANDBOX_MARKER = SANDBOX / ".SANDBOX"
 
 def create_sandbox():
     """Create a sandbox copy of the canonical install."""
+    import shutil
+
     if SANDBOX.exists():
         print(f"Sandbox already exists at: {SANDBOX}")
         print("Use 'python sandbox_manager.py clean' first if you want to recreate it.")
@@ -60,6 +60,8 @@ def create_sandbox():
 
 def sync_to_sandbox():
     """Sync canonical -> sandbox (update sandbox with latest from canonical)."""
+    import shutil
+
     if not SANDBOX.exists():
         print(f"Sandbox does not exist. Run 'create' first.")
         return False
@@ -80,6 +82,8 @@ def promote_to_canonical():
 
     WARNING: This overwrites canonical files!
     """
+    import shutil
+
     if not SANDBOX.exists():
         print(f"Sandbox does not exist.")
         return False
@@ -188,6 +192,8 @@ def show_status():
 
 def clean_sandbox():
     """Remove the sandbox."""
+    import shutil
+
     if not SANDBOX.exists():
         print("No sandbox exists.")
         return True
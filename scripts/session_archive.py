@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Session Archive - Compressed, incremental storage for archived session state
+
+Each archive is one NDJSON record stored as its own gzip member inside a
+segment file. A segment starts with a full snapshot (keyframe) and is
+followed by deltas against the previous archive. A small NDJSON index maps
+archive ids to (segment, offset, length) so any past session can be rebuilt
+by decompressing only its keyframe and the deltas that follow it.
+
+Layout (under .agents/runtime/logs/sessions/):
+    index.ndjson                  One line per archive
+    segment_<archive_id>.ndjson.gz  Concatenated gzip members
+
+Usage:
+    python session_archive.py list              # List archived sessions
+    python session_archive.py show <archive_id> # Print a reconstructed session
+    python session_archive.py stats             # Show archive disk usage
+"""
+
+import argparse
+import fcntl
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SessionArchive:
+    """
+    Append-only store of session snapshots and deltas.
+
+    Archive directory: .agents/runtime/logs/sessions/
+    """
+
+    INDEX_NAME = "index.ndjson"
+    LOCK_NAME = "archive.lock"
+    SEGMENT_PREFIX = "segment_"
+    SEGMENT_SUFFIX = ".ndjson.gz"
+
+    # Start a new segment (with a fresh keyframe) after this many records
+    # or once the current segment grows past this many bytes.
+    KEYFRAME_INTERVAL = 64
+    SEGMENT_MAX_BYTES = 256 * 1024
+
+    KIND_FULL = "full"
+    KIND_DELTA = "delta"
+
+    def __init__(self, archive_dir: Path):
+        """Initialize archive rooted at archive_dir."""
+        self.archive_dir = Path(archive_dir)
+        self.index_file = self.archive_dir / self.INDEX_NAME
+        self.lock_file = self.archive_dir / self.LOCK_NAME
+
+    # ========================================================================
+    # WRITING
+    # ========================================================================
+
+    def append(self, state: Dict[str, Any]) -> Tuple[str, Path]:
+        """
+        Archive a state snapshot as a delta against the previous archive.
+
+        Args:
+            state: Current state dictionary.
+
+        Returns:
+            Tuple of (archive id, segment path the record was written to).
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+
+        # Concurrent archivers would diff against the same base and
+        # interleave segment and index writes; take turns
+        with self._locked():
+            return self._append(state)
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive flock on the archive's lock file."""
+        with open(self.lock_file, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _append(self, state: Dict[str, Any]) -> Tuple[str, Path]:
+        """Write one record and its index entry (caller holds the lock)."""
+        entries = self.load_index()
+        archive_id = self._new_id(entries)
+        last = entries[-1] if entries else None
+
+        previous = None
+        if last and not self._needs_keyframe(entries):
+            previous = self.read(last["id"], entries)
+
+        if previous is not None:
+            segment = self.archive_dir / last["segment"]
+            sets, unsets = diff_states(previous, state)
+            record = {
+                "id": archive_id,
+                "kind": self.KIND_DELTA,
+                "base": last["id"],
+                "set": sets,
+                "unset": unsets
+            }
+        else:
+            segment = self.archive_dir / f"{self.SEGMENT_PREFIX}{archive_id}{self.SEGMENT_SUFFIX}"
+            record = {"id": archive_id, "kind": self.KIND_FULL, "state": state}
+
+        member = gzip.compress((json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+        with open(segment, "ab") as f:
+            offset = f.tell()
+            f.write(member)
+
+        entry = {
+            "id": archive_id,
+            "kind": record["kind"],
+            "segment": segment.name,
+            "offset": offset,
+            "length": len(member),
+            "status": state.get("status"),
+            "created_at": datetime.now().isoformat()
+        }
+        with open(self.index_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+        return archive_id, segment
+
+    def _needs_keyframe(self, entries: List[Dict[str, Any]]) -> bool:
+        """Check whether the next record should start a new segment."""
+        last = entries[-1]
+        segment = self.archive_dir / last["segment"]
+        if not segment.exists():
+            return True
+        if segment.stat().st_size >= self.SEGMENT_MAX_BYTES:
+            return True
+        in_segment = sum(1 for e in entries if e["segment"] == last["segment"])
+        return in_segment >= self.KEYFRAME_INTERVAL
+
+    def _new_id(self, entries: List[Dict[str, Any]]) -> str:
+        """Generate a unique, sortable archive id."""
+        archive_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        if entries and entries[-1]["id"] >= archive_id:
+            archive_id = f"{entries[-1]['id']}_1"
+        return archive_id
+
+    # ========================================================================
+    # READING
+    # ========================================================================
+
+    def load_index(self) -> List[Dict[str, Any]]:
+        """
+        Load index entries, oldest first.
+
+        Returns:
+            List of index entry dicts. Malformed lines are skipped.
+        """
+        if not self.index_file.exists():
+            return []
+
+        entries = []
+        with open(self.index_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    def read(self, archive_id: str,
+             entries: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the state stored under archive_id.
+
+        Only the segment holding the archive is touched, and only the
+        members from its keyframe up to the requested record are inflated.
+
+        Args:
+            archive_id: Id returned by append().
+            entries: Pre-loaded index entries (optional).
+
+        Returns:
+            State dictionary, or None if the id is unknown.
+        """
+        if entries is None:
+            entries = self.load_index()
+
+        position = next((i for i, e in enumerate(entries) if e["id"] == archive_id), None)
+        if position is None:
+            return None
+
+        target = entries[position]
+        start = position
+        while start > 0 and entries[start]["kind"] != self.KIND_FULL:
+            start -= 1
+        chain = [e for e in entries[start:position + 1] if e["segment"] == target["segment"]]
+
+        state: Optional[Dict[str, Any]] = None
+        with open(self.archive_dir / target["segment"], "rb") as f:
+            for entry in chain:
+                f.seek(entry["offset"])
+                record = json.loads(gzip.decompress(f.read(entry["length"])).decode("utf-8"))
+                if record["kind"] == self.KIND_FULL:
+                    state = record["state"]
+                elif state is not None:
+                    state = apply_delta(state, record.get("set", []), record.get("unset", []))
+
+        return state
+
+    # ========================================================================
+    # MAINTENANCE
+    # ========================================================================
+
+    def prune(self, cutoff: datetime, dry_run: bool = True) -> List[Path]:
+        """
+        Remove whole segments last written before cutoff.
+
+        Segments always start with a keyframe, so dropping a segment never
+        breaks reconstruction of the archives that remain.
+
+        Args:
+            cutoff: Segments with an older mtime are removed.
+            dry_run: If True, don't actually delete.
+
+        Returns:
+            List of segment paths that would be/were deleted.
+        """
+        if not self.archive_dir.exists():
+            return []
+
+        expired = []
+        for segment in sorted(self.archive_dir.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}")):
+            if datetime.fromtimestamp(segment.stat().st_mtime) < cutoff:
+                expired.append(segment)
+
+        if expired and not dry_run:
+            names = {segment.name for segment in expired}
+            # An append between reading and replacing the index would be lost
+            with self._locked():
+                kept = [e for e in self.load_index() if e["segment"] not in names]
+                tmp = self.index_file.with_suffix(".tmp")
+                tmp.write_text("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in kept))
+                tmp.replace(self.index_file)
+                for segment in expired:
+                    segment.unlink()
+
+        return expired
+
+    def disk_usage(self) -> int:
+        """Return total bytes used by the archive directory."""
+        if not self.archive_dir.exists():
+            return 0
+        return sum(f.stat().st_size for f in self.archive_dir.iterdir() if f.is_file())
+
+
+# ============================================================================
+# DELTA HELPERS
+# ============================================================================
+
+def diff_states(old: Dict[str, Any], new: Dict[str, Any],
+                path: Tuple[str, ...] = ()) -> Tuple[List[list], List[list]]:
+    """
+    Compute a nested-dict delta from old to new.
+
+    Returns:
+        Tuple of (sets, unsets) where sets is a list of [key_path, value]
+        pairs and unsets is a list of key paths to delete.
+    """
+    sets: List[list] = []
+    unsets: List[list] = []
+
+    for key in old:
+        if key not in new:
+            unsets.append(list(path + (key,)))
+
+    for key, value in new.items():
+        if key in old and isinstance(value, dict) and isinstance(old[key], dict):
+            sub_sets, sub_unsets = diff_states(old[key], value, path + (key,))
+            sets.extend(sub_sets)
+            unsets.extend(sub_unsets)
+        elif key not in old or old[key] != value:
+            sets.append([list(path + (key,)), value])
+
+    return sets, unsets
+
+
+def apply_delta(state: Dict[str, Any], sets: List[list], unsets: List[list]) -> Dict[str, Any]:
+    """Apply a delta produced by diff_states() to state in place."""
+    for key_path in unsets:
+        node = state
+        for key in key_path[:-1]:
+            node = node.get(key, {})
+        if isinstance(node, dict):
+            node.pop(key_path[-1], None)
+
+    for key_path, value in sets:
+        node = state
+        for key in key_path[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        node[key_path[-1]] = value
+
+    return state
+
+
+# ============================================================================
+# CLI INTERFACE
+# ============================================================================
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Agent Coordinator Session Archive")
+    parser.add_argument("--dir", type=Path,
+                        default=Path.cwd() / ".agents" / "runtime" / "logs" / "sessions",
+                        help="Archive directory (default: .agents/runtime/logs/sessions)")
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    subparsers.add_parser("list", help="List archived sessions")
+
+    show_parser = subparsers.add_parser("show", help="Print a reconstructed session")
+    show_parser.add_argument("archive_id", help="Archive ID")
+
+    subparsers.add_parser("stats", help="Show archive disk usage")
+
+    args = parser.parse_args()
+    archive = SessionArchive(args.dir)
+
+    if args.command == "list":
+        entries = archive.load_index()
+        if not entries:
+            print("No archived sessions.")
+        for entry in entries:
+            print(f"{entry['id']}  {entry['kind']:<5}  {entry.get('status') or '-':<8}  {entry['segment']}")
+
+    elif args.command == "show":
+        state = archive.read(args.archive_id)
+        if state is None:
+            print(f"Archive not found: {args.archive_id}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(state, indent=2))
+
+    elif args.command == "stats":
+        entries = archive.load_index()
+        segments = {e["segment"] for e in entries}
+        print(f"Archives: {len(entries)}")
+        print(f"Segments: {len(segments)}")
+        print(f"Disk usage: {archive.disk_usage() / 1024:.1f} KB")
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
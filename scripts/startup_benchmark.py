@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - Measures CLI startup cost against a time budget
+
+Slash commands and hooks call the coordinator CLIs hundreds of times a day,
+so `version`, `status` and `--help` must stay cheap. For every command this
+script reports wall-clock time over several runs and the slowest top-level
+imports from `python -X importtime`, then fails if any command's overhead
+exceeds its budget. Overhead is the fastest run minus the fastest bare
+`python -c pass`: scheduler and cache noise only ever adds time, so the
+minimum is the stable figure, and subtracting the interpreter start keeps
+budgets valid across machines.
+
+Commands run with a temporary HOME and working directory so the benchmark
+never touches real agent state.
+
+Usage:
+    python startup_benchmark.py                 # Run all commands
+    python startup_benchmark.py --runs 20       # More samples per command
+    python startup_benchmark.py --budget-ms 40  # Override every budget
+    python startup_benchmark.py --json          # Machine-readable output
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# (label, script, args, overhead budget in milliseconds). Budgets are the
+# typical overhead plus about 20 ms of headroom for a busy machine: tight
+# enough to catch an eager subprocess/urllib import, loose enough not to flap.
+COMMANDS = [
+    ("state_manager version", "state_manager.py", ["version"], 50),
+    ("state_manager status", "state_manager.py", ["status"], 60),
+    ("state_manager --help", "state_manager.py", ["--help"], 60),
+    ("task_manager summary", "task_manager.py", ["summary"], 60),
+    ("task_manager next", "task_manager.py", ["next"], 60),
+    ("garbage_collector --stats", "garbage_collector.py", ["--stats"], 60),
+    ("session_archive list", "session_archive.py", ["list"], 60),
+    ("monitor --once", "monitor.py", ["--once"], 40),
+    ("sandbox_manager status", "sandbox_manager.py", ["status"], 40),
+]
+
+
+def run_once(argv: List[str], env: Dict[str, str], cwd: Path) -> float:
+    """Run a command once and return wall-clock milliseconds."""
+    start = time.perf_counter()
+    subprocess.run(argv, env=env, cwd=cwd, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def parse_importtime(stderr: str, top: int = 5,
+                     ignore: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+    """
+    Parse `python -X importtime` output.
+
+    Args:
+        stderr: Captured stderr of the profiled run.
+        top: Number of imports to return.
+        ignore: Modules to skip (e.g. those the bare interpreter loads).
+
+    Returns:
+        The slowest top-level imports as (module, cumulative ms) pairs.
+    """
+    ignore = ignore or set()
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2]
+        # Nested imports are indented; keep only what the script itself pulls in
+        if name.startswith("  ") or name.strip() in ignore:
+            continue
+        try:
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue
+        imports.append((name.strip(), cumulative_us / 1000))
+
+    imports.sort(key=lambda item: item[1], reverse=True)
+    return imports[:top]
+
+
+def interpreter_imports(env: Dict[str, str], cwd: Path) -> Set[str]:
+    """Return the modules a bare interpreter imports at startup."""
+    profile = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                             env=env, cwd=cwd, stderr=subprocess.PIPE, text=True)
+    return {name for name, _ in parse_importtime(profile.stderr, top=1000)}
+
+
+def benchmark(label: str, script: str, args: List[str], budget_ms: float,
+              runs: int, env: Dict[str, str], cwd: Path,
+              baseline_ms: float, ignore: Set[str]) -> Dict:
+    """Benchmark one command and return its results."""
+    argv = [sys.executable, str(SCRIPTS_DIR / script)] + args
+
+    # Warm the filesystem and bytecode caches before sampling
+    run_once(argv, env, cwd)
+    samples = [run_once(argv, env, cwd) for _ in range(runs)]
+
+    profile = subprocess.run([sys.executable, "-X", "importtime"] + argv[1:],
+                             env=env, cwd=cwd, stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             text=True)
+
+    median = statistics.median(samples)
+    overhead = min(samples) - baseline_ms
+    return {
+        "command": label,
+        "budget_ms": budget_ms,
+        "min_ms": round(min(samples), 1),
+        "median_ms": round(median, 1),
+        "max_ms": round(max(samples), 1),
+        "overhead_ms": round(overhead, 1),
+        "within_budget": overhead <= budget_ms,
+        "slowest_imports": [
+            {"module": name, "cumulative_ms": round(ms, 1)}
+            for name, ms in parse_importtime(profile.stderr, ignore=ignore)
+        ]
+    }
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark coordinator CLI startup time")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="Samples per command (default: 10)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Override the overhead budget for every command")
+    parser.add_argument("--only", help="Only run commands whose label contains this text")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="agent-startup-") as tmp:
+        tmp_path = Path(tmp)
+        env = dict(os.environ, HOME=str(tmp_path))
+
+        baseline = min(
+            run_once([sys.executable, "-c", "pass"], env, tmp_path) for _ in range(args.runs)
+        )
+        ignore = interpreter_imports(env, tmp_path)
+
+        results = []
+        for label, script, cmd_args, budget in COMMANDS:
+            if args.only and args.only not in label:
+                continue
+            budget_ms = args.budget_ms if args.budget_ms is not None else budget
+            results.append(benchmark(label, script, cmd_args, budget_ms,
+                                     args.runs, env, tmp_path, baseline, ignore))
+
+    failed = [r for r in results if not r["within_budget"]]
+
+    if args.json:
+        print(json.dumps({
+            "interpreter_baseline_ms": round(baseline, 1),
+            "results": results
+        }, indent=2))
+    else:
+        print(f"Interpreter baseline (python -c pass): {baseline:.1f} ms")
+        print()
+        print(f"{'Command':<28} {'median':>8} {'min':>8} {'max':>8} {'overhead':>9} {'budget':>8}")
+        for r in results:
+            flag = "" if r["within_budget"] else "  OVER BUDGET"
+            print(f"{r['command']:<28} {r['median_ms']:>7.1f}  {r['min_ms']:>7.1f}  "
+                  f"{r['max_ms']:>7.1f}  {r['overhead_ms']:>8.1f}  {r['budget_ms']:>7.0f}{flag}")
+            imports = ", ".join(f"{i['module']} {i['cumulative_ms']:.1f}"
+                                for i in r["slowest_imports"][:3])
+            if imports:
+                print(f"    slowest imports (ms): {imports}")
+        print()
+        print(f"{len(results) - len(failed)}/{len(results)} commands within budget")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,19 +8,33 @@ import os
 import json
 import sys
 import time
-import subprocess
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-import urllib.request
-import urllib.error
+from typing import Dict, List, Optional, Any, Tuple
 
-# Import task manager for integration
-try:
-    from task_manager import TaskManager
-    TASK_MANAGER_AVAILABLE = True
-except ImportError:
-    TASK_MANAGER_AVAILABLE = False
+# subprocess, urllib and task_manager are imported on first use so that
+# frequent CLI calls (version, status) don't pay for them at startup.
+
+
+def _run(cmd, **kwargs):
+    """subprocess.run, importing subprocess on first use."""
+    import subprocess
+    return subprocess.run(cmd, **kwargs)
+
+
+def _urlopen(url, timeout=5, **request_kwargs):
+    """urllib.request.urlopen on a Request, importing urllib on first use."""
+    import urllib.request
+    return urllib.request.urlopen(urllib.request.Request(url, **request_kwargs), timeout=timeout)
+
+
+def _load_task_manager():
+    """Import TaskManager on demand; returns the class or None."""
+    try:
+        from task_manager import TaskManager
+        return TaskManager
+    except ImportError:
+        return None
 
 
 class StateManager:
@@ -156,6 +170,13 @@ class StateManager:
         else:
             print("  Warning: No agents detected!")
 
+        # Start persistent hook host (hooks fall back to direct runs without it)
+        print("Starting hook host...")
+        if self.manage_hook_host("start"):
+            print("  Hook host running")
+        else:
+            print("  Hook host unavailable; hooks will run as separate processes")
+
         # Check for updates
         print("Checking for updates...")
         update_result = self.check_updates()
@@ -210,16 +231,21 @@ class StateManager:
                 print(f"Warning: Timeout waiting for agents", file=sys.stderr)
 
         # Archive session
-        archive_path = self.archive_session()
-        if archive_path:
+        archived = self.archive_session()
+        if archived:
+            archive_id, archive_path = archived
             print(f"Session archived to: {archive_path}")
+            print(f"  Archive id: {archive_id}")
+
+        # Stop hook host
+        self.manage_hook_host("stop")
 
         # Run garbage collection
         print("Running garbage collection...")
         try:
             gc_script = Path(__file__).parent / "garbage_collector.py"
             if gc_script.exists():
-                result = subprocess.run(
+                result = _run(
                     [sys.executable, str(gc_script), "--clean"],
                     capture_output=True,
                     text=True
@@ -277,10 +303,8 @@ class StateManager:
 
         # Try a simple API call
         try:
-            import urllib.request
-            import urllib.error
-
-            req = urllib.request.Request(
+            # We expect this to fail with method not allowed, but connection should work
+            with _urlopen(
                 f"{base_url}/v1/messages",
                 method="GET",
                 headers={
@@ -288,17 +312,12 @@ class StateManager:
                     "anthropic-version": "2023-06-01"
                 },
                 data=b"{}"
-            )
-            # We expect this to fail with method not allowed, but connection should work
-            with urllib.request.urlopen(req, timeout=5) as response:
+            ):
                 pass
-        except urllib.error.HTTPError as e:
+        except Exception as e:
             # Method not allowed is expected for GET on messages endpoint
-            if e.code in (405, 401, 400):
-                return True
-            return False
-        except Exception:
-            return False
+            # (HTTPError carries the status code)
+            return getattr(e, "code", None) in (405, 401, 400)
 
     def check_codex(self) -> bool:
         """
@@ -308,7 +327,7 @@ class StateManager:
             True if codex binary exists and is executable.
         """
         try:
-            result = subprocess.run(
+            result = _run(
                 ["which", "codex"],
                 capture_output=True,
                 text=True
@@ -326,6 +345,51 @@ class StateManager:
         """
         return bool(os.environ.get("GEMINI_API_KEY"))
 
+    # ========================================================================
+    # HOOK HOST
+    # ========================================================================
+
+    def get_hook_host_script(self) -> Optional[Path]:
+        """
+        Locate hook_host.py, preferring the project's installed hooks.
+
+        Returns:
+            Path to hook_host.py, or None if not found.
+        """
+        candidates = [
+            self.project_root / ".claude" / "hooks" / "hook_host.py",
+            Path(__file__).parent.parent / "hooks" / "hook_host.py"
+        ]
+        for candidate in candidates:
+            if candidate.exists():
+                return candidate
+        return None
+
+    def manage_hook_host(self, action: str) -> bool:
+        """
+        Start, stop or query the persistent hook host.
+
+        Args:
+            action: One of: start, stop, status
+
+        Returns:
+            True if the command succeeded.
+        """
+        script = self.get_hook_host_script()
+        if script is None:
+            return False
+
+        try:
+            result = _run(
+                [sys.executable, str(script), action],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            return result.returncode == 0
+        except Exception:
+            return False
+
     # ========================================================================
     # UPDATE MANAGEMENT
     # ========================================================================
@@ -340,11 +404,10 @@ class StateManager:
         current = self.get_version()
 
         try:
-            req = urllib.request.Request(
+            with _urlopen(
                 self.GITHUB_API,
                 headers={"Accept": "application/vnd.github.v3+json"}
-            )
-            with urllib.request.urlopen(req, timeout=5) as response:
+            ) as response:
                 data = json.loads(response.read().decode())
                 latest = data.get("tag_name", "unknown").lstrip("v")
 
@@ -463,7 +526,8 @@ class StateManager:
         Returns:
             Task summary dict, or None if TaskManager unavailable.
         """
-        if not TASK_MANAGER_AVAILABLE:
+        TaskManager = _load_task_manager()
+        if TaskManager is None:
             return None
 
         try:
@@ -479,7 +543,8 @@ class StateManager:
         Returns:
             Task dict, or None if no active tasks.
         """
-        if not TASK_MANAGER_AVAILABLE:
+        TaskManager = _load_task_manager()
+        if TaskManager is None:
             return None
 
         try:
@@ -495,13 +560,14 @@ class StateManager:
         Returns:
             Multi-line status string.
         """
+        state = self.load_state()
         lines = [
-            f"System Status: {self.get_status()}",
+            f"System Status: {state.get('status', self.STATUS_STOPPED)}",
             f"Version: {self.get_version()}"
         ]
 
         # Add active agents
-        active_agents = self.get_active_agents()
+        active_agents = state.get("active_agents", [])
         if active_agents:
             lines.append(f"Active Agents: {', '.join(active_agents)}")
 
@@ -558,25 +624,22 @@ class StateManager:
             print(f"Error creating directory structure: {e}", file=sys.stderr)
             return False
 
-    def archive_session(self) -> Optional[Path]:
+    def archive_session(self) -> Optional[Tuple[str, Path]]:
         """
         Archive current state to logs before shutdown.
 
+        Sessions are appended to a compressed NDJSON segment as a delta
+        against the previous archive (see session_archive.py).
+
         Returns:
-            Path to archived file, or None if archive failed.
+            Tuple of (archive id, segment file written), or None if archive failed.
         """
         try:
-            state = self.load_state()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            archive_name = f"session_{timestamp}.json"
+            from session_archive import SessionArchive
 
-            archive_dir = self.agents_dir / "runtime" / "logs"
-            archive_dir.mkdir(parents=True, exist_ok=True)
-
-            archive_path = archive_dir / archive_name
-            archive_path.write_text(json.dumps(state, indent=2))
-
-            return archive_path
+            state = self.load_state()
+            archive = SessionArchive(self.agents_dir / "runtime" / "logs" / "sessions")
+            return archive.append(state)
         except Exception as e:
             print(f"Warning: Could not archive session: {e}", file=sys.stderr)
             return None
@@ -44,6 +44,15 @@ def get_project_root():
     """Get the project root directory."""
     return Path(__file__).parent.absolute()
 
+# Hook files copied on install: shell hooks and the Python hook tree
+# (hook_client.py, run_chain.py, the hook scripts and common/)
+HOOK_SUFFIXES = (".sh", ".py")
+
+def hook_files(hooks_dir):
+    """Return the installable hook files under a hooks directory."""
+    return [f for f in hooks_dir.rglob("*")
+            if f.is_file() and f.suffix in HOOK_SUFFIXES and "__pycache__" not in f.parts]
+
 def install_hooks(project_root, claude_dir):
     """Install hooks to Claude directory."""
     hooks_src = project_root / "hooks"
@@ -55,15 +64,15 @@ def install_hooks(project_root, claude_dir):
 
     hooks_dst.mkdir(parents=True, exist_ok=True)
 
-    # Copy all hook files
-    for hook_file in hooks_src.rglob("*.sh"):
+    # Copy all hook files; generated settings run hooks_dst/hook_client.py
+    for hook_file in hook_files(hooks_src):
         rel_path = hook_file.relative_to(hooks_src)
         dst_file = hooks_dst / rel_path
         dst_file.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(hook_file, dst_file)
 
-    hook_count = len(list(hooks_dst.rglob("*.sh")))
-    print_success(f"Installed {hook_count} hooks to {hooks_dst}")
+    hook_count = len(hook_files(hooks_dst))
+    print_success(f"Installed {hook_count} hook files to {hooks_dst}")
     return True
 
 def install_commands(project_root, claude_dir):
@@ -103,7 +112,10 @@ def install_configs(project_root, claude_dir):
         shutil.copy2(agent_routing, claude_dir / "agent_routing.json")
         print_success(f"Installed agent_routing.json to {claude_dir}")
 
-    # Copy hooks_settings.json if it exists
+    # Generate hook settings with narrow matchers; fall back to the static file
+    if generate_hook_settings(project_root, claude_dir):
+        return True
+
     hooks_settings = config_src / "hooks_settings.json"
     if hooks_settings.exists():
         dst = claude_dir / "settings.json"
@@ -112,6 +124,31 @@ def install_configs(project_root, claude_dir):
 
     return True
 
+def generate_hook_settings(project_root, claude_dir):
+    """Generate settings.json hooks and hook_filters.json from the hooks' declared interests."""
+    sys.path.insert(0, str(project_root / "hooks"))
+    try:
+        import json
+        from common.hook_matchers import DEFAULT_HOOKS, write_generated
+
+        rules = None
+        rules_file = project_root / "config" / "agent_rules.json"
+        if rules_file.exists():
+            with open(rules_file) as f:
+                rules = json.load(f)
+
+        hooks_dir = claude_dir / "hooks"
+        settings_path, filters_path = write_generated(
+            claude_dir / "settings.json", hooks_dir, project_root / "hooks",
+            DEFAULT_HOOKS, rules, command_dir=hooks_dir
+        )
+    except (ImportError, OSError, ValueError, KeyError) as e:
+        print_error(f"Could not generate hook settings: {e}")
+        return False
+
+    print_success(f"Generated hook settings in {settings_path} (filters: {filters_path})")
+    return True
+
 def create_env_template(project_root):
     """Create .env template if it doesn't exist."""
     env_example = project_root / ".env.example"
@@ -135,9 +172,10 @@ def validate_installation(claude_dir):
     if not hooks_dir.exists():
         issues.append("Hooks directory not found")
     else:
-        hook_count = len(list(hooks_dir.rglob("*.sh")))
-        if hook_count == 0:
+        if not hook_files(hooks_dir):
             issues.append("No hooks installed")
+        elif not (hooks_dir / "hook_client.py").exists():
+            issues.append("hook_client.py not installed")
 
     if not commands_dir.exists():
         issues.append("Commands directory not found")